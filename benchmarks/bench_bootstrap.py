@@ -0,0 +1,55 @@
+"""Compara el bootstrap de la media con un bucle de Python frente a `marketing.stats.bootstrap_means`.
+
+El bucle se mide con menos remuestreos y se extrapola a `--resamples`.
+
+Uso: python -m benchmarks.bench_bootstrap [--rows 1000 100000] [--resamples 10000] [--workers 4]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from marketing.stats import bootstrap_means
+
+LOOP_RESAMPLES = 200
+
+
+def python_loop(values, n_resamples, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.choice(values, len(values)).mean() for _ in range(n_resamples)])
+
+
+def roi_like(n, seed=0):
+    """ROI con dos decimales (pocos valores distintos) y su versión continua."""
+    rng = np.random.default_rng(seed)
+    continuous = rng.gamma(4, 0.135, size=n)
+    return np.round(continuous, 2), continuous
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--resamples', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        rounded, continuous = roi_like(n)
+        print(f"{n:,} filas, {args.resamples:,} remuestreos")
+        print(f"{'método':<40} {'tiempo (s)':>10} {'IC 95%':>24}")
+        elapsed, _ = timed(python_loop, rounded, LOOP_RESAMPLES)
+        print(f"{'bucle Python (extrapolado)':<40} {elapsed * args.resamples / LOOP_RESAMPLES:>10.2f}")
+        for name, values in [('dos decimales (frecuencias)', rounded), ('continuo (matrices de índices)', continuous)]:
+            elapsed, means = timed(bootstrap_means, values, args.resamples, workers=args.workers)
+            low, high = np.percentile(means, [2.5, 97.5])
+            print(f"{'bootstrap_means ' + name:<40} {elapsed:>10.2f} {f'[{low:.5f}, {high:.5f}]':>24}")
+
+
+if __name__ == '__main__':
+    main()
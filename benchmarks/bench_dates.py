@@ -0,0 +1,68 @@
+"""Compara la normalización de fechas por grupos de formato con `pd.to_datetime` directo.
+
+Uso: python -m benchmarks.bench_dates [--rows 1000000]
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from marketing.dates import DateNormalizer
+
+MONTHS = ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sep', 'oct', 'nov', 'dic']
+LONG_MONTHS = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+               'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+
+def mixed_dates(n, seed=0):
+    """`n` fechas de 2022-2024 escritas en los cinco formatos del export bruto, con algo de basura."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2022-01-01', '2024-12-31')
+    spellings = [
+        [d.strftime('%Y-%m-%d') for d in days],
+        [d.strftime('%d/%m/%Y') for d in days],
+        [f"{d.day}-{MONTHS[d.month - 1]}-{d:%y}" for d in days],
+        [d.strftime('%Y.%m.%d') for d in days],
+        [f"{d:%d} {LONG_MONTHS[d.month - 1]} {d.year}" for d in days],
+    ]
+    pool = np.concatenate([np.asarray(s, dtype=object) for s in spellings] + [np.array(['', '2023-13-01'], dtype=object)])
+    expected = np.concatenate([days.to_numpy(dtype='datetime64[ns]')] * len(spellings)
+                              + [np.array(['NaT', 'NaT'], dtype='datetime64[ns]')])
+    idx = rng.integers(0, len(pool), n)
+    return pd.Series(pool[idx]), expected[idx]
+
+
+def timed(func, values):
+    start = time.perf_counter()
+    result = pd.Series(func(values)).to_numpy(dtype='datetime64[ns]')
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000])
+    args = parser.parse_args()
+    # pd.to_datetime avisa de que cae a dateutil elemento a elemento: es justo lo que se mide
+    warnings.simplefilter('ignore', UserWarning)
+
+    for n in args.rows:
+        values, expected = mixed_dates(n)
+        normalizer = DateNormalizer()
+        candidates = {
+            "pd.to_datetime(errors='coerce')": lambda v: pd.to_datetime(v, errors='coerce'),
+            "pd.to_datetime(format='mixed')": lambda v: pd.to_datetime(v, errors='coerce', format='mixed', dayfirst=True),
+            'DateNormalizer (frío)': normalizer,
+            'DateNormalizer (memo caliente)': normalizer,
+        }
+        print(f"{n:,} filas")
+        print(f"{'método':<34} {'tiempo (s)':>10} {'correctas':>10}")
+        for name, func in candidates.items():
+            elapsed, result = timed(func, values)
+            correct = np.mean((result == expected) | (np.isnat(result) & np.isnat(expected)))
+            print(f"{name:<34} {elapsed:>10.3f} {correct:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
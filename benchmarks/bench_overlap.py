@@ -0,0 +1,70 @@
+"""Compara el calendario de campañas activas expandiendo cada campaña a sus días frente a `marketing.overlap`.
+
+La expansión se mide con menos campañas y se extrapola (su coste y su memoria
+crecen con campañas × días de duración).
+
+Uso: python -m benchmarks.bench_overlap [--rows 10000 1000000 5000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import CATEGORIES, FIRST_DAY, LAST_DAY
+from marketing.overlap import campaign_activity, overlap_counts
+
+EXPANDED_ROWS = 20_000
+
+
+def campaigns(n, seed=0):
+    """Frame mínimo (fechas, canal, importes) con duraciones como las del dataset (1–716 días)."""
+    rng = np.random.default_rng(seed)
+    start = FIRST_DAY + rng.integers(0, (LAST_DAY - FIRST_DAY).astype(int), n).astype('timedelta64[D]')
+    channels = list(CATEGORIES['canal'])
+    return pd.DataFrame({
+        'fecha inicio': start,
+        'fecha fin': start + rng.integers(0, 716, n).astype('timedelta64[D]'),
+        'canal': pd.Categorical.from_codes(rng.integers(0, len(channels), n), channels),
+        'inversión_num': rng.uniform(1_000, 100_000, n),
+        'facturación_num': rng.uniform(10_000, 1_000_000, n),
+    })
+
+
+def expanded_activity(df):
+    """Una fila por campaña y día activo, agregada por día y canal."""
+    start = df['fecha inicio'].to_numpy('datetime64[D]')
+    length = (df['fecha fin'].to_numpy('datetime64[D]') - start).astype(np.int64) + 1
+    rows = np.repeat(np.arange(len(df)), length)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(length) - length, length)
+    days = pd.DataFrame({'periodo': start[rows] + offsets.astype('timedelta64[D]'),
+                         'grupo': df['canal'].to_numpy()[rows],
+                         'inversión': (df['inversión_num'].to_numpy() / length)[rows]})
+    return days.groupby(['periodo', 'grupo'], observed=True).agg(campañas=('inversión', 'size'),
+                                                                  inversión=('inversión', 'sum'))
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    sample = campaigns(EXPANDED_ROWS)
+    elapsed, _ = timed(expanded_activity, sample)
+    per_row = elapsed / EXPANDED_ROWS
+    print(f"{'campañas':>12} {'expansión (s, extrap.)':>24} {'calendario diario (s)':>22} {'solapamientos (s)':>18}")
+    for n in args.rows:
+        df = campaigns(n)
+        activity_time, _ = timed(campaign_activity, df, 'canal', 'D')
+        overlap_time, _ = timed(overlap_counts, df, 'canal')
+        print(f"{n:>12,} {per_row * n:>24.2f} {activity_time:>22.2f} {overlap_time:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
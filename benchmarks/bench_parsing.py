@@ -0,0 +1,72 @@
+"""Compara el parser europeo vectorizado con la cadena de `str.replace` original.
+
+Uso: python -m benchmarks.bench_parsing [--rows 1000000 10000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from marketing.parsing import parse_european
+
+
+def european_strings(n, seed=0, pool_size=100_000):
+    """Genera `n` textos tipo "1.234,56" muestreando de un pool de valores únicos."""
+    rng = np.random.default_rng(seed)
+    pool = [f"{v:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+            for v in rng.uniform(0, 1_000_000, pool_size)]
+    # Mismo dtype de texto que produce read_csv (Arrow en pandas >= 3)
+    return pd.Series(np.asarray(pool, dtype=object)[rng.integers(0, pool_size, n)]).astype(str)
+
+
+# Casos límite del signo: la ruta original (`pd.to_numeric`) da NaN si el menos no va delante
+SIGN_CASES = ['-1.234,56', ' -12', '-0,5', '+5', '12-3', '1-', '--1', '-', '1,2-', '-1-', '12,5-']
+
+
+def replace_chain(series):
+    # Ruta original de load_data()
+    return series.str.replace('.', '', regex=False).str.replace(',', '.', regex=False).astype(float)
+
+
+def to_numeric_chain(series):
+    """Como `replace_chain`, pero con NaN en lo que no se puede convertir."""
+    return pd.to_numeric(series.str.replace('.', '', regex=False).str.replace(',', '.', regex=False),
+                         errors='coerce')
+
+
+def check_sign_cases():
+    series = pd.Series(SIGN_CASES, dtype=str)
+    expected, parsed = to_numeric_chain(series).to_numpy(dtype=float), parse_european(series)
+    mismatches = [(text, e, p) for text, e, p in zip(SIGN_CASES, expected, parsed)
+                  if not (e == p or (np.isnan(e) and np.isnan(p)))]
+    assert not mismatches, f"el parser difiere de pd.to_numeric en: {mismatches}"
+
+
+def timeit(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    check_sign_cases()
+    print(f"{'filas':>12} {'str.replace (s)':>16} {'vectorizado (s)':>16} {'speedup':>8}")
+    for n in args.rows:
+        series = european_strings(n)
+        t_old, expected = timeit(replace_chain, series, repeat=args.repeat)
+        t_new, parsed = timeit(parse_european, series, repeat=args.repeat)
+        assert np.array_equal(expected.to_numpy(), parsed, equal_nan=True)
+        print(f"{n:>12,} {t_old:>16.3f} {t_new:>16.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Tiempo hasta el primer render del dashboard y coste de las importaciones de cada sección.
+
+Cada medida se hace en un proceso nuevo (arranque en frío) con `python -X importtime`:
+se ejecuta la app con `AppTest`, primero en "Introducción" y después cambiando a la
+sección pedida, y se suman las importaciones que dispara la app (no las de streamlit
+ni las de AppTest, que se cargan antes de empezar a medir).
+
+Uso: python -m benchmarks.bench_startup [--app app.py] [--repeat 3] [--cold-cache]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MARK = "--- app ---"
+SECTIONS = ["Introducción", "Preprocesamiento", "Análisis Exploratorio (EDA)", "Insights y Recomendaciones"]
+
+# Se ejecuta en el proceso hijo: argv = [app, sección]
+CHILD = f"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app, section = sys.argv[1:3]
+sys.stderr.write({MARK!r} + "\\n")
+start = time.perf_counter()
+at = AppTest.from_file(app, default_timeout=600).run()
+first = time.perf_counter() - start
+switch = 0.0
+if section != at.sidebar.radio[0].value:
+    sys.stderr.write({MARK!r} + "\\n")
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(section).run()
+    switch = time.perf_counter() - start
+print(json.dumps({{"first": first, "switch": switch, "errors": [e.message for e in at.exception]}}))
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Imports de primer nivel tras cada marca: [{módulo: segundos acumulados}, ...]."""
+    phases = []
+    for line in stderr.splitlines():
+        if line == MARK:
+            phases.append({})
+            continue
+        match = _IMPORT_LINE.match(line)
+        if match and phases and not match.group(3):
+            phases[-1][match.group(4)] = int(match.group(2)) / 1e6
+    return phases
+
+
+def measure(app, section, cold_cache=False):
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as cache_dir:
+        if cold_cache:
+            env["MARKETING_CACHE_DIR"] = cache_dir
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD, app, section],
+                              cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    phases = parse_importtime(proc.stderr)
+    result["imports"] = phases[-1] if phases else {}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--app', default='app.py')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--cold-cache', action='store_true', help="sin caché Arrow previa (incluye parsear el CSV)")
+    args = parser.parse_args()
+
+    print(f"{'sección':<30} {'1er render (s)':>14} {'cambio (s)':>10} {'imports (s)':>11}  más costosos")
+    for section in SECTIONS:
+        runs = [measure(args.app, section, args.cold_cache) for _ in range(args.repeat)]
+        errors = [e for run in runs for e in run["errors"]]
+        imports = runs[-1]["imports"]
+        top = sorted(imports.items(), key=lambda item: -item[1])[:args.top]
+        print(f"{section:<30} {statistics.median(r['first'] for r in runs):>14.3f} "
+              f"{statistics.median(r['switch'] for r in runs):>10.3f} {sum(imports.values()):>11.3f}  "
+              + ", ".join(f"{name} {secs:.2f}" for name, secs in top))
+        for error in errors[:1]:
+            print(f"  error: {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Suite de rendimiento: carga, agregaciones del EDA y construcción de gráficos sobre datos sintéticos.
+
+Para cada tamaño mide (mejor de `--repeat`):
+
+- carga: parseo del CSV, `CampaignStore.refresh()` sin caché (parseo + Arrow) y con
+  caché (memory-map), que es lo que hace `load_data` en la app;
+- agregaciones: índice y máscara de filtros, cubo, agregados por canal y tipo de las
+  pestañas del EDA, KPIs de las tarjetas y curvas de respuesta del optimizador, y la
+  validación de las reglas de calidad que se hace en cada ingesta;
+- gráficos: construcción de cada figura del EDA, su serialización a JSON (lo que
+  Streamlit envía al navegador) y el tamaño de ese JSON.
+
+Cada ejecución se añade como una línea JSON a `--history` (commit, versiones, máquina,
+tiempos y tamaños) y se compara con la última ejecución anterior del mismo tamaño
+en la misma máquina: lo que tarda más de `--threshold` veces (y al menos `NOISE` más) o
+genera un JSON más de `--threshold` veces mayor se marca como regresión.
+
+Uso: python -m benchmarks.bench_suite [--rows 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from benchmarks.synthetic import synthetic_csv
+from marketing import charts
+from marketing.budget import fit_response_curves
+from marketing.cache import CampaignStore
+from marketing.cube import build_cube, counts_by, mean_by
+from marketing.data import read_campaigns
+from marketing.filters import FilterIndex
+from marketing.kpis import campaign_kpis
+from marketing.validation import validate
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = ROOT / "benchmarks" / "history.jsonl"
+THRESHOLD = 1.2
+# Por debajo de esta diferencia absoluta (s) un cambio se considera ruido de medida
+NOISE = 0.01
+
+# Nombre -> constructor (frame, cubo) -> figura, como en la pestaña del EDA correspondiente
+FIGURES = {
+    'canales': lambda df, cube: charts.channel_distribution(cube),
+    'roi_por_canal': lambda df, cube: charts.channel_roi(cube),
+    'facturacion_por_tipo': lambda df, cube: charts.type_revenue(cube),
+    'duracion_por_tipo': lambda df, cube: charts.duration_by_type(df[~df['tipo'].isin(charts.INVALID_TYPES)]),
+    'inversion_vs_roi': lambda df, cube: charts.investment_roi(df),
+    'histograma_roi': lambda df, cube: charts.roi_histogram(df),
+    'duracion_vs_facturacion': lambda df, cube: charts.duration_revenue(df),
+}
+
+
+def best_of(func, repeat):
+    """(mejor tiempo en segundos, resultado de la última ejecución)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _cold_load(path):
+    with tempfile.TemporaryDirectory(prefix="bench-suite-") as cache_dir:
+        CampaignStore(path, cache_dir=cache_dir).refresh()
+
+
+def run(rows, repeat=3, seed=0):
+    """Tiempos (s) y tamaños (bytes) de un dataset sintético de `rows` filas."""
+    path = synthetic_csv(rows, seed)
+    timings, sizes = {}, {}
+
+    timings['carga.parseo_csv'], _ = best_of(lambda: read_campaigns(path), repeat)
+    timings['carga.sin_cache'], _ = best_of(lambda: _cold_load(path), repeat)
+    with tempfile.TemporaryDirectory(prefix="bench-suite-") as cache_dir:
+        CampaignStore(path, cache_dir=cache_dir).refresh()
+
+        def warm_load():
+            store = CampaignStore(path, cache_dir=cache_dir)
+            store.refresh()
+            return store.frame
+
+        timings['carga.con_cache'], df = best_of(warm_load, repeat)
+        df = df.copy()  # que el resto no dependa de los ficheros mapeados del temporal
+
+    timings['agregación.índice_filtros'], index = best_of(lambda: FilterIndex(df), repeat)
+    low, high = index.bounds('inversión_num')
+    selection = {'canal': tuple(index.values('canal')[:2])}, {'inversión_num': (low, (low + high) / 2)}
+    timings['agregación.máscara_filtros'], _ = best_of(lambda: index.mask(*selection), repeat)
+    timings['agregación.cubo'], cube = best_of(lambda: build_cube(df), repeat)
+    timings['agregación.campañas_por_canal'], _ = best_of(lambda: counts_by(cube, 'canal'), repeat)
+    timings['agregación.roi_por_canal'], _ = best_of(lambda: mean_by(cube, 'canal', 'roi_num'), repeat)
+    timings['agregación.facturación_por_tipo'], _ = best_of(lambda: mean_by(cube, 'tipo', 'facturación_num'), repeat)
+    timings['agregación.kpis'], _ = best_of(lambda: campaign_kpis(df), repeat)
+    timings['agregación.curvas_respuesta'], _ = best_of(lambda: fit_response_curves(df), repeat)
+    timings['validación.reglas'], _ = best_of(lambda: validate(df), repeat)
+
+    for name, build in FIGURES.items():
+        timings[f'gráfico.{name}'], fig = best_of(lambda: build(df, cube), repeat)
+        timings[f'json.{name}'], payload = best_of(fig.to_json, repeat)
+        sizes[f'json.{name}'] = len(payload.encode())
+    return timings, sizes
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Commit, versiones y máquina: lo que identifica una ejecución en el historial."""
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+        'machine': f"{platform.system()} {platform.machine()} {os.cpu_count()} CPU",
+    }
+
+
+def read_history(path):
+    path = Path(path)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+
+def append_history(path, record):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a', encoding='utf-8') as fh:
+        fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def previous_run(history, record):
+    """Última ejecución anterior con el mismo tamaño en la misma máquina, o None."""
+    for old in reversed(history):
+        if old['rows'] == record['rows'] and old['machine'] == record['machine']:
+            return old
+    return None
+
+
+def report(record, previous, threshold=THRESHOLD):
+    """Tabla de la ejecución frente a la anterior. Devuelve el número de regresiones."""
+    reference = f" frente a {previous['commit']} ({previous['timestamp']})" if previous else ""
+    print(f"\n{record['rows']:,} filas{reference}")
+    print(f"{'medida':<40} {'tiempo (ms)':>12} {'anterior':>10} {'cambio':>8} {'JSON (KiB)':>11}")
+    regressions = 0
+    for name, seconds in record['timings'].items():
+        old = previous['timings'].get(name) if previous else None
+        ratio = seconds / old if old else None
+        size = record['sizes'].get(name)
+        old_size = previous['sizes'].get(name) if previous else None
+        flag = bool((ratio is not None and ratio > threshold and seconds - old > NOISE)
+                or (size and old_size and size / old_size > threshold))
+        regressions += flag
+        print(f"{name:<40} {seconds * 1000:>12.1f} {'' if old is None else f'{old * 1000:.1f}':>10} "
+              f"{'' if ratio is None else f'{ratio:.2f}x':>8} {'' if size is None else f'{size / 1024:.0f}':>11}"
+              f"{'  ⚠ regresión' if flag else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', default=str(HISTORY))
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="cociente frente a la ejecución anterior a partir del cual se marca una regresión")
+    parser.add_argument('--no-save', action='store_true', help="no añadir la ejecución al historial")
+    args = parser.parse_args()
+
+    history, env = read_history(args.history), environment()
+    regressions = 0
+    for rows in args.rows:
+        timings, sizes = run(rows, args.repeat, args.seed)
+        record = {'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'), **env, 'rows': rows, 'seed': args.seed,
+                  'repeat': args.repeat, 'timings': timings, 'sizes': sizes}
+        regressions += report(record, previous_run(history, record), args.threshold)
+        if not args.no_save:
+            append_history(args.history, record)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
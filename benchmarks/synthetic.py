@@ -0,0 +1,127 @@
+"""Generador de CSV sintéticos con la forma de `limpio_marketingcampaigns.csv`.
+
+Mismas columnas y formatos (importes "1.234,56", ratios "0,35", fechas ISO,
+duración "328.0", "Sí"/"No"), categorías con las frecuencias del dataset real
+(incluidos los "sin datos") y una pequeña fracción de filas sucias (fechas
+vacías). Se escribe por bloques, así que sirve para 10^4–10^7 filas.
+
+Uso: python -m benchmarks.synthetic 1000000 [--out fichero.csv] [--seed 0]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from marketing.cache import CACHE_DIR
+
+BENCH_DIR = CACHE_DIR / "bench"
+CHUNK_ROWS = 500_000
+
+# Frecuencias del dataset limpio
+CATEGORIES = {
+    'tipo': {'email': 0.28, 'webinar': 0.26, 'social media': 0.232, 'podcast': 0.225,
+             'event': 0.001, 'B2B': 0.001, 'sin datos': 0.001},
+    'audiencia target': {'B2B': 0.512, 'B2C': 0.485, 'sin datos': 0.002, 'social media': 0.001},
+    'canal': {'promotion': 0.272, 'referral': 0.249, 'organic': 0.241, 'paid': 0.237, 'sin datos': 0.001},
+}
+SUCCESS_SHARE = 0.958
+# Fracción de filas sin fecha de inicio (y por tanto sin duración)
+DIRTY_SHARE = 0.003
+FIRST_DAY, LAST_DAY = np.datetime64('2022-08-01'), np.datetime64('2025-01-01')
+# Límites de las categorías derivadas (los del dataset limpio)
+DURATION_BINS = ([273, 455], ['corta', 'media', 'larga'])
+INVESTMENT_BINS = ([35_500, 59_000], ['bajo', 'medio', 'alto'])
+PROFIT_BINS = ([355_600, 594_000], ['bajo', 'medio', 'alto'])
+
+_WORDS = ['Balanced', 'Distributed', 'Public-key', 'Cloud-based', 'De-engineered', 'Focused', 'Integrated',
+          'Synergized', 'Robust', 'Optional']
+_NOUNS = ['throughput', 'methodology', 'solution', 'task-force', 'service-desk', 'initiative', 'paradigm',
+          'framework', 'strategy', 'hub']
+_EUROPEAN = str.maketrans(',.', '.,')
+
+
+def european(values):
+    """Importes con dos decimales en formato europeo ("1.234,56")."""
+    return [f"{v:,.2f}".translate(_EUROPEAN) for v in values]
+
+
+def _choice(rng, probabilities, n):
+    labels = np.array(list(probabilities), dtype=object)
+    weights = np.array(list(probabilities.values()))
+    return labels[rng.choice(len(labels), n, p=weights / weights.sum())]
+
+
+def _binned(values, bins):
+    edges, labels = bins
+    return np.array(labels, dtype=object)[np.searchsorted(edges, values, side='right')]
+
+
+def synthetic_chunk(n, rng):
+    """`n` filas de texto como las del CSV limpio."""
+    investment = np.round(rng.uniform(1_000, 100_000, n), 2)
+    revenue = np.round(rng.uniform(10_000, 1_000_000, n), 2)
+    profit = np.round(revenue - investment, 2)
+    duration = rng.integers(1, 717, n)
+    start = FIRST_DAY + rng.integers(0, (LAST_DAY - FIRST_DAY).astype(int), n).astype('timedelta64[D]')
+    end = start + duration.astype('timedelta64[D]')
+
+    df = pd.DataFrame({
+        'nombre campaña': [f"{_WORDS[a]} {_NOUNS[b]}" for a, b in rng.integers(0, 10, (n, 2))],
+        'fecha inicio': start.astype(str).astype(object),
+        'fecha fin': end.astype(str).astype(object),
+        'inversión': european(investment),
+        'retorno inversión': [f"{v:.2f}".replace('.', ',') for v in rng.integers(0, 100, n) / 100],
+        'tipo': _choice(rng, CATEGORIES['tipo'], n),
+        'audiencia target': _choice(rng, CATEGORIES['audiencia target'], n),
+        'canal': _choice(rng, CATEGORIES['canal'], n),
+        'ratio conversión': [f"{v:.2f}".replace('.', ',') for v in rng.integers(0, 101, n) / 100],
+        'facturación': european(revenue),
+        'duración días': duration.astype(float).astype(str).astype(object),
+        'categoría duración': _binned(duration, DURATION_BINS),
+        'beneficio neto': european(profit),
+        'campaña exitosa': np.where(rng.random(n) < SUCCESS_SHARE, 'Sí', 'No').astype(object),
+        'categoría inversión': _binned(investment, INVESTMENT_BINS),
+        'categoría beneficio': _binned(profit, PROFIT_BINS),
+    })
+    dirty = rng.random(n) < DIRTY_SHARE
+    df.loc[dirty, ['fecha inicio', 'fecha fin']] = None
+    df.loc[dirty, ['duración días', 'categoría duración']] = 'sin datos'
+    return df
+
+
+def write_synthetic(path, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Escribe `rows` filas sintéticas en `path` por bloques y devuelve la ruta."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    tmp = path.with_name(path.name + ".tmp")
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        synthetic_chunk(min(chunk_rows, rows - start), rng).to_csv(tmp, mode='w' if i == 0 else 'a',
+                                                                   header=i == 0, index=False)
+    tmp.replace(path)
+    return path
+
+
+def synthetic_csv(rows, seed=0, directory=BENCH_DIR):
+    """Ruta del CSV sintético de `rows` filas, generándolo sólo la primera vez."""
+    path = Path(directory) / f"sintetico-{rows}-{seed}.csv"
+    if not path.exists():
+        write_synthetic(path, rows, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--out', default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    path = write_synthetic(args.out, args.rows, args.seed) if args.out else synthetic_csv(args.rows, args.seed)
+    print(f"{path}: {args.rows:,} filas, {path.stat().st_size / 2**20:.1f} MiB ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Lógica de datos y análisis del dashboard de campañas de marketing."""
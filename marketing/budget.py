@@ -0,0 +1,130 @@
+"""Optimizador del reparto de presupuesto entre segmentos (canal × tipo).
+
+Por segmento se ajusta una curva de rendimientos decrecientes facturación =
+a · inversión^β (regresión en log-log por mínimos cuadrados, todas a la vez
+con sumas por grupo). Si el presupuesto B de un segmento se reparte entre sus
+n campañas habituales, su facturación es n · a · (B / n)^β = k · B^β.
+
+El reparto que maximiza la facturación total con Σ B = presupuesto y
+mínimo ≤ B ≤ máximo cumple que la facturación marginal k·β·B^(β-1) es igual
+en todos los segmentos que no tocan un límite. Para un λ dado cada B sale en
+forma cerrada, y λ se busca por bisección: menos de un milisegundo para decenas de segmentos.
+"""
+import numpy as np
+import pandas as pd
+
+from marketing.pipeline import MISSING
+
+SEGMENTS = ['canal', 'tipo']
+MIN_CAMPAIGNS = 10
+# β fuera de (0, 1) no es una curva de rendimientos decrecientes: se acota
+BETA_BOUNDS = (0.05, 0.95)
+# Límites por defecto de cada segmento, en proporción del presupuesto total
+MIN_SHARE = 0.02
+MAX_SHARE = 0.25
+_BISECTION_STEPS = 200
+
+
+def fit_response_curves(df, by=SEGMENTS, spend='inversión_num', revenue='facturación_num', min_campaigns=MIN_CAMPAIGNS):
+    """Curva facturación = a · inversión^β por segmento con al menos `min_campaigns` campañas.
+
+    Columnas: `by`, n, a, beta, r2 (del ajuste log-log), inversión mediana y total, facturación total, k.
+    """
+    data = df[list(by) + [spend, revenue]].dropna()
+    data = data[(data[spend] > 0) & (data[revenue] > 0)]
+    for col in by:
+        data = data[data[col].astype(str) != MISSING]
+    x = np.log(data[spend].to_numpy(dtype=float))
+    y = np.log(data[revenue].to_numpy(dtype=float))
+    logs = pd.DataFrame({'x': x, 'y': y, 'xx': x * x, 'xy': x * y, 'yy': y * y}, index=data.index)
+    for col in by:
+        logs[col] = data[col].astype(str)
+    grouped = logs.groupby(list(by), sort=True)
+    sums = grouped[['x', 'y', 'xx', 'xy', 'yy']].sum()
+    n = grouped.size()
+    sums = sums[n >= min_campaigns]
+    n = n[n >= min_campaigns].to_numpy(dtype=float)
+
+    sxx = sums['xx'] - sums['x'] ** 2 / n
+    sxy = sums['xy'] - sums['x'] * sums['y'] / n
+    syy = sums['yy'] - sums['y'] ** 2 / n
+    raw_beta = (sxy / sxx.where(sxx > 0)).fillna(0.0)
+    beta = raw_beta.clip(*BETA_BOUNDS)
+    # Con β acotado se reajusta el nivel para que la curva pase por la media de los logs
+    log_a = (sums['y'] - beta * sums['x']) / n
+    r2 = (sxy ** 2 / (sxx * syy)).where((sxx > 0) & (syy > 0), 0.0)
+
+    curves = sums.index.to_frame(index=False)
+    curves['n'] = n.astype(int)
+    curves['a'] = np.exp(log_a.to_numpy())
+    curves['beta'] = beta.to_numpy()
+    curves['beta_ajustado'] = raw_beta.to_numpy()
+    curves['r2'] = r2.to_numpy()
+    totals = data.groupby([data[col].astype(str) for col in by], sort=True)[[spend, revenue]]
+    curves['inversión_mediana'] = totals.median()[spend].reindex(sums.index).to_numpy()
+    sums_by = totals.sum().reindex(sums.index)
+    curves['inversión_total'] = sums_by[spend].to_numpy()
+    curves['facturación_total'] = sums_by[revenue].to_numpy()
+    curves['k'] = curves['a'] * curves['n'] ** (1 - curves['beta'])
+    return curves
+
+
+def predict_revenue(curves, spend):
+    """Facturación prevista de cada segmento con la inversión `spend` (array alineado con `curves`)."""
+    return curves['k'].to_numpy() * np.power(np.asarray(spend, dtype=float), curves['beta'].to_numpy())
+
+
+def typical_budget(curves, step=100_000):
+    """Presupuesto de referencia: cada segmento con sus campañas habituales a la inversión mediana."""
+    total = (curves['n'] * curves['inversión_mediana']).sum()
+    return float(max(step, round(total / step) * step))
+
+
+def allocate(curves, total, lower=0.0, upper=None):
+    """Inversión por segmento que maximiza la facturación prevista con Σ = `total`.
+
+    `lower` y `upper`: límites por segmento (escalares o arrays alineados con `curves`).
+    """
+    k = curves['k'].to_numpy(dtype=float)
+    beta = curves['beta'].to_numpy(dtype=float)
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), k.shape)
+    upper = np.broadcast_to(np.asarray(total if upper is None else upper, dtype=float), k.shape)
+    if lower.sum() > total * (1 + 1e-9) or upper.sum() < total * (1 - 1e-9):
+        raise ValueError("Los límites por segmento no permiten repartir exactamente el presupuesto")
+
+    def spend_at(log_lam):
+        # k·β·B^(β-1) = λ  =>  B = (k·β / λ)^(1 / (1 - β))
+        return np.clip(np.exp((np.log(k * beta) - log_lam) / (1 - beta)), lower, upper)
+
+    # λ alto: todos en el mínimo; λ bajo: todos en el máximo
+    floor = np.maximum(lower, total * 1e-12)
+    hi = np.max(np.log(k * beta) + (beta - 1) * np.log(floor)) + 1
+    lo = np.min(np.log(k * beta) + (beta - 1) * np.log(np.maximum(upper, floor))) - 1
+    for _ in range(_BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        if spend_at(mid).sum() > total:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo < 1e-12:
+            break
+    spend = spend_at((lo + hi) / 2)
+
+    # Ajuste final del residuo de la bisección sobre los segmentos que no están en un límite
+    free = (spend > lower) & (spend < upper)
+    if free.any():
+        spend[free] += (total - spend.sum()) * spend[free] / spend[free].sum()
+    return spend
+
+
+def allocation_table(curves, total, min_share=MIN_SHARE, max_share=MAX_SHARE):
+    """Reparto óptimo frente al histórico (misma inversión total repartida como en los datos)."""
+    optimal = allocate(curves, total, lower=total * min_share, upper=total * max_share)
+    historical = total * curves['inversión_total'].to_numpy() / curves['inversión_total'].sum()
+    table = curves.select_dtypes(exclude='number').copy()
+    table['inversión_histórica'] = historical
+    table['facturación_histórica'] = predict_revenue(curves, historical)
+    table['inversión_óptima'] = optimal
+    table['facturación_óptima'] = predict_revenue(curves, optimal)
+    table['r2'] = curves['r2'].to_numpy()
+    return table
@@ -0,0 +1,269 @@
+"""Caché persistente en disco (Arrow IPC / Feather) del DataFrame tipado.
+
+Los ficheros se escriben sin compresión para poder abrirlos con memory-map:
+varios procesos que sirvan el dashboard comparten las mismas páginas del sistema
+operativo en lugar de tener cada uno su copia parseada del CSV.
+
+La caché de un origen es una lista de segmentos Arrow más un JSON con la huella
+(tamaño, mtime y hash del contenido) de cada fichero. Cuando al origen sólo se
+le anexan filas o particiones, se parsean esas filas y se añaden como un
+segmento nuevo; si cambian filas anteriores se reconstruye todo. Por encima de
+`MAX_SEGMENTS` segmentos se compactan en uno.
+
+Varios procesos (sesiones de Streamlit, el pool de cálculo) pueden refrescar el
+mismo origen: leer el meta, escribir segmentos, reescribir el meta, borrar los
+segmentos sobrantes y abrir los vigentes se hace con un cerrojo exclusivo por
+origen (`<origen>.lock`), así que nadie abre un segmento que otro acaba de compactar.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from marketing.cube import build_cube, merge_cubes
+from marketing.data import read_campaigns
+from marketing.ingest import plan_changes, read_deltas, snapshot, source_files, source_version
+from marketing.schema import concat_frames
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - sin pyarrow se parsea siempre el CSV
+    pa = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_DIR = Path(os.environ.get("MARKETING_CACHE_DIR", ".cache"))
+# Cambiar al modificar las columnas derivadas para invalidar cachés antiguas
+CACHE_FORMAT = 3
+MAX_SEGMENTS = 8
+# Espera entre intentos de coger el cerrojo en Windows (msvcrt no tiene espera indefinida)
+_LOCK_RETRY = 0.05
+
+
+def _cache_stem(source):
+    # Incluye la ruta absoluta para que dos orígenes con el mismo nombre no compartan caché
+    source = Path(source).resolve()
+    return f"{source.stem}-{hashlib.sha1(str(source).encode()).hexdigest()[:8]}"
+
+
+def dataset_id(source):
+    """Identificador estable de un origen para nombres de fichero (nombre + hash de la ruta absoluta)."""
+    return _cache_stem(source)
+
+
+def _meta_path(source, cache_dir):
+    return Path(cache_dir) / f"{_cache_stem(source)}.json"
+
+
+def _lock_path(source, cache_dir):
+    return Path(cache_dir) / f"{_cache_stem(source)}.lock"
+
+
+@contextlib.contextmanager
+def _exclusive(lock_path):
+    """Cerrojo exclusivo entre procesos sobre `lock_path` (se libera también si el proceso muere)."""
+    with open(lock_path, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            while True:
+                try:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(_LOCK_RETRY)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_meta(meta_path):
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == CACHE_FORMAT else None
+
+
+def _atomic_write(target, write):
+    """Escribe en un temporal del mismo directorio y lo renombra: los lectores nunca ven un fichero a medias."""
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_meta(meta_path, meta):
+    _atomic_write(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(meta, indent=2)))
+
+
+def read_table(arrow_path, memory_map=True):
+    """Abre un segmento Arrow (memory-mapped) y lo convierte a pandas evitando copias."""
+    table = feather.read_table(arrow_path, memory_map=memory_map)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def write_table(df, arrow_path):
+    _atomic_write(Path(arrow_path), lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"))
+
+
+class CampaignStore:
+    """Frame tipado y cubo de agregados de un origen, actualizados de forma incremental.
+
+    `refresh()` es barato cuando nada ha cambiado (sólo un `stat` por fichero) y es
+    seguro llamarlo desde varias sesiones a la vez.
+    """
+
+    def __init__(self, source, cache_dir=CACHE_DIR, builder=read_campaigns, max_segments=MAX_SEGMENTS):
+        self.source = Path(source)
+        self.id = dataset_id(source)
+        self.cache_dir = Path(cache_dir)
+        self.builder = builder
+        self.max_segments = max_segments
+        self.frame = None
+        self.version = None
+        self._cube = None
+        self._segments = []
+        self._lock = threading.Lock()
+
+    @property
+    def cube(self):
+        """Cubo de agregados del frame actual (se construye la primera vez que se pide)."""
+        if self._cube is None and self.frame is not None:
+            self._cube = build_cube(self.frame)
+        return self._cube
+
+    @property
+    def segment_paths(self):
+        """Segmentos Arrow de la versión cargada (vacío sin pyarrow)."""
+        return [self._segment_path(name) for name in self._segments]
+
+    def _segment_path(self, name):
+        return self.cache_dir / name
+
+    def _new_segment(self, df):
+        name = f"{_cache_stem(self.source)}-{uuid.uuid4().hex[:12]}.arrow"
+        write_table(df, self._segment_path(name))
+        return name
+
+    def _drop_segments(self, names):
+        for name in names:
+            try:
+                self._segment_path(name).unlink(missing_ok=True)
+            except OSError:
+                pass  # otro proceso lo tiene abierto (Windows); queda huérfano hasta la próxima limpieza
+
+    def _rebuild(self):
+        # Huella y parseo de los mismos bytes: lo que se escriba mientras tanto se anexará después
+        files, frames = {}, []
+        for path in source_files(self.source):
+            files[path.name], data = snapshot(path)
+            frames.append(self.builder(io.BytesIO(data)))
+        return files, [self._new_segment(concat_frames(frames))]
+
+    def _update_disk(self):
+        """Escribe los segmentos que faltan para el estado del origen. Devuelve (meta anterior, meta nueva, estado).
+
+        La meta nueva no se escribe aquí: `_commit` lo hace cuando sus segmentos ya se han cargado.
+        """
+        meta_path = _meta_path(self.source, self.cache_dir)
+        meta = _read_meta(meta_path)
+        segments = meta["segments"] if meta else []
+        missing = not all(self._segment_path(name).exists() for name in segments)
+        plan = None if meta is None or missing else plan_changes(self.source, meta["files"])
+
+        if plan is None:
+            files, new_segments = self._rebuild()
+            status = "reconstruido"
+        else:
+            files, deltas = plan
+            new_segments = list(segments)
+            status = "sin cambios"
+            if deltas:
+                new_segments.append(self._new_segment(read_deltas(deltas, self.builder)))
+                status = "anexado"
+            if len(new_segments) > self.max_segments:
+                merged = concat_frames([read_table(self._segment_path(name)) for name in new_segments])
+                new_segments = [self._new_segment(merged)]
+                status = "compactado"
+
+        return meta, {"format": CACHE_FORMAT, "files": files, "segments": new_segments}, status
+
+    def _commit(self, meta, new_meta):
+        """Publica `new_meta` (y borra los segmentos que ya no usa) si cambia algo."""
+        if new_meta != meta:
+            _write_meta(_meta_path(self.source, self.cache_dir), new_meta)
+            self._drop_segments(set(meta["segments"] if meta else []) - set(new_meta["segments"]))
+
+    def refresh(self):
+        """Aplica los cambios del origen. Devuelve "sin cambios", "anexado", "compactado" o "reconstruido"."""
+        with self._lock:
+            # Con el identificador del origen: dos datasets nunca comparten versión (ni las cachés por versión)
+            version = (self.id, source_version(self.source))
+            if version == self.version:
+                return "sin cambios"
+
+            if pa is None:
+                self.frame = concat_frames([self.builder(path) for path in source_files(self.source)])
+                self._cube = None
+                self.version = version
+                return "reconstruido"
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with _exclusive(_lock_path(self.source, self.cache_dir)):
+                old_meta, meta, status = self._update_disk()
+                segments = meta["segments"]
+                known = len(self._segments)
+                incremental = self.frame is not None and segments[:known] == self._segments
+                # Los segmentos se abren (memory-map) con el cerrojo: después ya no importa que se borren.
+                # La meta sólo se publica si se cargan y se concatenan: un segmento que no se puede leer
+                # no deja la caché rota para los demás procesos ni para el siguiente refresco
+                try:
+                    names = segments[known:] if incremental else segments
+                    loaded = [read_table(self._segment_path(name)) for name in names]
+                    delta = concat_frames(loaded) if loaded else None
+                    frame = concat_frames([self.frame, delta]) if incremental and delta is not None else None
+                except Exception:
+                    self._drop_segments(set(segments) - set(old_meta["segments"] if old_meta else []))
+                    raise
+                self._commit(old_meta, meta)
+            if incremental:
+                # Sólo se cargan los segmentos nuevos y se fusiona su cubo con el existente
+                if delta is not None:
+                    self.frame = frame
+                    if self._cube is not None:
+                        self._cube = merge_cubes(self._cube, build_cube(delta))
+            else:
+                self.frame = delta
+                self._cube = None
+            self._segments = segments
+            self.version = version
+            return status
+
+
+def load_cached(source, builder=read_campaigns, cache_dir=CACHE_DIR):
+    """Devuelve el DataFrame tipado de `source`, desde la caché si el origen no ha cambiado."""
+    store = CampaignStore(source, cache_dir=cache_dir, builder=builder)
+    store.refresh()
+    return store.frame
@@ -0,0 +1,96 @@
+"""Constructores de los gráficos del dashboard, compartidos por la app y el informe estático.
+
+Reciben datos (frame, cubo o previsiones) y devuelven una figura de Plotly; no
+dependen de Streamlit.
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+
+from marketing.cube import counts_by, mean_by
+from marketing.overlap import TOTAL
+from marketing.scatter import POINT_BUDGET, scatter_figure
+
+# Valores de `tipo` que en realidad son errores de captura y se excluyen de las gráficas por tipo
+INVALID_TYPES = ['B2B', 'sin datos']
+
+
+def channel_distribution(cube):
+    channel_counts = counts_by(cube, 'canal')
+    return px.pie(values=channel_counts.values,
+                  names=channel_counts.index,
+                  title='Distribución de Campañas por Canal',
+                  hole=0.4)
+
+
+def channel_roi(cube):
+    return px.bar(mean_by(cube, 'canal', 'roi_num'),
+                  x='canal',
+                  y='roi_num',
+                  title='ROI Promedio por Canal',
+                  color='canal')
+
+
+def type_revenue(cube):
+    campaign_revenue = mean_by(cube, 'tipo', 'facturación_num')
+    campaign_revenue = campaign_revenue[~campaign_revenue['tipo'].isin(INVALID_TYPES)]
+    fig = px.bar(campaign_revenue,
+                 x='tipo',
+                 y='facturación_num',
+                 title='Ingresos Promedio por Tipo de Campaña',
+                 color='tipo')
+    fig.update_layout(xaxis_title="Tipo de Campaña", yaxis_title="Facturación Promedio")
+    return fig
+
+
+def duration_by_type(df):
+    """Box plot de duración por tipo; `df` ya sin los tipos erróneos."""
+    fig = px.box(df,
+                 x='tipo',
+                 y='duracion_num',
+                 color='tipo',
+                 title='Distribución de Duración por Tipo de Campaña')
+    fig.update_layout(xaxis_title="Tipo de Campaña", yaxis_title="Duración (días)")
+    return fig
+
+
+def investment_roi(df, budget=POINT_BUDGET, mode="auto"):
+    return scatter_figure(df, x='inversión_num', y='roi_num', color='canal',
+                          title='Relación entre Inversión y ROI', budget=budget, mode=mode)
+
+
+def roi_histogram(df):
+    return px.histogram(df, x='roi_num', title='Distribución del ROI', nbins=30)
+
+
+def duration_revenue(df, budget=POINT_BUDGET, mode="auto"):
+    return scatter_figure(df, x='duracion_num', y='facturación_num', color='canal',
+                          title='Duración vs Facturación', budget=budget, mode=mode)
+
+
+def roi_forecast(forecasts, group, frequency):
+    """Series de ROI por periodo de cada grupo (resaltando `group`) y la previsión de `group`."""
+    fit = forecasts[group][1]
+    fig = go.Figure()
+    for name, (observed, _) in forecasts.items():
+        fig.add_trace(go.Scatter(x=observed.index, y=observed, name=name, mode='lines',
+                                 opacity=1.0 if name == group else 0.35))
+    if fit is not None:
+        forecast = fit['forecast']
+        fig.add_trace(go.Scatter(x=list(forecast.index) + list(forecast.index[::-1]),
+                                 y=list(forecast['superior']) + list(forecast['inferior'][::-1]),
+                                 fill='toself', fillcolor='rgba(31,119,180,0.2)', line=dict(width=0),
+                                 name='Intervalo 95%', hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=forecast.index, y=forecast['previsión'], name=f'Previsión {group}',
+                                 mode='lines+markers', line=dict(dash='dash')))
+    fig.update_layout(title=f'ROI Promedio por Periodo y Previsión ({frequency})',
+                      xaxis_title='Inicio de campaña', yaxis_title='ROI promedio')
+    return fig
+
+
+def active_calendar(activity, measure, label, frequency):
+    """Campañas activas (o importes atribuidos) por periodo y canal, con el total en trazo discontinuo."""
+    fig = px.line(activity, x='periodo', y=measure, color='grupo',
+                  title=f'{label} por Canal ({frequency})')
+    fig.update_traces(selector=dict(name=TOTAL), line=dict(dash='dash'))
+    fig.update_layout(xaxis_title='Periodo', yaxis_title=label, legend_title_text='Canal')
+    return fig
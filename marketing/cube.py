@@ -0,0 +1,77 @@
+"""Cubo de agregados para las gráficas del EDA.
+
+Se construye una vez por versión del dataset con un único groupby sobre
+canal × tipo × audiencia target × mes y guarda, por medida, número de valores,
+suma, suma de cuadrados de las desviaciones a la media de la celda (`m2`),
+mínimo y máximo. Cualquier media, varianza o conteo por un subconjunto de
+dimensiones se obtiene después combinando celdas del cubo, sin volver a recorrer
+las filas. Las `m2` se combinan con la fórmula de Chan et al.
+(M2 = Σ M2ᵢ + Σ nᵢ·(mediaᵢ − media)²) y no con Σx² − (Σx)²/n, que con medias
+grandes frente a la dispersión (facturaciones de millones) pierde todos los
+decimales por cancelación.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ['canal', 'tipo', 'audiencia target', 'mes']
+MEASURES = ['roi_num', 'facturación_num', 'inversión_num', 'ratio_conv_num', 'beneficio_neto_num', 'duracion_num']
+STATS = ['count', 'sum', 'm2', 'min', 'max']
+
+
+def build_cube(df, dimensions=DIMENSIONS, measures=MEASURES):
+    """Agrega `df` a una celda por combinación de dimensiones (incluidas las nulas)."""
+    measures = [m for m in measures if m in df.columns]
+    frame = pd.concat([df[dimensions], df[measures].astype(float)], axis=1)
+
+    grouped = frame.groupby(dimensions, dropna=False, observed=True, sort=False)
+    basic = grouped[measures].agg(['count', 'sum', 'min', 'max'])
+    # var(ddof=0)·n: pandas la calcula por celda con un algoritmo estable (sin restar Σx² − (Σx)²/n)
+    m2 = grouped[measures].var(ddof=0).fillna(0) * basic.xs('count', axis=1, level=1)
+    m2.columns = pd.MultiIndex.from_product([measures, ['m2']])
+
+    cube = pd.concat([basic, m2], axis=1)
+    cube = cube.reindex(columns=pd.MultiIndex.from_product([measures, STATS]))
+    cube[('rows', '')] = grouped.size()
+    return cube
+
+
+def _combine(cells, **groupby):
+    """Combina celdas (`count`, `sum`, `m2`, `min`, `max` de una medida) agrupándolas según `groupby`."""
+    n = cells['count']
+    combined = cells.groupby(**groupby).agg({'count': 'sum', 'sum': 'sum', 'm2': 'sum', 'min': 'min', 'max': 'max'})
+    # Chan et al.: a la m2 de dentro de las celdas se suma la dispersión entre sus medias
+    mean = cells['sum'] / n.where(n > 0)
+    overall = cells['sum'].groupby(**groupby).transform('sum') / n.groupby(**groupby).transform('sum')
+    spread = (n * (mean - overall) ** 2).fillna(0)
+    combined['m2'] += spread.groupby(**groupby).sum()
+    return combined
+
+
+def rollup(cube, by, measure):
+    """Estadísticos de `measure` agregados por las dimensiones `by` (las celdas con `by` nulo se omiten)."""
+    cells = _combine(cube[measure], level=by, observed=True)
+    n = cells['count']
+    cells['mean'] = cells['sum'] / n.where(n > 0)
+    cells['var'] = cells['m2'] / (n - 1).where(n > 1)
+    cells['std'] = np.sqrt(cells['var'].clip(lower=0))
+    return cells
+
+
+def mean_by(cube, by, measure):
+    """Equivalente a `df.groupby(by)[measure].mean().reset_index()`."""
+    return rollup(cube, by, measure)['mean'].rename(measure).reset_index()
+
+
+def counts_by(cube, by):
+    """Equivalente a `df[by].value_counts()` (número de filas por valor, de mayor a menor)."""
+    return cube['rows'].groupby(level=by, observed=True).sum().sort_values(ascending=False).rename('count')
+
+
+def merge_cubes(*cubes):
+    """Combina cubos de bloques de filas disjuntos (p. ej. el existente y el de las filas anexadas)."""
+    combined = pd.concat(cubes)
+    groupby = {'level': list(range(combined.index.nlevels)), 'dropna': False, 'sort': False}
+    measures = [m for m in combined.columns.get_level_values(0).unique() if m != 'rows']
+    merged = pd.concat({m: _combine(combined[m], **groupby)[STATS] for m in measures}, axis=1)
+    merged[('rows', '')] = combined[('rows', '')].groupby(**groupby).sum()
+    return merged
@@ -0,0 +1,32 @@
+"""Carga del dataset limpio de campañas con las columnas numéricas derivadas."""
+import numpy as np
+import pandas as pd
+
+from marketing.parsing import EURO_COLUMNS, parse_european_columns
+from marketing.schema import apply_schema
+
+DATA_PATH = "limpio_marketingcampaigns.csv"
+
+
+def add_derived_columns(df, dtype=np.float64):
+    """Añade las columnas `_num`, `duracion_num` y `mes` a un frame leído del CSV limpio."""
+    parsed = parse_european_columns(df, EURO_COLUMNS, dtype=dtype)
+    df['inversión_num'] = parsed['inversión']
+    df['facturación_num'] = parsed['facturación']
+    df['roi_num'] = parsed['retorno inversión']
+    df['ratio_conv_num'] = parsed['ratio conversión']
+    df['duracion_num'] = pd.to_numeric(df['duración días'], errors='coerce')
+    df['beneficio_neto_num'] = parsed['beneficio neto']
+    df['fecha inicio'] = pd.to_datetime(df['fecha inicio'], errors='coerce')
+    # float64 siempre (NaN si falta la fecha), para que cualquier bloque de filas tenga el mismo esquema
+    df['mes'] = df['fecha inicio'].dt.month.astype('float64')
+    return df
+
+
+def read_campaigns(path=DATA_PATH, dtype=np.float64, compact=True):
+    """Lee el CSV limpio y devuelve el DataFrame tipado que usa la app (`compact=False`: sin aplicar el esquema)."""
+    # Todo se lee como texto y se convierte después: así un bloque de filas anexadas tiene el
+    # mismo esquema que el fichero completo (y `thousands='.'` no rompe "duración días" = 328.0)
+    df = pd.read_csv(path, dtype=str)
+    df = add_derived_columns(df, dtype=dtype)
+    return apply_schema(df) if compact else df
@@ -0,0 +1,94 @@
+"""Normalización de fechas del export bruto ("01/01/2024", "1-ene-24", "2024.01.01", "01 enero 2024").
+
+Las fechas de campaña se repiten mucho, así que el trabajo se hace sobre los
+valores únicos: cada texto distinto se clasifica una sola vez por formato, cada
+grupo de formato se parsea en bloque con un `format` fijo y el resultado se
+memoriza para los siguientes bloques del pipeline.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+SPANISH_MONTHS = {
+    'ene': 1, 'enero': 1, 'feb': 2, 'febrero': 2, 'mar': 3, 'marzo': 3,
+    'abr': 4, 'abril': 4, 'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6,
+    'jul': 7, 'julio': 7, 'ago': 8, 'agosto': 8, 'sep': 9, 'sept': 9, 'septiembre': 9,
+    'oct': 10, 'octubre': 10, 'nov': 11, 'noviembre': 11, 'dic': 12, 'diciembre': 12,
+}
+
+_MONTH_NAME = '|'.join(sorted(SPANISH_MONTHS, key=len, reverse=True))
+_MONTH_PATTERN = re.compile(rf'(?i)\b({_MONTH_NAME})\b')
+
+# (patrón sobre el texto sin espacios extremos, formato strptime, ¿lleva nombre de mes?)
+DATE_FORMATS = [
+    (r'\d{4}-\d{1,2}-\d{1,2}', '%Y-%m-%d', False),
+    (r'\d{4}\.\d{1,2}\.\d{1,2}', '%Y.%m.%d', False),
+    (r'\d{4}/\d{1,2}/\d{1,2}', '%Y/%m/%d', False),
+    (r'\d{1,2}/\d{1,2}/\d{4}', '%d/%m/%Y', False),
+    (r'\d{1,2}-\d{1,2}-\d{4}', '%d-%m-%Y', False),
+    (r'\d{1,2}\.\d{1,2}\.\d{4}', '%d.%m.%Y', False),
+    (rf'(?i)\d{{1,2}}-(?:{_MONTH_NAME})-\d{{2}}', '%d-%m-%y', True),
+    (rf'(?i)\d{{1,2}}-(?:{_MONTH_NAME})-\d{{4}}', '%d-%m-%Y', True),
+    (rf'(?i)\d{{1,2}}\s+(?:de\s+)?(?:{_MONTH_NAME})\s+(?:de\s+)?\d{{4}}', '%d %m %Y', True),
+]
+
+_NAT = np.datetime64('NaT', 'ns')
+
+
+def _month_to_number(text):
+    text = text.str.replace(_MONTH_PATTERN, lambda m: str(SPANISH_MONTHS[m.group(1).lower()]), regex=True)
+    return text.str.replace(r'(?i)\s+de\s+', ' ', regex=True).str.replace(r'\s+', ' ', regex=True)
+
+
+def parse_unique_dates(uniques):
+    """Parsea textos distintos agrupándolos por formato. Devuelve datetime64[ns] (NaT si no encaja)."""
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    out = np.full(len(text), _NAT)
+    pending = np.ones(len(text), dtype=bool)
+    for pattern, fmt, month_names in DATE_FORMATS:
+        group = pending & text.str.fullmatch(pattern).to_numpy(dtype=bool)
+        if not group.any():
+            continue
+        values = text[group]
+        if month_names:
+            values = _month_to_number(values)
+        # Formato estricto: "2023-13-01" es inválido, no el 13 de enero
+        out[group] = pd.to_datetime(values, format=fmt, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        pending &= ~group
+    if pending.any():
+        rest = text[pending]
+        rest = rest[rest.str.contains(r'\d', regex=True)]
+        if len(rest):
+            parsed = pd.to_datetime(rest, format='mixed', dayfirst=True, errors='coerce')
+            out[rest.index.to_numpy()] = parsed.to_numpy(dtype='datetime64[ns]')
+    return out
+
+
+class DateNormalizer:
+    """Memoriza el resultado de cada texto de fecha visto para no volver a detectar ni parsear."""
+
+    def __init__(self, max_size=1_000_000):
+        self.max_size = max_size
+        self._memo = {}
+
+    def __call__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        uniques = np.asarray(uniques, dtype=object)
+        parsed = np.full(len(uniques) + 1, _NAT)  # la última posición es el NaT del código -1 (nulo)
+        unseen = []
+        for i, value in enumerate(uniques):
+            hit = self._memo.get(value)
+            if hit is None:
+                unseen.append(i)
+            else:
+                parsed[i] = hit
+        if unseen:
+            parsed[unseen] = parse_unique_dates(uniques[unseen])
+            if len(self._memo) + len(unseen) > self.max_size:
+                self._memo.clear()
+            self._memo.update(zip(uniques[unseen], parsed[unseen]))
+        return pd.Series(parsed[codes], index=getattr(values, 'index', None))
+
+
+normalize_dates = DateNormalizer()
@@ -0,0 +1,378 @@
+"""Motores de consulta para filtros, cubo y KPIs: pandas en memoria o DuckDB sobre Parquet.
+
+Con `PandasBackend` todo se calcula sobre el frame tipado que ya carga la app.
+Para un histórico que no cabe en memoria, `export_parquet` convierte el CSV a
+Parquet por bloques y `DuckDBBackend` resuelve las mismas preguntas con SQL en
+un motor embebido que lee el fichero por columnas y por grupos de filas: sólo
+vuelven a Python los resultados pequeños (un cubo de agregados, unas decenas de
+medias por grupo), nunca las filas.
+
+La app elige el motor con `MARKETING_ENGINE` ("pandas" por defecto, o "duckdb"):
+con él salen las opciones de los filtros, el cubo de las gráficas agregadas y los
+KPIs. Con DuckDB, la app lee un Parquet por segmento de su caché Arrow
+(`export_segments`, en segundo plano y sólo para los segmentos nuevos). La app
+sigue cargando el frame completo en memoria (las vistas filtradas y las gráficas
+fila a fila lo necesitan), así que con ella el motor no reduce la memoria: los
+históricos que no caben se consultan con `DuckDBBackend` fuera de la app.
+
+Ambos motores aplican los filtros con la misma semántica que `FilterIndex` y los
+KPIs salen de `kpis_from_aggregates` en los dos casos. Las sumas se acumulan en
+otro orden, así que los decimales pueden diferir en el último bit:
+`python -m marketing.engine --check` compara los dos motores sobre un origen.
+
+Uso: python -m marketing.engine [origen] [--parquet fichero] [--check]
+"""
+import argparse
+import importlib.util
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from marketing.cube import DIMENSIONS, MEASURES, STATS, build_cube
+from marketing.data import DATA_PATH, add_derived_columns
+from marketing.filters import CATEGORY_FILTERS, RANGE_FILTERS, FilterIndex, _to_number
+from marketing.ingest import source_files
+from marketing.kpis import DURATION_STEP, MONTHS, kpi_aggregates, kpis_from_aggregates
+from marketing.pipeline import MISSING
+from marketing.schema import CATEGORY_COLUMNS, apply_schema
+
+# Motor de los filtros, el cubo y los KPIs de la app: "pandas" o "duckdb" (si está instalado)
+ENGINE = os.environ.get("MARKETING_ENGINE", "pandas")
+# Filas por bloque al convertir el CSV a Parquet (y por grupo de filas del fichero)
+EXPORT_CHUNK = 250_000
+
+
+def duckdb_available():
+    return importlib.util.find_spec("duckdb") is not None and importlib.util.find_spec("pyarrow") is not None
+
+
+def _out_of_core():
+    """(duckdb, pyarrow, pyarrow.parquet): se importan sólo al usar el motor out-of-core."""
+    try:
+        import duckdb
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:  # pragma: no cover - sin duckdb sólo está el motor de pandas
+        raise RuntimeError("El motor out-of-core necesita duckdb y pyarrow: pip install duckdb pyarrow") from None
+    return duckdb, pa, pq
+
+
+def _quote(col):
+    return '"' + col.replace('"', '""') + '"'
+
+
+class PandasBackend:
+    """Consultas sobre un frame tipado en memoria (el de `CampaignStore`)."""
+
+    def __init__(self, df, index=None):
+        self.df = df
+        self.index = index if index is not None else FilterIndex(df)
+
+    def frame(self, categories=None, ranges=None):
+        if not categories and not ranges:
+            return self.df
+        return self.df[self.index.mask(categories, ranges)]
+
+    def values(self, col):
+        return self.index.values(col)
+
+    def bounds(self, col):
+        return self.index.bounds(col)
+
+    def count(self, categories=None, ranges=None):
+        return len(self.frame(categories, ranges))
+
+    def cube(self, categories=None, ranges=None):
+        return build_cube(self.frame(categories, ranges))
+
+    def kpi_aggregates(self, categories=None, ranges=None):
+        return kpi_aggregates(self.frame(categories, ranges))
+
+    def kpis(self, categories=None, ranges=None):
+        return kpis_from_aggregates(self.kpi_aggregates(categories, ranges))
+
+
+def export_parquet(source, target, chunksize=EXPORT_CHUNK):
+    """Convierte el CSV limpio (o su carpeta de particiones) a un Parquet con el esquema de la app, por bloques.
+
+    Las categorías se guardan como texto (Parquet ya las codifica por diccionario) para que
+    todos los bloques compartan esquema aunque cada uno vea valores distintos.
+    """
+    _, pa, pq = _out_of_core()
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    writer = schema = None
+    try:
+        for path in source_files(source):
+            for chunk in pd.read_csv(path, dtype=str, chunksize=chunksize):
+                table = pa.Table.from_pandas(apply_schema(add_derived_columns(chunk)), preserve_index=False)
+                if schema is None:
+                    schema = _plain_schema(table.schema)
+                    writer = pq.ParquetWriter(tmp, schema)
+                writer.write_table(table.cast(schema), row_group_size=chunksize)
+    finally:
+        if writer is not None:
+            writer.close()
+    tmp.replace(target)
+    return target
+
+
+def _plain_schema(schema):
+    """El esquema con las columnas de diccionario (categorías) como su tipo de valor."""
+    _, pa, _ = _out_of_core()
+    return pa.schema([pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f for f in schema])
+
+
+def export_segments(segments, target):
+    """Un Parquet por segmento de la caché Arrow de `CampaignStore` en el directorio `target`.
+
+    Incremental: sólo se convierten los segmentos que aún no tienen Parquet (tras anexar filas,
+    el segmento nuevo) y se borran los de segmentos que ya no existen (compactados). No se
+    vuelve a parsear el CSV. Devuelve `target`, el directorio que lee `DuckDBBackend`.
+    """
+    _, pa, pq = _out_of_core()
+    import pyarrow.feather as feather
+    from marketing.cache import _atomic_write
+
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    wanted = set()
+    for segment in map(Path, segments):
+        out = target / f"{segment.stem}.parquet"
+        wanted.add(out.name)
+        if not out.exists():
+            table = feather.read_table(segment, memory_map=True).replace_schema_metadata(None)
+            table = table.cast(_plain_schema(table.schema))
+            _atomic_write(out, lambda tmp: pq.write_table(table, tmp, row_group_size=EXPORT_CHUNK))
+    for old in target.glob("*.parquet"):
+        if old.name not in wanted:
+            old.unlink(missing_ok=True)
+    return str(target)
+
+
+class DuckDBBackend:
+    """Las mismas consultas que `PandasBackend`, en SQL sobre un Parquet o un directorio de ellos (sin cargar filas)."""
+
+    def __init__(self, parquet):
+        duckdb, _, _ = _out_of_core()
+        self.path = Path(parquet)
+        files = f"{self.path.as_posix()}/*.parquet" if self.path.is_dir() else self.path.as_posix()
+        self._con = duckdb.connect()
+        self._con.execute(f"CREATE VIEW campañas AS SELECT * FROM read_parquet('{files}', union_by_name = true)")
+        self.columns = [row[0] for row in self._con.execute("DESCRIBE campañas").fetchall()]
+        self._values, self._bounds = {}, {}
+        self._lock = threading.Lock()
+
+    def _query(self, sql, params=()):
+        # Un cursor por consulta: la conexión se comparte entre hilos (sesiones de Streamlit)
+        with self._lock:
+            cursor = self._con.cursor()
+        return cursor.execute(sql, list(params)).df()
+
+    def values(self, col):
+        if col not in self._values:
+            rows = self._query(f"SELECT DISTINCT {_quote(col)} AS v FROM campañas WHERE v IS NOT NULL ORDER BY v")
+            self._values[col] = rows['v'].tolist()
+        return self._values[col]
+
+    def bounds(self, col):
+        """(mínimo, máximo) sin nulos; las fechas en segundos, como `FilterIndex.bounds`."""
+        if col not in self._bounds:
+            value = f"epoch({_quote(col)})" if col in ('fecha inicio', 'fecha fin') else f"{_quote(col)}::DOUBLE"
+            row = self._query(f"SELECT min({value}) AS lo, max({value}) AS hi FROM campañas").iloc[0]
+            self._bounds[col] = (float(row['lo']), float(row['hi'])) if pd.notna(row['lo']) else (np.nan, np.nan)
+        return self._bounds[col]
+
+    def where(self, categories=None, ranges=None):
+        """Cláusula WHERE y parámetros. Como `FilterIndex.mask`, un filtro que no descarta nada no se aplica."""
+        clauses, params = [], []
+        for col, values in (categories or {}).items():
+            if set(self.values(col)) - set(values):
+                if values:
+                    clauses.append(f"{_quote(col)} IN ({', '.join('?' * len(values))})")
+                    params += list(values)
+                else:
+                    clauses.append("FALSE")
+        for col, (low, high) in (ranges or {}).items():
+            lowest, highest = self.bounds(col)
+            low, high = _to_number(low), _to_number(high)
+            if low > lowest or high < highest:
+                value = f"epoch({_quote(col)})" if col in ('fecha inicio', 'fecha fin') else f"{_quote(col)}::DOUBLE"
+                clauses.append(f"{value} BETWEEN ? AND ?")
+                params += [low, high]
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def count(self, categories=None, ranges=None):
+        where, params = self.where(categories, ranges)
+        return int(self._query(f"SELECT count(*) AS n FROM campañas {where}", params)['n'].iloc[0])
+
+    def cube(self, categories=None, ranges=None):
+        """Mismo cubo que `build_cube` (columnas `(medida, estadístico)` y `('rows', '')`)."""
+        where, params = self.where(categories, ranges)
+        measures = [m for m in MEASURES if m in self.columns]
+        dims = ', '.join(_quote(d) for d in DIMENSIONS)
+        stats = []
+        for i, m in enumerate(measures):
+            value = f"{_quote(m)}::DOUBLE"
+            stats += [f"count({value}) AS c{i}", f"coalesce(sum({value}), 0) AS s{i}",
+                      f"coalesce(var_pop({value}) * count({value}), 0) AS q{i}",
+                      f"min({value}) AS lo{i}", f"max({value}) AS hi{i}"]
+        cells = self._query(f"SELECT {dims}, {', '.join(stats)}, count(*) AS n FROM campañas {where} GROUP BY ALL",
+                            params)
+        cube = pd.DataFrame({(m, stat): cells[f"{prefix}{i}"].astype(float)
+                             for i, m in enumerate(measures)
+                             for stat, prefix in zip(STATS, ['c', 's', 'q', 'lo', 'hi'])})
+        cube[('rows', '')] = cells['n'].astype('int64')
+        cube.index = pd.MultiIndex.from_frame(cells[DIMENSIONS])
+        return cube
+
+    def kpi_aggregates(self, categories=None, ranges=None):
+        """Los agregados de `kpi_aggregates`, cada grupo con una consulta GROUP BY."""
+        where, params = self.where(categories, ranges)
+        and_where = f"{where} AND" if where else "WHERE"
+        roi, conversion = '"roi_num"::DOUBLE', '"ratio_conv_num"::DOUBLE'
+        categorical = [col for col in CATEGORY_COLUMNS if col in self.columns]
+        invalid = ' OR '.join([f"{_quote(c)} IS NULL" for c in self.columns]
+                              + [f"{_quote(c)} = '{MISSING}'" for c in categorical])
+
+        totals = self._query(f"""
+            WITH filas AS (SELECT * FROM campañas {where}),
+                 mediana AS (SELECT quantile_cont({roi}, 0.5) AS m FROM filas)
+            SELECT count(*) AS rows,
+                   (SELECT count(*) FROM (SELECT DISTINCT * FROM filas)) AS unique_rows,
+                   {' + '.join(f'count(*) - count({_quote(c)})' for c in self.columns)} AS nulls,
+                   coalesce(count_if({invalid}), 0) AS invalid_rows,
+                   avg({roi}) AS roi_mean,
+                   any_value(mediana.m) AS roi_median,
+                   avg(CASE WHEN {roi} IS NULL OR {roi} < mediana.m THEN mediana.m ELSE {roi} END) AS roi_floor_mean,
+                   avg({conversion}) AS conversion_mean,
+                   avg("campaña exitosa"::DOUBLE) AS success_share
+            FROM filas, mediana""", params).iloc[0]
+
+        def group_means(key, value):
+            rows = self._query(f"SELECT {key} AS k, avg({value}) AS mean, count({value}) AS n FROM campañas "
+                               f"{and_where} {key} IS NOT NULL GROUP BY k ORDER BY k", params)
+            return rows['k'], rows['mean'].fillna(np.nan).to_numpy(dtype=float), rows['n'].to_numpy(dtype=np.int64)
+
+        # Todos los valores de la dimensión (también los que no tienen filas con estos filtros), como las categorías
+        def by_label(col, value):
+            labels, means, counts = group_means(_quote(col), value)
+            full = np.asarray(self.values(col), dtype=object)
+            position = pd.Index(full).get_indexer(labels.to_numpy(dtype=object))
+            full_means, full_counts = np.full(len(full), np.nan), np.zeros(len(full), dtype=np.int64)
+            full_means[position], full_counts[position] = means, counts
+            return full, full_means, full_counts
+
+        def by_code(key, value, n_codes):
+            codes, means, counts = group_means(key, value)
+            full_means, full_counts = np.full(n_codes, np.nan), np.zeros(n_codes, dtype=np.int64)
+            codes = codes.to_numpy(dtype=np.int64)
+            full_means[codes], full_counts[codes] = means, counts
+            return full_means, full_counts
+
+        n = int(totals['rows'])
+        duration_bin = f'floor("duracion_num"::DOUBLE / {DURATION_STEP})::BIGINT'
+        n_bins = 0
+        if n:
+            last = self._query(f"SELECT max({duration_bin}) AS b FROM campañas {where}", params)['b'].iloc[0]
+            n_bins = int(last) + 1 if pd.notna(last) else 0
+
+        number = lambda value: float(value) if pd.notna(value) else np.nan
+        return {
+            'rows': n,
+            'unique_rows': int(totals['unique_rows']),
+            'nulls': int(totals['nulls']),
+            'invalid_rows': int(totals['invalid_rows']),
+            'roi_mean': number(totals['roi_mean']),
+            'roi_median': number(totals['roi_median']),
+            'roi_floor_mean': number(totals['roi_floor_mean']),
+            'conversion_mean': number(totals['conversion_mean']),
+            'success_share': number(totals['success_share']),
+            'channel_roi': by_label('canal', roi),
+            'type_conversion': by_label('tipo', conversion),
+            'duration_roi': (np.arange(n_bins), *by_code(duration_bin, roi, n_bins)),
+            'month_roi': by_code('"mes"::BIGINT - 1', roi, len(MONTHS)),
+        }
+
+    def kpis(self, categories=None, ranges=None):
+        return kpis_from_aggregates(self.kpi_aggregates(categories, ranges))
+
+
+def _same(a, b, rtol=1e-9):
+    if isinstance(a, (float, np.floating)) or isinstance(b, (float, np.floating)):
+        return bool(np.isclose(a, b, rtol=rtol, equal_nan=True))
+    return a == b
+
+
+def compare_backends(left, right, categories=None, ranges=None):
+    """Diferencias (lista de textos) entre dos motores para unos filtros: conteo, cubo y KPIs."""
+    differences = []
+    if left.count(categories, ranges) != right.count(categories, ranges):
+        differences.append("número de filas")
+
+    def normalized(cube):
+        # Los niveles del índice como objetos: pandas los deja categóricos, DuckDB como texto
+        cube = cube.copy()
+        cube.index = pd.MultiIndex.from_arrays(
+            [cube.index.get_level_values(i).astype(object) for i in range(cube.index.nlevels)])
+        return cube.sort_index()
+
+    a, b = normalized(left.cube(categories, ranges)), normalized(right.cube(categories, ranges))
+    if not a.index.equals(b.index) or list(a.columns) != list(b.columns):
+        differences.append("celdas del cubo")
+    elif not np.allclose(a.to_numpy(dtype=float), b.to_numpy(dtype=float), rtol=1e-9, equal_nan=True):
+        differences.append("valores del cubo")
+
+    ka, kb = left.kpis(categories, ranges), right.kpis(categories, ranges)
+    differences += [f"KPI {key}: {ka[key]!r} != {kb[key]!r}" for key in ka if not _same(ka[key], kb[key])]
+    return differences
+
+
+def _check(pandas_backend, duck_backend):
+    selections = [({}, {})]
+    for col in CATEGORY_FILTERS:
+        values = pandas_backend.values(col)
+        selections.append(({col: tuple(values[:max(1, len(values) // 2)])}, {}))
+    for col in RANGE_FILTERS:
+        low, high = pandas_backend.bounds(col)
+        selections.append(({}, {col: (low + (high - low) / 4, high - (high - low) / 4)}))
+        selections.append(({}, {col: (low, low + (high - low) / 1000)}))
+    selections.append(({'canal': (pandas_backend.values('canal')[0],)}, {'inversión_num': (0.0, 0.0)}))
+    failures = 0
+    for categories, ranges in selections:
+        differences = compare_backends(pandas_backend, duck_backend, categories, ranges)
+        failures += bool(differences)
+        print(f"{'OK ' if not differences else 'ERR'} {categories or ''} {ranges or ''} {'; '.join(differences)}")
+    return failures
+
+
+def main():
+    from marketing.cache import load_cached
+
+    parser = argparse.ArgumentParser(description="Convierte el dataset a Parquet y consulta cubo y KPIs con DuckDB.")
+    parser.add_argument('source', nargs='?', default=DATA_PATH)
+    parser.add_argument('--parquet', default=None, help="Fichero Parquet (por defecto, junto al origen)")
+    parser.add_argument('--check', action='store_true', help="Comparar con el motor de pandas (carga el frame)")
+    args = parser.parse_args()
+
+    target = Path(args.parquet or Path(args.source).with_suffix('.parquet'))
+    start = time.perf_counter()
+    export_parquet(args.source, target)
+    print(f"{target}: {target.stat().st_size / 2**20:.1f} MiB ({time.perf_counter() - start:.1f} s)")
+
+    backend = DuckDBBackend(target)
+    for name, query in [('cubo', backend.cube), ('KPIs', backend.kpis)]:
+        start = time.perf_counter()
+        query()
+        print(f"{name} con DuckDB: {(time.perf_counter() - start) * 1000:.0f} ms")
+    if args.check:
+        raise SystemExit(1 if _check(PandasBackend(load_cached(args.source)), backend) else 0)
+
+
+if __name__ == '__main__':
+    main()
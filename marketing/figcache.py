@@ -0,0 +1,92 @@
+"""Caché de figuras de Plotly ya serializadas.
+
+Construir una figura con Plotly Express y serializarla a JSON cuesta decenas de
+milisegundos (cientos con muchos puntos) y Streamlit lo repite en cada rerun
+aunque no haya cambiado nada. La caché guarda el JSON de cada figura por
+(gráfico, huella del dataset, filtros y parámetros), con expulsión LRU por
+tamaño, y devuelve una `CachedFigure` que entrega ese JSON a `st.plotly_chart`
+sin reconstruir ni revalidar la figura. Cada figura pertenece a un grupo (el
+dataset): se puede medir y vaciar lo de un grupo sin tocar el resto.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+FIGURE_CACHE_BYTES = int(os.environ.get("MARKETING_FIGURE_CACHE_MB", 64)) << 20
+
+
+class CachedFigure(go.Figure):
+    """Figura que sólo sirve para pintarse: `to_dict` devuelve (una copia de) el JSON guardado."""
+
+    def __init__(self, spec):
+        super().__init__()
+        self._spec = spec  # Plotly sólo admite atributos propios con guion bajo
+
+    def to_dict(self):
+        return json.loads(self._spec)
+
+    def to_plotly_json(self):
+        return self.to_dict()
+
+    def to_json(self, *args, **kwargs):
+        return self._spec
+
+
+class FigureCache:
+    """JSON de figuras por clave con expulsión LRU por tamaño y estadísticas de aciertos."""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._specs = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, build, group=None):
+        """Figura de `key`; si no está, `build()` la construye y se guarda su JSON (en `group`)."""
+        with self._lock:
+            entry = self._specs.get(key)
+            if entry is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                return CachedFigure(entry[0])
+            self.misses += 1
+        spec = pio.to_json(build(), validate=False)
+        # Una figura mayor que toda la caché no se guarda (expulsaría todo lo demás)
+        if len(spec) <= self.max_bytes:
+            with self._lock:
+                if key not in self._specs:
+                    self._specs[key] = (spec, group)
+                    self._bytes += len(spec)
+                while self._bytes > self.max_bytes:
+                    _, (old, _) = self._specs.popitem(last=False)
+                    self._bytes -= len(old)
+                    self.evictions += 1
+        return CachedFigure(spec)
+
+    def size(self, group):
+        """Bytes de las figuras de `group`."""
+        with self._lock:
+            return sum(len(spec) for spec, owner in self._specs.values() if owner == group)
+
+    def discard(self, group):
+        """Quita las figuras de `group` (p. ej. las de un dataset que se ha cerrado)."""
+        with self._lock:
+            for key in [key for key, (_, owner) in self._specs.items() if owner == group]:
+                self._bytes -= len(self._specs.pop(key)[0])
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else None,
+                    'entries': len(self._specs), 'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self._bytes = 0
@@ -0,0 +1,92 @@
+"""Índice de filtros globales sobre el DataFrame de campañas.
+
+Al cargar una versión del dataset se precalcula un bitmap (`np.packbits`) por
+cada valor de las dimensiones categóricas y el orden de las columnas de rango.
+Un filtro se resuelve después con OR/AND de bitmaps y un `searchsorted` por
+rango, sin recorrer las columnas del frame en cada rerun de Streamlit.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY_FILTERS = ['canal', 'tipo', 'audiencia target']
+RANGE_FILTERS = ['fecha inicio', 'inversión_num']
+
+
+def _range_values(series):
+    """Valores numéricos ordenables de la columna (NaN para nulos; las fechas en segundos)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy('datetime64[s]')
+        return np.where(np.isnat(values), np.nan, values.astype(np.int64).astype(float))
+    return series.to_numpy(dtype=float)
+
+
+def _to_number(value):
+    if isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, 'isoformat'):
+        return pd.Timestamp(value).timestamp()
+    return float(value)
+
+
+class FilterIndex:
+    """Bitmaps por valor y columnas de rango ordenadas de un frame."""
+
+    def __init__(self, df, categories=CATEGORY_FILTERS, ranges=RANGE_FILTERS):
+        self.n = len(df)
+        self._all = np.packbits(np.ones(self.n, dtype=bool))
+        self.bitmaps = {}
+        for col in categories:
+            codes = df[col].astype('category')
+            labels = codes.cat.categories
+            codes = codes.cat.codes.to_numpy()
+            self.bitmaps[col] = {label: np.packbits(codes == i) for i, label in enumerate(labels)}
+        self._sorted = {}
+        for col in ranges:
+            values = _range_values(df[col])
+            order = np.argsort(values, kind='stable')  # los NaN quedan al final
+            self._sorted[col] = (values[order], order)
+
+    @property
+    def nbytes(self):
+        return (sum(bitmap.nbytes for bitmaps in self.bitmaps.values() for bitmap in bitmaps.values())
+                + sum(values.nbytes + order.nbytes for values, order in self._sorted.values()) + self._all.nbytes)
+
+    def values(self, col):
+        """Valores de una dimensión categórica, en el orden de sus categorías."""
+        return list(self.bitmaps[col])
+
+    def bounds(self, col):
+        """(mínimo, máximo) de una columna de rango, sin contar nulos."""
+        values, _ = self._sorted[col]
+        values = values[~np.isnan(values)]
+        return (values[0], values[-1]) if len(values) else (np.nan, np.nan)
+
+    def select(self, col, values):
+        """Bitmap de las filas cuyo `col` está en `values`."""
+        bitmaps = [self.bitmaps[col][v] for v in values if v in self.bitmaps[col]]
+        if not bitmaps:
+            return np.zeros_like(self._all)
+        return np.bitwise_or.reduce(bitmaps)
+
+    def between(self, col, low, high):
+        """Bitmap de las filas con `low <= col <= high` (fechas como Timestamp/date o números)."""
+        values, order = self._sorted[col]
+        start = np.searchsorted(values, _to_number(low), side='left')
+        stop = np.searchsorted(values, _to_number(high), side='right')
+        rows = np.zeros(self.n, dtype=bool)
+        rows[order[start:stop]] = True
+        return np.packbits(rows)
+
+    def mask(self, categories=None, ranges=None):
+        """Máscara booleana del AND de todos los filtros.
+
+        `categories = {col: valores}` y `ranges = {col: (mínimo, máximo)}`. Un filtro que
+        selecciona todos los valores o todo el rango no descarta filas (ni las nulas).
+        """
+        bits = self._all
+        for col, values in (categories or {}).items():
+            if set(self.bitmaps[col]) - set(values):
+                bits = bits & self.select(col, values)
+        for col, (low, high) in (ranges or {}).items():
+            lowest, highest = self.bounds(col)
+            if _to_number(low) > lowest or _to_number(high) < highest:
+                bits = bits & self.between(col, low, high)
+        return np.unpackbits(bits, count=self.n).astype(bool)
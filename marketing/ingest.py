@@ -0,0 +1,154 @@
+"""Detección de cambios en el origen de datos e ingesta incremental.
+
+El origen es un CSV o un directorio de particiones `*.csv`. Frente a la huella
+guardada de cada fichero se distingue:
+
+- sin cambios (mismo tamaño y mtime, o mismo contenido);
+- bytes anexados al final (el prefijo conocido tiene el mismo hash);
+- particiones nuevas;
+- cualquier otra cosa (filas anteriores modificadas, ficheros borrados o
+  truncados), que obliga a reconstruir desde cero.
+
+Sólo se parsean las filas nuevas. La huella guardada describe exactamente los
+bytes que se han parseado: el fichero puede seguir creciendo mientras se lee,
+así que se lee hasta el tamaño tomado en la huella y no hasta el final. De lo
+anexado sólo se ingieren las líneas completas (hasta el último salto de línea);
+una línea a medio escribir se queda para el siguiente refresco.
+"""
+import hashlib
+import io
+import os
+from pathlib import Path
+
+from marketing.data import read_campaigns
+from marketing.schema import concat_frames
+
+_HASH_CHUNK = 1 << 20
+
+
+def source_files(source):
+    """Ficheros CSV del origen, en orden estable."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source.glob("*.csv"))
+    return [source]
+
+
+def source_version(source):
+    """Clave barata (nombre, tamaño, mtime) de todos los ficheros, sin leerlos."""
+    version = []
+    for path in source_files(source):
+        stat = os.stat(path)
+        version.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(version)
+
+
+def content_hash(path, prefix=None, size=None):
+    """SHA-256 de los primeros `size` bytes del fichero (todo si es None).
+
+    Con `prefix` devuelve también el hash y el último byte de los primeros `prefix` bytes.
+    """
+    digest = hashlib.sha256()
+    prefix_digest = last_byte = None
+    read = 0
+    with open(path, "rb") as fh:
+        while size is None or read < size:
+            chunk = fh.read(_HASH_CHUNK if size is None else min(_HASH_CHUNK, size - read))
+            if not chunk:
+                break
+            if prefix is not None and read < prefix <= read + len(chunk):
+                cut = prefix - read
+                digest.update(chunk[:cut])
+                prefix_digest, last_byte = digest.hexdigest(), chunk[cut - 1:cut]
+                digest.update(chunk[cut:])
+            else:
+                digest.update(chunk)
+            read += len(chunk)
+    if prefix is None:
+        return digest.hexdigest()
+    return digest.hexdigest(), prefix_digest, last_byte
+
+
+def fingerprint(path, previous=None):
+    """Huella completa de un fichero. Reutiliza `previous` si tamaño y mtime coinciden."""
+    stat = os.stat(path)
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        return previous
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash(path, size=stat.st_size)}
+
+
+def snapshot(path):
+    """(huella, contenido) leyendo el fichero una sola vez: la huella es la de los bytes devueltos."""
+    stat = os.stat(path)
+    with open(path, "rb") as fh:
+        data = fh.read(stat.st_size)
+    return {"size": len(data), "mtime_ns": stat.st_mtime_ns, "sha256": hashlib.sha256(data).hexdigest()}, data
+
+
+def complete_lines_end(path, start, stop):
+    """Posición tras el último salto de línea de los bytes [start, stop), o `start` si no hay ninguno."""
+    with open(path, "rb") as fh:
+        end = stop
+        while end > start:
+            begin = max(start, end - _HASH_CHUNK)
+            fh.seek(begin)
+            newline = fh.read(end - begin).rfind(b"\n")
+            if newline >= 0:
+                return begin + newline + 1
+            end = begin
+    return start
+
+
+def plan_changes(source, known):
+    """Compara el origen con las huellas conocidas `{nombre: huella}`.
+
+    Devuelve `(huellas_actuales, deltas)` con `deltas = [(ruta, desde, hasta)]`, los bytes a
+    parsear (desde 0 en particiones nuevas), o None si hay que reconstruir.
+    """
+    files = source_files(source)
+    if set(known) - {path.name for path in files}:
+        return None  # partición eliminada
+
+    current, deltas = {}, []
+    for path in files:
+        previous = known.get(path.name)
+        if previous is None:
+            current[path.name] = fp = fingerprint(path)
+            deltas.append((path, 0, fp["size"]))
+            continue
+
+        stat = os.stat(path)
+        if stat.st_size < previous["size"]:
+            return None
+        if stat.st_size == previous["size"]:
+            fp = fingerprint(path, previous)
+            if fp["sha256"] != previous["sha256"]:
+                return None
+            current[path.name] = fp
+            continue
+
+        # Sólo las líneas completas: el resto se anexará cuando el escritor termine la línea
+        end = complete_lines_end(path, previous["size"], stat.st_size)
+        full, prefix, last_byte = content_hash(path, prefix=previous["size"], size=end)
+        # El contenido anterior debe seguir intacto y terminar en una línea completa
+        if prefix != previous["sha256"] or last_byte != b"\n":
+            return None
+        if end == previous["size"]:
+            current[path.name] = previous
+            continue
+        current[path.name] = {"size": end, "mtime_ns": stat.st_mtime_ns, "sha256": full}
+        deltas.append((path, previous["size"], end))
+    return current, deltas
+
+
+def read_range(path, start, stop, builder=read_campaigns):
+    """Parsea las filas de los bytes [start, stop) (con `start` > 0 se reutiliza la cabecera del fichero)."""
+    with open(path, "rb") as fh:
+        header = fh.readline() if start else b""
+        fh.seek(start)
+        data = fh.read(stop - start)
+    return builder(io.BytesIO(header + data))
+
+
+def read_deltas(deltas, builder=read_campaigns):
+    return concat_frames([read_range(path, start, stop, builder) for path, start, stop in deltas])
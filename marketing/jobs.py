@@ -0,0 +1,167 @@
+"""Cálculos en segundo plano y almacén de resultados publicados.
+
+Los cálculos caros (contrastes con bootstrap, previsiones, entrenamiento de
+modelos) no se hacen dentro de la ejecución del script de Streamlit: se encargan
+a un pool local de procesos que publica cada resultado en disco con escrituras
+atómicas. Cada resultado ocupa una "ranura" (la pregunta: p. ej. ROI por canal
+con ciertos filtros) y lleva la clave de los datos con los que se calculó. La app
+lee siempre el último resultado completo de la ranura y sabe si está al día o si
+hay uno más reciente calculándose.
+"""
+import hashlib
+import importlib
+import json
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import joblib
+
+from marketing.cache import CACHE_DIR, _atomic_write
+
+RESULTS_DIR = CACHE_DIR / "results"
+# Resultados ya cargados que se mantienen en memoria por proceso
+MAX_LOADED = 64
+
+
+def slot_name(kind, *params):
+    """Nombre de fichero estable para la ranura `kind` con los parámetros dados."""
+    return f"{kind}-{hashlib.sha1(repr(params).encode()).hexdigest()[:16]}"
+
+
+def version_key(version):
+    """Clave corta de una versión del dataset (cualquier valor con `repr` estable)."""
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:16]
+
+
+class ResultStore:
+    """Último resultado publicado por ranura: un joblib por resultado y un puntero JSON por ranura."""
+
+    def __init__(self, root=RESULTS_DIR):
+        self.root = Path(root)
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pointer(self, slot):
+        return self.root / f"{slot}.json"
+
+    def _read_pointer(self, slot):
+        try:
+            return json.loads(self._pointer(slot).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, slot, key, value):
+        """Escribe el resultado y después mueve el puntero: los lectores nunca ven uno a medias."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{slot}-{key}.joblib"
+        _atomic_write(path, lambda tmp: joblib.dump(value, tmp))
+        previous = self._read_pointer(slot)
+        pointer = {'key': key, 'file': path.name, 'published_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        _atomic_write(self._pointer(slot), lambda tmp: Path(tmp).write_text(json.dumps(pointer)))
+        if previous and previous['file'] != path.name:
+            (self.root / previous['file']).unlink(missing_ok=True)
+
+    def latest(self, slot):
+        """(clave, valor) del último resultado publicado en `slot`, o (None, None)."""
+        pointer = self._read_pointer(slot)
+        if pointer is None:
+            return None, None
+        with self._lock:
+            if pointer['file'] in self._loaded:
+                self._loaded.move_to_end(pointer['file'])
+                return pointer['key'], self._loaded[pointer['file']]
+        try:
+            value = joblib.load(self.root / pointer['file'])
+        except (OSError, EOFError, ValueError):
+            # Sustituido entre leer el puntero y abrirlo: el siguiente intento verá el nuevo
+            return None, None
+        with self._lock:
+            self._loaded[pointer['file']] = value
+            while len(self._loaded) > MAX_LOADED:
+                self._loaded.popitem(last=False)
+        return pointer['key'], value
+
+
+def _run(root, slot, key, func, args, kwargs):
+    if isinstance(func, str):
+        module, name = func.split(':')
+        func = getattr(importlib.import_module(module), name)
+    ResultStore(root).publish(slot, key, func(*args, **kwargs))
+
+
+class Precomputer:
+    """Encarga cálculos a un pool de procesos y publica sus resultados en un `ResultStore`.
+
+    Los procesos se crean con "spawn" (el servidor de Streamlit tiene hilos: no es seguro
+    hacer fork) y se reutilizan entre trabajos. Cada (ranura, clave) se calcula una sola vez.
+    La función puede darse como "módulo:función" para que sólo el proceso de cálculo
+    importe su pila (scipy, statsmodels, sklearn).
+    """
+
+    def __init__(self, store=None, workers=1):
+        self.store = store or ResultStore()
+        self.workers = workers
+        self.errors = {}
+        self._pool = None
+        self._pending = {}
+        self._checked = set()
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def _done(self, job, future):
+        with self._lock:
+            self._pending.pop(job, None)
+            if future.exception() is not None:
+                self.errors[job] = repr(future.exception())
+
+    def ensure(self, slot, key, func, *args, **kwargs):
+        """Encarga `func(*args, **kwargs)` si `slot` no tiene ya publicado (ni calculándose) el resultado de `key`."""
+        job = (slot, key)
+        with self._lock:
+            if job in self._checked or job in self._pending or job in self.errors:
+                return
+        if self.store.latest(slot)[0] == key:
+            with self._lock:
+                self._checked.add(job)
+            return
+        with self._lock:
+            if job in self._pending:
+                return
+            try:
+                future = self._executor().submit(_run, str(self.store.root), slot, key, func, args, kwargs)
+            except BrokenProcessPool:
+                # Un proceso murió (p. ej. por memoria): se descarta el pool y se crea otro
+                self._pool = None
+                future = self._executor().submit(_run, str(self.store.root), slot, key, func, args, kwargs)
+            self._pending[job] = future
+        future.add_done_callback(lambda f: self._done(job, f))
+
+    def result(self, slot, key, func, *args, **kwargs):
+        """(último valor publicado en `slot` o None, si corresponde a `key`). Encarga el de `key` si falta."""
+        self.ensure(slot, key, func, *args, **kwargs)
+        latest_key, value = self.store.latest(slot)
+        if latest_key == key:
+            with self._lock:
+                self._checked.add((slot, key))
+        return value, latest_key == key
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def failed(self, slot, key):
+        return self.errors.get((slot, key))
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
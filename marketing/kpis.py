@@ -0,0 +1,141 @@
+"""KPIs de las tarjetas de Preprocesamiento e Insights, calculados sobre el dataset actual.
+
+Todo sale de una pasada vectorizada: cada agregado por grupo es un `np.bincount`
+sobre los códigos de la categoría. La app los cachea por versión del dataset,
+así que el coste no depende del número de sesiones.
+"""
+import numpy as np
+import pandas as pd
+
+from marketing.pipeline import MISSING, OUTPUT_COLUMNS, RAW_COLUMNS, SeenRows, iter_raw_chunks
+
+# Anchura de los tramos de duración para buscar la duración óptima
+DURATION_STEP = 50
+# Un tramo o grupo necesita al menos esta fracción de las campañas para competir por "el mejor"
+MIN_SHARE = 0.05
+MONTHS = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+          'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+
+def _group_means(codes, values, n_groups):
+    """Media y número de valores no nulos de `values` por código (los códigos negativos se ignoran)."""
+    ok = (codes >= 0) & ~np.isnan(values)
+    counts = np.bincount(codes[ok], minlength=n_groups)
+    sums = np.bincount(codes[ok], weights=values[ok], minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts, counts
+
+
+def _best(labels, means, counts, min_count):
+    """(etiqueta, media) del grupo con mayor media entre los que tienen al menos `min_count` valores."""
+    valid = labels != MISSING
+    eligible = valid & (counts >= min_count)
+    if not eligible.any():
+        eligible = valid & (counts > 0)
+    if not eligible.any():
+        return None, np.nan
+    i = np.flatnonzero(eligible)[np.argmax(means[eligible])]
+    return labels[i], means[i]
+
+
+def _categorical(series):
+    categorical = series.astype('category')
+    return categorical.cat.codes.to_numpy(), np.asarray(categorical.cat.categories, dtype=object)
+
+
+def kpi_aggregates(df):
+    """Agregados de los que salen los KPIs (totales y medias por grupo), con una pasada por columna."""
+    n = len(df)
+    roi = df['roi_num'].to_numpy(dtype=float)
+    conversion = df['ratio_conv_num'].to_numpy(dtype=float)
+    roi_median = np.nanmedian(roi) if n else np.nan
+
+    channel_codes, channels = _categorical(df['canal'])
+    type_codes, types = _categorical(df['tipo'])
+
+    # Tramos de DURATION_STEP días (el código es el número de tramo)
+    duration = df['duracion_num'].to_numpy(dtype=float)
+    duration_codes = np.where(np.isnan(duration), -1, duration // DURATION_STEP).astype(np.int64)
+    n_bins = int(duration_codes.max()) + 1 if n and duration_codes.max() >= 0 else 0
+
+    month = df['mes'].to_numpy(dtype=float)
+    month_codes = np.where(np.isnan(month), -1, month - 1).astype(np.int64)
+
+    category_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    nulls = df.isna()
+    invalid = nulls.any(axis=1).to_numpy(copy=True)
+    for col in category_columns:
+        invalid |= (df[col] == MISSING).to_numpy(dtype=bool, na_value=False)
+
+    return {
+        'rows': n,
+        'unique_rows': n - int(df.duplicated().sum()),
+        'nulls': int(nulls.to_numpy().sum()),
+        'invalid_rows': int(invalid.sum()),
+        'roi_mean': np.nanmean(roi) if n else np.nan,
+        'roi_median': roi_median,
+        # Media de max(ROI, mediana); np.fmax cuenta las campañas sin ROI como la mediana
+        'roi_floor_mean': np.nanmean(np.fmax(roi, roi_median)) if n else np.nan,
+        'conversion_mean': np.nanmean(conversion) if n else np.nan,
+        'success_share': df['campaña exitosa'].mean() if n else np.nan,
+        'channel_roi': (channels, *_group_means(channel_codes, roi, len(channels))),
+        'type_conversion': (types, *_group_means(type_codes, conversion, len(types))),
+        'duration_roi': (np.arange(n_bins), *_group_means(duration_codes, roi, n_bins)),
+        'month_roi': _group_means(month_codes, roi, 12),
+    }
+
+
+def kpis_from_aggregates(agg):
+    """KPIs de las tarjetas a partir de `kpi_aggregates` (o de los mismos agregados calculados en SQL)."""
+    n, roi_mean = agg['rows'], agg['roi_mean']
+    min_count = max(1, int(n * MIN_SHARE))
+
+    best_channel, best_channel_roi = _best(*agg['channel_roi'], min_count)
+    best_type, best_type_conv = _best(*agg['type_conversion'], min_count)
+
+    # Duración óptima: tramo de DURATION_STEP días con mayor ROI medio
+    bins, means, counts = agg['duration_roi']
+    best_duration, best_duration_roi = _best(bins * DURATION_STEP + DURATION_STEP // 2, means, counts, min_count)
+
+    # Meses pico: los dos meses de inicio con mayor ROI medio
+    month_roi, month_counts = agg['month_roi']
+    month_roi = np.where(month_counts > 0, month_roi, -np.inf)
+    peak_months = [MONTHS[i] for i in np.argsort(-month_roi, kind='stable')[:2] if np.isfinite(month_roi[i])]
+
+    return {
+        'rows': n,
+        'unique_rows': agg['unique_rows'],
+        'fields': len(OUTPUT_COLUMNS),
+        'derived_fields': len(OUTPUT_COLUMNS) - len(RAW_COLUMNS),
+        'nulls': agg['nulls'],
+        'valid_share': 1 - agg['invalid_rows'] / n if n else np.nan,
+        'roi_mean': roi_mean,
+        'success_share': agg['success_share'],
+        'best_channel': best_channel,
+        'best_channel_roi': best_channel_roi,
+        'best_channel_lift': best_channel_roi / roi_mean - 1,
+        'best_type_conversion': best_type,
+        'best_type_conversion_lift': best_type_conv / agg['conversion_mean'] - 1,
+        'best_duration': best_duration,
+        'best_duration_lift': best_duration_roi / roi_mean - 1,
+        'peak_months': peak_months,
+        # Potencial de mejora: ROI medio si las campañas por debajo de la mediana llegaran a ella
+        'potential_lift': agg['roi_floor_mean'] / roi_mean - 1 if n else np.nan,
+    }
+
+
+def campaign_kpis(df):
+    """KPIs del DataFrame tipado (el que carga la app)."""
+    return kpis_from_aggregates(kpi_aggregates(df))
+
+
+def raw_kpis(path, chunksize=100_000):
+    """Filas, columnas, duplicados y vacíos por campo del export bruto (antes de limpiar)."""
+    seen = SeenRows()
+    rows = duplicates = 0
+    missing = pd.Series(0, index=list(RAW_COLUMNS.values()))
+    for chunk in iter_raw_chunks(path, chunksize):
+        rows += len(chunk)
+        duplicates += int((~seen.filter_new(chunk)).sum())
+        missing += (chunk.isna() | chunk.apply(lambda col: col.str.strip().eq(''))).sum()
+    return {'rows': rows, 'columns': len(RAW_COLUMNS), 'duplicates': duplicates, 'missing': missing.to_dict()}
@@ -0,0 +1,195 @@
+"""Modelos de éxito y ROI de una campaña a partir de su planificación.
+
+Un clasificador predice `campaña exitosa` y un regresor `roi_num` con la
+inversión, el canal, el tipo, la audiencia, la duración y el mes de inicio
+(gradient boosting con histogramas). Las categorías se codifican aquí como
+indicadores sobre una matriz NumPy, sin codificadores de sklearn: predecir una
+fila no paga su validación por columnas.
+
+El entrenamiento no se hace nunca al pintar una página: se lanza desde la línea
+de comandos (`python -m marketing.model`) o en los procesos de segundo plano de
+la app (`marketing.jobs`), y deja en `MODEL_DIR`/<dataset> un artefacto joblib
+versionado por formato y por huella de los datos de entrenamiento, más un
+manifiesto JSON que apunta al vigente. La app sólo carga el artefacto ya ajustado: predecir una
+campaña cuesta unos milisegundos.
+"""
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.model_selection import KFold, StratifiedKFold, cross_validate
+
+from marketing.cache import CACHE_DIR, _atomic_write, dataset_id, load_cached
+from marketing.pipeline import MISSING
+
+CATEGORICAL_FEATURES = ['canal', 'tipo', 'audiencia target']
+NUMERIC_FEATURES = ['inversión_num', 'duracion_num', 'mes']
+FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+CLASS_TARGET = 'campaña exitosa'
+ROI_TARGET = 'roi_num'
+MODEL_DIR = CACHE_DIR / "models"
+MANIFEST = "manifest.json"
+# Cambiar al modificar las variables o los modelos para no cargar artefactos incompatibles
+MODEL_FORMAT = 1
+# Artefactos anteriores que se conservan junto al vigente
+KEEP_ARTIFACTS = 2
+CV_FOLDS = 5
+
+
+def training_frame(df):
+    """Filas con todas las variables y ambos objetivos, sin categorías "sin datos"."""
+    data = df[FEATURES + [CLASS_TARGET, ROI_TARGET]].dropna()
+    for col in CATEGORICAL_FEATURES:
+        data = data[data[col].astype(str) != MISSING]
+    return data
+
+
+def data_hash(data):
+    """Huella del contenido de entrenamiento (independiente de rutas y fechas de modificación)."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+
+def encode(data, categories):
+    """Matriz float64: FEATURES numéricas y un indicador por categoría (una categoría desconocida deja todos a 0)."""
+    width = len(NUMERIC_FEATURES) + sum(len(categories[col]) for col in CATEGORICAL_FEATURES)
+    X = np.zeros((len(data), width))
+    for i, col in enumerate(NUMERIC_FEATURES):
+        X[:, i] = data[col].to_numpy(dtype=np.float64)
+    offset, rows = len(NUMERIC_FEATURES), np.arange(len(data))
+    for col in CATEGORICAL_FEATURES:
+        codes = pd.Index(categories[col]).get_indexer(data[col].to_numpy(dtype=object))
+        known = codes >= 0
+        X[rows[known], offset + codes[known]] = 1.0
+        offset += len(categories[col])
+    return X
+
+
+def build_models(seed=0):
+    # Parada temprana: con poca señal se queda en pocas iteraciones (menos sobreajuste y predicción más rápida)
+    params = {'max_iter': 200, 'learning_rate': 0.05, 'max_depth': 3, 'early_stopping': True,
+              'n_iter_no_change': 10, 'random_state': seed}
+    return HistGradientBoostingClassifier(**params), HistGradientBoostingRegressor(**params)
+
+
+def train_models(df, folds=CV_FOLDS, seed=0):
+    """Ajusta ambos modelos y devuelve el artefacto (modelos, métricas de validación cruzada y metadatos)."""
+    data = training_frame(df)
+    categories = {col: sorted(data[col].astype(str).unique()) for col in CATEGORICAL_FEATURES}
+    X = encode(data, categories)
+    success, roi = data[CLASS_TARGET].to_numpy(dtype=bool), data[ROI_TARGET].to_numpy(dtype=np.float64)
+    classifier, regressor = build_models(seed)
+
+    class_cv = cross_validate(classifier, X, success, scoring=['roc_auc', 'accuracy'],
+                              cv=StratifiedKFold(folds, shuffle=True, random_state=seed))
+    roi_cv = cross_validate(regressor, X, roi, scoring=['neg_mean_absolute_error', 'r2'],
+                            cv=KFold(folds, shuffle=True, random_state=seed))
+    metrics = {
+        'auc': float(class_cv['test_roc_auc'].mean()),
+        'accuracy': float(class_cv['test_accuracy'].mean()),
+        'base_rate': float(success.mean()),
+        'roi_mae': float(-roi_cv['test_neg_mean_absolute_error'].mean()),
+        'roi_r2': float(roi_cv['test_r2'].mean()),
+    }
+    return {
+        'classifier': classifier.fit(X, success),
+        'regressor': regressor.fit(X, roi),
+        'metrics': metrics,
+        'rows': len(data),
+        'data_hash': data_hash(data),
+        'format': MODEL_FORMAT,
+        'sklearn': sklearn.__version__,
+        'trained_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'categories': categories,
+    }
+
+
+def _read_manifest(model_dir):
+    try:
+        return json.loads((Path(model_dir) / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def artifact_name(data_hash):
+    return f"campaign-model-v{MODEL_FORMAT}-{data_hash}.joblib"
+
+
+def save_artifact(artifact, model_dir=MODEL_DIR):
+    """Guarda el artefacto y lo marca como vigente en el manifiesto (ambas escrituras atómicas)."""
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    name = artifact_name(artifact['data_hash'])
+    _atomic_write(model_dir / name, lambda tmp: joblib.dump(artifact, tmp))
+
+    manifest = _read_manifest(model_dir) or {'history': []}
+    history = [entry for entry in manifest['history'] if entry != name] + [name]
+    for old in history[:-(KEEP_ARTIFACTS + 1)]:
+        (model_dir / old).unlink(missing_ok=True)
+    manifest = {'current': name, 'data_hash': artifact['data_hash'], 'format': artifact['format'],
+                'sklearn': artifact['sklearn'], 'trained_at': artifact['trained_at'],
+                'metrics': artifact['metrics'], 'history': history[-(KEEP_ARTIFACTS + 1):]}
+    _atomic_write(model_dir / MANIFEST, lambda tmp: Path(tmp).write_text(json.dumps(manifest, indent=2)))
+    return model_dir / name
+
+
+def current_artifact(model_dir=MODEL_DIR):
+    """Ruta del artefacto vigente, o None si no hay uno compatible con este formato y esta versión de sklearn."""
+    manifest = _read_manifest(model_dir)
+    if not manifest or manifest.get('format') != MODEL_FORMAT or manifest.get('sklearn') != sklearn.__version__:
+        return None
+    path = Path(model_dir) / manifest['current']
+    return path if path.exists() else None
+
+
+def load_artifact(path):
+    return joblib.load(path)
+
+
+def predict(artifact, campaigns):
+    """Probabilidad de éxito y ROI previsto de campañas planificadas (DataFrame con FEATURES)."""
+    X = encode(campaigns, artifact['categories'])
+    return pd.DataFrame({
+        'probabilidad_exito': artifact['classifier'].predict_proba(X)[:, 1],
+        'roi_previsto': artifact['regressor'].predict(X),
+    }, index=campaigns.index)
+
+
+def model_dir_for(source):
+    """Directorio de artefactos de un dataset: cada cuenta tiene sus propios modelos."""
+    return MODEL_DIR / dataset_id(source)
+
+
+def train_and_save(df, source, model_dir=None):
+    """Entrena con el frame `df` del dataset `source` y guarda el artefacto en su directorio.
+
+    Recibe las filas y no las lee de la caché: así el artefacto corresponde exactamente a
+    los datos con los que se calculó la huella que lo pide (`data_hash(training_frame(df))`).
+    """
+    return save_artifact(train_models(df), model_dir or model_dir_for(source))
+
+
+def main():
+    from marketing.data import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Entrena los modelos de éxito y ROI y guarda el artefacto versionado.")
+    parser.add_argument('path', nargs='?', default=DATA_PATH)
+    parser.add_argument('--model-dir', default=None, help="Por defecto, el directorio del dataset en MODEL_DIR")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    path = train_and_save(load_cached(args.path), args.path, args.model_dir)
+    metrics = _read_manifest(path.parent)['metrics']
+    print(f"{path} ({time.perf_counter() - start:.1f} s)")
+    print(f"Éxito: AUC {metrics['auc']:.3f}, accuracy {metrics['accuracy']:.3f} (tasa base {metrics['base_rate']:.3f})")
+    print(f"ROI:   MAE {metrics['roi_mae']:.3f}, R² {metrics['roi_r2']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Parser vectorizado para números con formato europeo ("1.234,56").
+
+Trabaja directamente sobre los bytes del texto (buffer Arrow cuando pandas lo usa,
+o un array NumPy de ancho fijo si no), sin crear las cadenas intermedias de
+`str.replace`.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow es opcional
+    pa = None
+
+# Columnas con formato europeo -> columna numérica derivada
+EURO_COLUMNS = {
+    'inversión': 'inversión_num',
+    'facturación': 'facturación_num',
+    'retorno inversión': 'roi_num',
+    'ratio conversión': 'ratio_conv_num',
+    'beneficio neto': 'beneficio_neto_num',
+}
+
+BLOCK_SIZE = 1 << 16
+
+
+def _arrow_buffers(values):
+    """Devuelve (bytes, offsets, nulos) de una columna de texto, o None si no es posible."""
+    if pa is None:
+        return None
+    try:
+        arr = pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if pa.types.is_string(arr.type):
+        offset_type = np.int32
+    elif pa.types.is_large_string(arr.type):
+        offset_type = np.int64
+    else:
+        return None
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=offset_type)[arr.offset:arr.offset + len(arr) + 1]
+    data = np.frombuffer(data_buf, dtype=np.uint8) if data_buf is not None else np.zeros(0, np.uint8)
+    nulls = arr.is_null().to_numpy(zero_copy_only=False) if arr.null_count else None
+    return data, offsets.astype(np.int64), nulls
+
+
+def _fixed_width_buffers(values):
+    """Alternativa sin pyarrow: array `S` de ancho fijo, el relleno NUL se ignora al parsear."""
+    values = np.asarray(values, dtype=object)
+    nulls = pd.isna(values)
+    values = np.where(nulls, '', values)
+    try:
+        raw = values.astype('S')
+    except UnicodeEncodeError:
+        # Caracteres no ASCII (p. ej. '€'): quedan como bytes > 127 y la fila se marca inválida
+        raw = np.char.encode(values.astype(str), 'utf-8')
+    width = raw.dtype.itemsize
+    offsets = np.arange(len(raw) + 1, dtype=np.int64) * width
+    return raw.view(np.uint8), offsets, nulls if nulls.any() else None
+
+
+# Clase de cada byte: dígito, coma decimal, separador ignorado, signo menos o inválido
+_DIGIT, _COMMA, _IGNORED, _MINUS, _INVALID = range(5)
+_BYTE_KIND = np.full(256, _INVALID, dtype=np.uint8)
+_BYTE_KIND[ord('0'):ord('9') + 1] = _DIGIT
+_BYTE_KIND[ord(',')] = _COMMA
+_BYTE_KIND[[0, ord(' '), ord('+'), ord('.')]] = _IGNORED
+_BYTE_KIND[ord('-')] = _MINUS
+_BYTE_VALUE = np.zeros(256)
+_BYTE_VALUE[ord('0'):ord('9') + 1] = np.arange(10)
+
+
+def _parse_flat(data, offsets):
+    """Interpreta las filas `data[offsets[i]:offsets[i + 1]]` como números europeos.
+
+    Recorre las columnas de caracteres (alineadas a la derecha) aplicando Horner
+    sobre todas las filas a la vez; los separadores de miles se saltan.
+    """
+    n = len(offsets) - 1
+    starts, ends = offsets[:-1], offsets[1:]
+    width = int((ends - starts).max(initial=0))
+
+    mantissa = np.zeros(n)
+    decimals = np.zeros(n, dtype=np.int64)
+    n_digits = np.zeros(n, dtype=np.int64)
+    n_commas = np.zeros(n, dtype=np.int64)
+    after_comma = np.zeros(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    invalid = np.zeros(n, dtype=bool)
+    started = np.zeros(n, dtype=bool)  # ya hubo algún byte que no es relleno ni espacio
+
+    for j in range(width):
+        idx = ends - (width - j)
+        char = data.take(idx, mode='clip')
+        char[idx < starts] = 0  # relleno a la izquierda de filas más cortas
+        kind = _BYTE_KIND[char]
+
+        digit = kind == _DIGIT
+        np.copyto(mantissa, mantissa * 10 + _BYTE_VALUE[char], where=digit)
+        n_digits += digit
+        decimals += digit & after_comma
+
+        comma = kind == _COMMA
+        after_comma |= comma
+        n_commas += comma
+        # El signo sólo vale como primer byte significativo ("12-3" o "1-" no son números)
+        minus = kind == _MINUS
+        invalid |= (kind == _INVALID) | (minus & started)
+        negative |= minus
+        started |= (char != 0) & (char != ord(' '))
+
+    # División correctamente redondeada: coincide con float("123.45") mientras la mantisa < 2**53
+    out = mantissa / 10.0 ** decimals
+    out[negative] *= -1
+    out[invalid | (n_digits == 0) | (n_commas > 1)] = np.nan
+    return out
+
+
+def parse_european(values, dtype=np.float64, block_size=BLOCK_SIZE):
+    """Convierte textos "1.234,56" a float en bloques de `block_size` filas.
+
+    Los valores nulos o no interpretables se devuelven como NaN.
+    """
+    buffers = _arrow_buffers(values)
+    if buffers is None:
+        buffers = _fixed_width_buffers(values)
+    data, offsets, nulls = buffers
+
+    n = len(offsets) - 1
+    out = np.empty(n, dtype=dtype)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block_offsets = offsets[start:stop + 1]
+        block = data[block_offsets[0]:block_offsets[-1]]
+        out[start:stop] = _parse_flat(block, block_offsets - block_offsets[0])
+    if nulls is not None:
+        out[nulls] = np.nan
+    return out
+
+
+def parse_european_columns(df, columns=EURO_COLUMNS, dtype=np.float64):
+    """Interpreta varias columnas en una sola pasada y devuelve {columna: array}."""
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return {}
+    n = len(df)
+    if pa is not None:
+        stacked = pa.chunked_array([pa.array(df[col], type=pa.large_string(), from_pandas=True)
+                                    for col in columns])
+    else:
+        stacked = np.concatenate([df[col].to_numpy(dtype=object) for col in columns])
+    parsed = parse_european(stacked, dtype=dtype)
+    return {col: parsed[i * n:(i + 1) * n] for i, col in enumerate(columns)}
@@ -0,0 +1,322 @@
+"""Pipeline de limpieza: marketingcampaigns.csv (bruto) -> limpio_marketingcampaigns.csv.
+
+El CSV bruto se procesa en bloques de `chunksize` filas, así que puede ser mucho
+mayor que la memoria disponible. Las estadísticas globales siguen siendo exactas:
+
+1. Primera pasada: cada bloque se repara, normaliza y filtra; los duplicados se
+   descartan frente a todas las filas ya vistas (huellas de 128 bits) y el bloque
+   se vuelca a disco. Se acumulan histogramas para las medianas.
+2. Segunda pasada: se recogen sólo los valores del cubo que contiene la mediana.
+3. Tercera pasada: imputación por mediana, variables derivadas y escritura.
+
+Uso: python -m marketing.pipeline marketingcampaigns.csv limpio_marketingcampaigns.csv
+"""
+import argparse
+import csv
+import itertools
+import re
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from marketing.dates import normalize_dates
+
+CHUNKSIZE = 100_000
+
+# Columnas del export bruto -> nombres del dataset limpio
+RAW_COLUMNS = {
+    'campaign_name': 'nombre campaña',
+    'start_date': 'fecha inicio',
+    'end_date': 'fecha fin',
+    'budget': 'inversión',
+    'roi': 'retorno inversión',
+    'type': 'tipo',
+    'target_audience': 'audiencia target',
+    'channel': 'canal',
+    'conversion_rate': 'ratio conversión',
+    'revenue': 'facturación',
+}
+
+NUMERIC_COLUMNS = ['inversión', 'retorno inversión', 'ratio conversión', 'facturación']
+CATEGORY_COLUMNS = ['tipo', 'audiencia target', 'canal']
+CATEGORY_FIXES = {'canal': {'referal': 'referral'}}
+MISSING = 'sin datos'
+
+# Umbrales de las categorías del dataset limpio publicado
+DURATION_BINS = [-np.inf, 272, 455, np.inf], ['corta', 'media', 'larga']
+INVESTMENT_BINS = [-np.inf, 35_400, 59_000, np.inf], ['bajo', 'medio', 'alto']
+PROFIT_BINS = [-np.inf, 355_500, 595_000, np.inf], ['bajo', 'medio', 'alto']
+
+OUTPUT_COLUMNS = [
+    'nombre campaña', 'fecha inicio', 'fecha fin', 'inversión', 'retorno inversión', 'tipo',
+    'audiencia target', 'canal', 'ratio conversión', 'facturación', 'duración días',
+    'categoría duración', 'beneficio neto', 'campaña exitosa', 'categoría inversión',
+    'categoría beneficio',
+]
+
+_NUMBER = re.compile(r'-?(\d+\.?\d*|\.\d+)%?')
+_INTEGER = re.compile(r'-?\d+')
+
+
+# --- Lectura y reparación de filas ---
+
+def _is_number(token):
+    return token == '' or _NUMBER.fullmatch(token) is not None
+
+
+def _split_numbers(tokens, k):
+    """Formas de agrupar `tokens` en `k` números: un token, o parte entera + decimales partidos por la coma."""
+    if k == 0:
+        return [[]] if not tokens else []
+    options = []
+    if tokens and _is_number(tokens[0]):
+        options += [[tokens[0]] + rest for rest in _split_numbers(tokens[1:], k - 1)]
+    if len(tokens) >= 2 and _INTEGER.fullmatch(tokens[0]) and tokens[1].isdigit():
+        merged = f"{tokens[0]}.{tokens[1]}"
+        options += [[merged] + rest for rest in _split_numbers(tokens[2:], k - 1)]
+    return options
+
+
+def repair_fields(tokens):
+    """Recompone una fila con campos de más (decimales con coma sin comillas, "0,74").
+
+    Devuelve los 10 campos o None si la fila es ambigua o no encaja.
+    """
+    head, rest = tokens[:3], tokens[3:]
+    candidates = []
+    # Estructura: inversión, roi | tipo, audiencia, canal | conversión, facturación
+    for i in range(len(rest) - 2):
+        text = rest[i:i + 3]
+        if any(_NUMBER.fullmatch(t) for t in text):
+            continue
+        for before, after in itertools.product(_split_numbers(rest[:i], 2), _split_numbers(rest[i + 3:], 2)):
+            candidates.append(head + before + text + after)
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def iter_raw_chunks(path, chunksize=CHUNKSIZE):
+    """Lee el CSV bruto en bloques de texto; las filas con campos de más se reparan o se descartan."""
+    # csv.reader (en C) en lugar de read_csv: el número de campos varía entre filas
+    with open(path, newline='', encoding='utf-8') as fh:
+        reader = csv.reader(fh)
+        next(reader, None)  # cabecera
+        while True:
+            rows = list(itertools.islice(reader, chunksize))
+            if not rows:
+                break
+            fields = [row if len(row) == len(RAW_COLUMNS) else repair_fields(row) for row in rows]
+            chunk = pd.DataFrame([row for row in fields if row is not None], columns=list(RAW_COLUMNS), dtype=str)
+            yield chunk.rename(columns=RAW_COLUMNS)
+
+
+# --- Normalización ---
+
+def parse_number(values):
+    """Interpreta importes y porcentajes en cualquiera de los formatos del export.
+
+    "1000.50", "1,000.50", "1000,5", "1.000,5€" -> 1000.5 y "50%", "0,5", "50,00%" -> 0.5.
+    """
+    text = values.astype(str).str.strip().str.replace(r'[€$\s]', '', regex=True)
+    percent = text.str.endswith('%')
+    text = text.str.rstrip('%')
+
+    last_comma = text.str.rfind(',')
+    last_dot = text.str.rfind('.')
+    n_commas = text.str.count(',')
+    # La coma es decimal si va detrás del último punto, o si es la única y no hay puntos
+    comma_decimal = (last_comma > last_dot) & ((last_dot >= 0) | (n_commas == 1))
+    text = text.where(~comma_decimal, text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    text = text.where(comma_decimal, text.str.replace(',', '', regex=False))
+    # Varios puntos sin coma decimal: separadores de miles ("1.000.000")
+    text = text.where(text.str.count(r'\.') <= 1, text.str.replace('.', '', regex=False))
+
+    number = pd.to_numeric(text, errors='coerce')
+    return number.where(~percent, number / 100)
+
+
+def normalize_chunk(chunk):
+    """Tipos, categorías y fechas normalizadas; descarta filas con valores negativos."""
+    out = pd.DataFrame(index=chunk.index)
+    out['nombre campaña'] = chunk['nombre campaña'].str.strip()
+    out['fecha inicio'] = normalize_dates(chunk['fecha inicio']).to_numpy()
+    out['fecha fin'] = normalize_dates(chunk['fecha fin']).to_numpy()
+    for col in NUMERIC_COLUMNS:
+        out[col] = parse_number(chunk[col])
+    for col in CATEGORY_COLUMNS:
+        values = chunk[col].str.strip().replace(CATEGORY_FIXES.get(col, {}))
+        out[col] = values.mask(values == '', MISSING)
+    negative = (out[NUMERIC_COLUMNS] < 0).any(axis=1)
+    return out.loc[~negative, list(RAW_COLUMNS.values())]
+
+
+# --- Estadísticas globales exactas con memoria acotada ---
+
+_KEY_DTYPE = np.dtype([('hi', '<u8'), ('lo', '<u8')])
+
+
+def _row_keys(df):
+    """Huella de 128 bits por fila (dos hashes independientes de pandas)."""
+    keys = np.empty(len(df), dtype=_KEY_DTYPE)
+    keys['hi'] = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    keys['lo'] = pd.util.hash_pandas_object(df, index=False, hash_key='limpieza-campana').to_numpy()
+    return keys
+
+
+class SeenRows:
+    """Huellas de las filas ya emitidas, guardadas como runs ordenados que se fusionan al crecer (LSM)."""
+
+    def __init__(self):
+        self._runs = []
+
+    def _contains(self, keys):
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+            found |= run[pos] == keys
+        return found
+
+    def _add(self, run):
+        self._runs.append(run)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newer]))
+
+    def filter_new(self, df):
+        """Máscara de las filas de `df` que no se han visto antes (ni en este bloque ni en anteriores)."""
+        keys = _row_keys(df)
+        _, first = np.unique(keys, return_index=True)
+        new = np.zeros(len(df), dtype=bool)
+        new[first] = True
+        new &= ~self._contains(keys)
+        if new.any():
+            self._add(np.sort(keys[new]))
+        return new
+
+
+def _sortable_bits(values):
+    """Enteros sin signo con el mismo orden que los float64 de origen."""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return bits ^ np.where(bits >> np.uint64(63), np.uint64(0xFFFFFFFFFFFFFFFF), np.uint64(1 << 63))
+
+
+class StreamingMedian:
+    """Mediana exacta en dos pasadas: histograma por los bits altos y después sólo los valores del cubo central."""
+
+    BITS = 20
+
+    def __init__(self):
+        self.counts = np.zeros(1 << self.BITS, dtype=np.int64)
+        self._shift = np.uint64(64 - self.BITS)
+        self._targets = None
+        self._candidates = []
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        keys = _sortable_bits(values[~np.isnan(values)]) >> self._shift
+        self.counts += np.bincount(keys.astype(np.int64), minlength=len(self.counts))
+
+    def _locate(self):
+        n = int(self.counts.sum())
+        cumulative = np.cumsum(self.counts)
+        ranks = np.array([(n - 1) // 2, n // 2])
+        buckets = np.searchsorted(cumulative, ranks, side='right')
+        below = np.where(buckets > 0, cumulative[np.maximum(buckets - 1, 0)], 0)
+        self._targets = buckets, ranks - below
+
+    def collect(self, values):
+        if self._targets is None:
+            self._locate()
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        keys = (_sortable_bits(values) >> self._shift).astype(np.int64)
+        self._candidates.append(values[np.isin(keys, self._targets[0])])
+
+    def result(self):
+        if not self.counts.any():
+            return np.nan
+        if self._targets is None:
+            self._locate()
+        values = np.concatenate(self._candidates) if self._candidates else np.zeros(0)
+        keys = (_sortable_bits(values) >> self._shift).astype(np.int64)
+        buckets, offsets = self._targets
+        picks = [np.sort(values[keys == b])[o] for b, o in zip(buckets, offsets)]
+        return (picks[0] + picks[1]) / 2
+
+
+# --- Enriquecimiento y salida ---
+
+def enrich(df):
+    """Variables derivadas del dataset limpio (sobre valores ya imputados)."""
+    duration = (df['fecha fin'] - df['fecha inicio']).dt.days.astype(float)
+    profit = df['facturación'] - df['inversión']
+    df['duración días'] = duration
+    df['categoría duración'] = pd.cut(duration, DURATION_BINS[0], labels=DURATION_BINS[1]).astype(object).fillna(MISSING)
+    df['beneficio neto'] = profit
+    df['campaña exitosa'] = np.where(profit > 0, 'Sí', 'No')
+    df['categoría inversión'] = pd.cut(df['inversión'], INVESTMENT_BINS[0], labels=INVESTMENT_BINS[1]).astype(object)
+    df['categoría beneficio'] = pd.cut(profit, PROFIT_BINS[0], labels=PROFIT_BINS[1]).astype(object)
+    return df
+
+
+_EUROPEAN = str.maketrans({',': '.', '.': ','})
+
+
+def format_european(values, decimals=2):
+    """1234.5 -> "1.234,50"."""
+    return [f"{v:,.{decimals}f}".translate(_EUROPEAN) for v in values]
+
+
+def format_output(df):
+    out = df.copy()
+    for col in ['fecha inicio', 'fecha fin']:
+        out[col] = df[col].dt.strftime('%Y-%m-%d').fillna('')
+    for col in NUMERIC_COLUMNS + ['beneficio neto']:
+        out[col] = format_european(df[col])
+    out['duración días'] = df['duración días'].map('{:.1f}'.format).where(df['duración días'].notna(), MISSING)
+    return out[OUTPUT_COLUMNS]
+
+
+def clean_campaigns(src, dst, chunksize=CHUNKSIZE):
+    """Limpia `src` y escribe el dataset enriquecido en `dst`. Devuelve las medianas imputadas."""
+    seen = SeenRows()
+    medians = {col: StreamingMedian() for col in NUMERIC_COLUMNS}
+
+    with tempfile.TemporaryDirectory(prefix='limpieza-') as tmp:
+        spills = []
+        for i, chunk in enumerate(iter_raw_chunks(src, chunksize)):
+            chunk = normalize_chunk(chunk)
+            chunk = chunk[seen.filter_new(chunk)]
+            for col, median in medians.items():
+                median.add(chunk[col].to_numpy())
+            spill = Path(tmp) / f"chunk-{i:06d}.pkl"
+            chunk.to_pickle(spill)
+            spills.append(spill)
+
+        for spill in spills:
+            chunk = pd.read_pickle(spill)
+            for col, median in medians.items():
+                median.collect(chunk[col].to_numpy())
+        fill = {col: median.result() for col, median in medians.items()}
+
+        with open(dst, 'w', newline='', encoding='utf-8') as out:
+            for i, spill in enumerate(spills):
+                chunk = enrich(pd.read_pickle(spill).fillna(fill))
+                format_output(chunk).to_csv(out, index=False, header=i == 0)
+    return fill
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Limpia y enriquece el export bruto de campañas.")
+    parser.add_argument('src', nargs='?', default='marketingcampaigns.csv')
+    parser.add_argument('dst', nargs='?', default='limpio_marketingcampaigns.csv')
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+    fill = clean_campaigns(args.src, args.dst, chunksize=args.chunksize)
+    for col, value in fill.items():
+        print(f"mediana {col}: {value}")
+
+
+if __name__ == '__main__':
+    main()
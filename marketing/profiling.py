@@ -0,0 +1,178 @@
+"""Instrumentación de la app: tramos de tiempo por ejecución del script y memoria.
+
+La medición es por ejecución: `start_run()` la activa en el hilo de la sesión
+(para todas las sesiones con `MARKETING_PROFILE=1`, o sólo para la del panel de
+administración que la pida). Sin ejecución medida, `span()` devuelve un contexto
+vacío compartido y las funciones con `@timed` se llaman directamente: el coste es
+leer un atributo del hilo. Una ejecución medida acumula los tramos de su hilo
+(carga, filtros, agregaciones, gráficos) y al terminar queda en memoria (las
+últimas `RECENT_RUNS`) y se escribe como una línea JSON en el log
+`marketing.profiling` y en `.cache/instrumentacion.jsonl`.
+
+No importa pandas ni la caché: la app lo usa también en "Introducción".
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+RECENT_RUNS = 50
+LOG_NAME = "instrumentacion.jsonl"
+LOG_BYTES = 5 << 20
+
+logger = logging.getLogger("marketing.profiling")
+
+_enabled = os.environ.get("MARKETING_PROFILE") == "1"
+_local = threading.local()
+_recent = deque(maxlen=RECENT_RUNS)
+_memory_sources = {}
+_lock = threading.Lock()
+_log_path = None
+
+
+def enabled():
+    """Si se miden por defecto las ejecuciones de todas las sesiones (`MARKETING_PROFILE=1`)."""
+    return _enabled
+
+
+def _attach_log():
+    global _log_path
+    with _lock:
+        if _log_path is not None:
+            return
+        # Mismo directorio que la caché de datos, sin importar marketing.cache (pandas)
+        path = Path(os.environ.get("MARKETING_CACHE_DIR", ".cache")) / LOG_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_BYTES, backupCount=2, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        _log_path = path
+
+
+def log_path():
+    return _log_path
+
+
+class _NoSpan:
+    """Contexto vacío para cuando la medición está desactivada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'attrs', 'trace', 'start', 'depth')
+
+    def __init__(self, name, attrs):
+        self.name, self.attrs = name, attrs
+
+    def __enter__(self):
+        self.trace = getattr(_local, 'trace', None)
+        if self.trace is not None:
+            self.depth = self.trace['_depth']
+            self.trace['_depth'] += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        trace = self.trace
+        if trace is not None:
+            trace['_depth'] -= 1
+            trace['spans'].append({'name': self.name, 'depth': self.depth,
+                                   'start_ms': (self.start - trace['_start']) * 1000,
+                                   'ms': (end - self.start) * 1000, **self.attrs})
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def span(name, **attrs):
+    """`with span("agregación.cubo"):` mide el bloque dentro de la ejecución actual."""
+    if getattr(_local, 'trace', None) is None:
+        return _NO_SPAN
+    return _Span(name, attrs)
+
+
+def timed(name):
+    """Decorador: mide cada llamada como un tramo `name` (también los aciertos de caché)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'trace', None) is None:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+        if hasattr(func, 'clear'):
+            wrapper.clear = func.clear  # cachés de Streamlit: se siguen pudiendo vaciar (o sólo una entrada)
+        return wrapper
+    return decorator
+
+
+def add_memory_source(name, func):
+    """Registra `func() -> {nombre: bytes}` para las instantáneas de memoria de cada ejecución."""
+    _memory_sources[name] = func
+
+
+def process_memory():
+    """Memoria residente del proceso en bytes (en Linux la actual; si no, el pico)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def start_run(section, on=None):
+    """Empieza a acumular los tramos de esta ejecución del script si `on` (por defecto, `enabled()`)."""
+    if on is None:
+        on = _enabled
+    if on:
+        _attach_log()
+    _local.trace = {'section': section, 'spans': [], '_depth': 0, '_start': time.perf_counter(),
+                    'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')} if on else None
+
+
+def finish_run():
+    """Cierra la ejecución: añade la memoria, la guarda entre las recientes y la escribe en el log."""
+    trace, _local.trace = getattr(_local, 'trace', None), None
+    if trace is None:
+        return None
+    total = (time.perf_counter() - trace.pop('_start')) * 1000
+    trace.pop('_depth')
+    memory = {'proceso': process_memory()}
+    for name, source in _memory_sources.items():
+        try:
+            memory[name] = source()
+        except Exception as e:  # una fuente rota no debe tumbar la página
+            memory[name] = repr(e)
+    run = {**trace, 'total_ms': total, 'memory': memory}
+    _recent.append(run)
+    logger.info(json.dumps(run, ensure_ascii=False, default=str))
+    return run
+
+
+def recent_runs():
+    return list(_recent)
+
+
+if _enabled:
+    _attach_log()
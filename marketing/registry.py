@@ -0,0 +1,173 @@
+"""Varios datasets (cuentas de clientes) servidos desde el mismo proceso.
+
+Cada dataset tiene su propio `CampaignStore` (frame tipado, cubo y caché Arrow en
+disco) y su propia versión, así que las cachés por versión de la app no se mezclan
+entre cuentas. Los almacenes cargados comparten un presupuesto de memoria: al
+superarlo se descartan los usados hace más tiempo. Su caché en disco se conserva,
+así que volver a abrirlos es un memory-map, no un parseo del CSV.
+
+El presupuesto no cuenta sólo el frame y el cubo: lo que la app deriva de cada
+dataset (índice de filtros, vistas filtradas, validación) se apunta con `attach`
+y las cachés compartidas entre datasets (figuras) se registran con `add_cache`.
+Al expulsar un dataset se libera también todo eso.
+"""
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from marketing.cache import CACHE_DIR, CampaignStore, _atomic_write
+
+DATASETS_DIR = Path(os.environ.get("MARKETING_DATASETS_DIR", "datasets"))
+MEMORY_BUDGET = int(os.environ.get("MARKETING_MEMORY_BUDGET_MB", 1024)) << 20
+
+
+def list_datasets(root=DATASETS_DIR, default=None):
+    """`{nombre: ruta}` de `default` (si existe) y de los CSV y carpetas de particiones CSV de `root`.
+
+    Un dataset de `root` con el mismo nombre que otro ya listado se muestra con el de su carpeta.
+    """
+    datasets = {}
+    if default is not None and Path(default).exists():
+        datasets[Path(default).stem] = Path(default)
+    root = Path(root)
+    if root.is_dir():
+        for path in sorted(root.iterdir()):
+            if path.suffix == '.csv' or (path.is_dir() and any(path.glob('*.csv'))):
+                name = path.stem if path.stem not in datasets else f"{path.stem} ({root.name}/{path.name})"
+                datasets[name] = path
+    return datasets
+
+
+def save_upload(name, data, root=DATASETS_DIR, reserved=()):
+    """Guarda un CSV subido en `root` (escritura atómica) y devuelve su ruta.
+
+    Nunca sobrescribe otro dataset: si el nombre ya existe en `root` (como CSV o carpeta de
+    particiones) o está en `reserved`, se añade la huella del contenido. Volver a subir el
+    mismo fichero devuelve la ruta que ya tenía.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    stem = re.sub(r'[^\w.-]+', '_', Path(name).stem).strip('_') or 'dataset'
+    path = root / f"{stem}.csv"
+    if stem not in reserved and _same_content(path, data):
+        return path
+    if stem in reserved or path.exists() or (root / stem).exists():
+        path = root / f"{stem}-{hashlib.sha1(data).hexdigest()[:8]}.csv"
+        if _same_content(path, data):
+            return path
+    _atomic_write(path, lambda tmp: Path(tmp).write_bytes(data))
+    return path
+
+
+def _same_content(path, data):
+    return path.is_file() and path.stat().st_size == len(data) and path.read_bytes() == data
+
+
+def store_bytes(store):
+    """Memoria del frame y del cubo de un almacén (las columnas de texto, por su contenido)."""
+    if store.frame is None:
+        return 0
+    total = int(store.frame.memory_usage(deep=True).sum())
+    if store._cube is not None:
+        total += int(store._cube.memory_usage(deep=True).sum())
+    return total
+
+
+def object_bytes(value):
+    """Memoria de un objeto derivado de un dataset: frames por su contenido, el resto por su `nbytes`."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return int(getattr(value, 'nbytes', 0))
+
+
+class StoreRegistry:
+    """Un `CampaignStore` por dataset con expulsión LRU bajo un presupuesto de memoria común."""
+
+    def __init__(self, budget=MEMORY_BUDGET, cache_dir=CACHE_DIR):
+        self.budget = budget
+        self.cache_dir = Path(cache_dir)
+        self._stores = OrderedDict()
+        self._sizes = {}
+        self._derived = {}  # clave del almacén -> {entrada: (versión, bytes, liberar)}
+        self._caches = []   # (bytes de un almacén, liberar los de un almacén) de cachés compartidas
+        self._lock = threading.Lock()
+
+    def get(self, source):
+        """Almacén de `source` (sin refrescar), marcado como el más reciente."""
+        key = str(Path(source).resolve())
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = self._stores[key] = CampaignStore(source, cache_dir=self.cache_dir)
+            self._stores.move_to_end(key)
+            return store
+
+    def attach(self, store, entry, value, discard):
+        """Cuenta `value`, derivado de la versión actual de `store`, en el presupuesto.
+
+        `discard()` lo libera (p. ej. vacía esa entrada de una caché de Streamlit) cuando se
+        expulsa el dataset o cambia su versión. Devuelve `value`.
+        """
+        key = str(store.source.resolve())
+        with self._lock:
+            if key in self._stores:
+                self._derived.setdefault(key, {})[entry] = (store.version, object_bytes(value), discard)
+        return value
+
+    def add_cache(self, size, discard):
+        """Registra una caché compartida entre datasets.
+
+        `size(store)` son los bytes que ocupa lo de `store` y `discard(store)` los libera.
+        """
+        with self._lock:
+            self._caches.append((size, discard))
+
+    def track(self, store):
+        """Tras refrescar `store`: actualiza su tamaño y expulsa otros datasets si se supera el presupuesto.
+
+        Devuelve los orígenes expulsados.
+        """
+        key = str(store.source.resolve())
+        evicted, discards = [], []
+        with self._lock:
+            size = self._sizes.get(key)
+            if size is None or size[0] != store.version:
+                self._sizes[key] = (store.version, store_bytes(store))
+                # Lo derivado de versiones anteriores ya no se va a pedir
+                derived = self._derived.get(key, {})
+                for entry, (version, _, discard) in list(derived.items()):
+                    if version != store.version:
+                        del derived[entry]
+                        discards.append(discard)
+            for other in list(self._stores):
+                if self.usage() <= self.budget:
+                    break
+                if other != key:
+                    old = self._stores.pop(other)
+                    evicted.append(old.source)
+                    self._sizes.pop(other, None)
+                    discards += [discard for _, _, discard in self._derived.pop(other, {}).values()]
+                    discards += [functools.partial(discard, old) for _, discard in self._caches]
+        # Fuera del cerrojo: vaciar una caché de Streamlit no debe esperar a quien la está llenando
+        for discard in discards:
+            discard()
+        return evicted
+
+    def _bytes(self, key):
+        total = self._sizes.get(key, (None, 0))[1]
+        total += sum(size for _, size, _ in self._derived.get(key, {}).values())
+        return total + sum(size(self._stores[key]) for size, _ in self._caches)
+
+    def usage(self):
+        return sum(self._bytes(key) for key in self._stores)
+
+    def loaded(self):
+        """`{origen: bytes}` de los datasets en memoria (con lo derivado de ellos), del menos al más reciente."""
+        with self._lock:
+            return {self._stores[key].source: self._bytes(key) for key in self._stores}
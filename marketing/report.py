@@ -0,0 +1,208 @@
+"""Informe estático de los gráficos del dashboard, sin Streamlit (p. ej. para instantáneas nocturnas).
+
+Genera un HTML autocontenido (plotly.js incluido una sola vez) por combinación
+de filtros y, si kaleido está instalado, una imagen por gráfico (png, svg o pdf).
+Los datos se cargan una vez por ejecución; los gráficos son independientes y se
+reparten entre procesos, que reciben el frame al arrancar (por fork, sin copiarlo,
+donde el sistema lo permite) y sólo la combinación de filtros y el gráfico en cada tarea.
+
+Uso: python -m marketing.report [origen] [--out informes] [--split canal tipo] [--images png] [--workers 4]
+"""
+import argparse
+import html
+import itertools
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from marketing import charts
+from marketing.cache import load_cached
+from marketing.cube import build_cube
+from marketing.data import DATA_PATH
+from marketing.filters import FilterIndex
+from marketing.kpis import campaign_kpis
+from marketing.overlap import campaign_activity
+from marketing.pipeline import MISSING
+from marketing.timeseries import TOTAL, channel_forecasts
+
+try:
+    import kaleido  # noqa: F401
+except ImportError:  # pragma: no cover - sin kaleido sólo se genera el HTML
+    kaleido = None
+
+IMAGE_FORMATS = ('png', 'svg', 'pdf')
+
+
+def _monthly_roi(df, cube):
+    forecasts = channel_forecasts(df, frequency='mensual')
+    if not forecasts:
+        return None
+    return charts.roi_forecast(forecasts, TOTAL if TOTAL in forecasts else next(iter(forecasts)), 'mensual')
+
+
+def _weekly_calendar(df, cube):
+    activity = campaign_activity(df, 'canal', 'W-SUN')
+    if activity.empty:
+        return None
+    return charts.active_calendar(activity, 'campañas', 'Campañas activas', 'semanal')
+
+
+# Nombre de fichero -> constructor (frame, cubo) -> figura (o None si no hay datos para ella)
+CHARTS = {
+    'canales': lambda df, cube: charts.channel_distribution(cube),
+    'roi_por_canal': lambda df, cube: charts.channel_roi(cube),
+    'facturacion_por_tipo': lambda df, cube: charts.type_revenue(cube),
+    'duracion_por_tipo': lambda df, cube: charts.duration_by_type(df[~df['tipo'].isin(charts.INVALID_TYPES)]),
+    'inversion_vs_roi': lambda df, cube: charts.investment_roi(df),
+    'histograma_roi': lambda df, cube: charts.roi_histogram(df),
+    'roi_mensual': _monthly_roi,
+    'duracion_vs_facturacion': lambda df, cube: charts.duration_revenue(df),
+    'calendario': _weekly_calendar,
+}
+
+_frame = _index = None
+
+
+def _init_worker(df):
+    global _frame, _index
+    _frame, _index = df, FilterIndex(df)
+
+
+@lru_cache(maxsize=4)
+def _selection(categories):
+    """Frame y cubo de una combinación de filtros (cada proceso los calcula una vez por combinación)."""
+    df = _frame[_index.mask(dict(categories), {})] if categories else _frame
+    return df, build_cube(df)
+
+
+def _render(task):
+    categories, name, out_dir, image_format = task
+    df, cube = _selection(categories)
+    fig = CHARTS[name](df, cube)
+    if fig is None:
+        return name, None
+    if image_format:
+        fig.write_image(Path(out_dir) / f"{name}.{image_format}")
+    return name, pio.to_html(fig, full_html=False, include_plotlyjs=False)
+
+
+def combinations(index, split):
+    """Sin filtros y, por cada combinación de valores de las columnas `split`, `((columna, (valor,)), ...)`."""
+    yield ()
+    if split:
+        for values in itertools.product(*([v for v in index.values(col) if v != MISSING] for col in split)):
+            yield tuple((col, (value,)) for col, value in zip(split, values))
+
+
+def slug(categories):
+    if not categories:
+        return "todas"
+    text = "_".join(f"{col}-{values[0]}" for col, values in categories)
+    return re.sub(r'[^\w.-]+', '-', text.lower()).strip('-')
+
+
+def _describe(categories):
+    return ", ".join(f"{col} = {values[0]}" for col, values in categories) or "todas las campañas"
+
+
+def _page(title, body, plotlyjs):
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<script type="text/javascript">{plotlyjs}</script>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1200px; color: #333; }}
+h1 {{ color: #1f77b4; border-bottom: 3px solid #ddd; padding-bottom: 0.3em; }}
+.kpis {{ display: flex; gap: 1em; margin: 1em 0; }}
+.kpi {{ background: #f8f9fa; border-left: 6px solid #1f77b4; padding: 0.8em 1.2em; border-radius: 8px; }}
+.charts {{ display: grid; grid-template-columns: 1fr 1fr; gap: 1em; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def _report_body(categories, df, figures, generated):
+    kpis = campaign_kpis(df)
+    cards = [("Campañas", f"{kpis['rows']:,}"), ("ROI promedio", f"{kpis['roi_mean']:.3f}"),
+             ("Exitosas", f"{kpis['success_share']:.0%}"), ("Mejor canal", str(kpis['best_channel']).capitalize())]
+    cards = "".join(f'<div class="kpi"><strong>{label}</strong><br>{html.escape(value)}</div>' for label, value in cards)
+    charts_html = "".join(f"<div>{figure}</div>" for figure in figures if figure)
+    return (f"<h1>Informe de campañas: {html.escape(_describe(categories))}</h1>"
+            f"<p>Generado el {generated}</p><div class=\"kpis\">{cards}</div>"
+            f"<div class=\"charts\">{charts_html}</div>")
+
+
+def build_reports(source=DATA_PATH, out=Path("informes"), split=(), image_format=None, workers=None):
+    """Escribe un HTML por combinación de filtros (y las imágenes) en `out`. Devuelve las rutas de los HTML."""
+    if image_format and kaleido is None:
+        raise RuntimeError("Las imágenes estáticas necesitan kaleido: pip install kaleido")
+    df = load_cached(source)
+    index = FilterIndex(df)
+    selections = [c for c in combinations(index, split) if not c or index.mask(dict(c), {}).any()]
+
+    out = Path(out)
+    tasks = []
+    for categories in selections:
+        target = out / slug(categories)
+        target.mkdir(parents=True, exist_ok=True)
+        tasks += [(categories, name, str(target), image_format) for name in CHARTS]
+
+    workers = workers or os.cpu_count()
+    if workers > 1:
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method),
+                                 initializer=_init_worker, initargs=(df,)) as pool:
+            rendered = list(pool.map(_render, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    else:
+        _init_worker(df)
+        rendered = [_render(task) for task in tasks]
+
+    plotlyjs, generated = get_plotlyjs(), time.strftime('%Y-%m-%d %H:%M')
+    figures = iter(rendered)
+    pages, links = [], []
+    for categories in selections:
+        page_figures = [figure for _, figure in itertools.islice(figures, len(CHARTS))]
+        selection = df[index.mask(dict(categories), {})] if categories else df
+        title = f"Informe de campañas: {_describe(categories)}"
+        path = out / slug(categories) / "index.html"
+        path.write_text(_page(title, _report_body(categories, selection, page_figures, generated), plotlyjs),
+                        encoding="utf-8")
+        pages.append(path)
+        links.append(f'<li><a href="{slug(categories)}/index.html">{html.escape(_describe(categories))}</a></li>')
+
+    (out / "index.html").write_text(
+        _page("Informes de campañas", f"<h1>Informes de campañas</h1><p>Generado el {generated}</p>"
+                                       f"<ul>{''.join(links)}</ul>", ""), encoding="utf-8")
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe estático (HTML e imágenes) de los gráficos del dashboard.")
+    parser.add_argument('source', nargs='?', default=DATA_PATH)
+    parser.add_argument('--out', default='informes')
+    parser.add_argument('--split', nargs='*', default=[], choices=['canal', 'tipo', 'audiencia target'],
+                        help="Columnas para generar un informe por cada combinación de sus valores")
+    parser.add_argument('--images', choices=IMAGE_FORMATS, default=None, help="Exportar también cada gráfico (requiere kaleido)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    pages = build_reports(args.source, Path(args.out), args.split, args.images, args.workers)
+    print(f"{len(pages)} informes, {len(pages) * len(CHARTS)} gráficos en {args.out}/ "
+          f"({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Gráficos de dispersión con un presupuesto de puntos.
+
+Por debajo del presupuesto se dibujan todas las filas como siempre. Por encima,
+en lugar de enviar cada campaña al navegador como JSON se usa:
+
+- "muestreo": muestra estratificada por color (cada canal conserva su peso) más
+  todos los atípicos, para que los extremos no desaparezcan;
+- "densidad": histograma 2D calculado en el servidor con los atípicos superpuestos.
+
+El título indica siempre el número real de campañas.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+POINT_BUDGET = int(os.environ.get("MARKETING_SCATTER_BUDGET", 5000))
+MODES = ("auto", "muestreo", "densidad")
+DENSITY_BINS = 60
+# En modo "auto", por encima de este múltiplo del presupuesto se pasa de muestreo a densidad
+DENSITY_FACTOR = 20
+# Fracción máxima del presupuesto reservada a atípicos
+OUTLIER_SHARE = 0.2
+
+
+def outlier_mask(df, columns):
+    """Filas fuera de [Q1 - 1.5·IQR, Q3 + 1.5·IQR] en alguna de `columns`."""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        values = df[col].to_numpy(dtype=float)
+        q1, q3 = np.nanpercentile(values, [25, 75])
+        iqr = q3 - q1
+        mask |= (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+    return mask
+
+
+def _most_extreme(df, columns, k):
+    """Los `k` atípicos más alejados de la mediana (en unidades de IQR)."""
+    score = np.zeros(len(df))
+    for col in columns:
+        values = df[col].to_numpy(dtype=float)
+        q1, median, q3 = np.nanpercentile(values, [25, 50, 75])
+        score = np.fmax(score, np.abs(values - median) / ((q3 - q1) or 1.0))
+    return df.iloc[np.argsort(-score, kind='stable')[:k]]
+
+
+def stratified_sample(df, x, y, color, budget=POINT_BUDGET, seed=0):
+    """Muestra de como mucho `budget` filas: atípicos primero y el resto proporcional por `color`.
+
+    Sólo se copian las columnas `x`, `y` y `color` de las filas elegidas.
+    """
+    df = df[[x, y, color]].dropna(subset=[x, y])
+    if len(df) <= budget:
+        return df
+
+    outliers = outlier_mask(df, [x, y])
+    kept = df[outliers]
+    if len(kept) > budget * OUTLIER_SHARE:
+        kept = _most_extreme(kept, [x, y], int(budget * OUTLIER_SHARE))
+
+    # Cuota por grupo sobre el total, descontando los atípicos que ya representan a ese grupo
+    codes, uniques = pd.factorize(df[color], use_na_sentinel=False)
+    n_groups = len(uniques)
+    share = np.bincount(codes, minlength=n_groups) * budget / len(df)
+    already = np.bincount(codes[df.index.get_indexer(kept.index)], minlength=n_groups)
+    quota = np.maximum(1, np.floor(share - already)).astype(np.int64)
+
+    # Barajar y quedarse con las primeras `quota` filas de cada grupo
+    rng = np.random.default_rng(seed)
+    candidates = np.flatnonzero(~outliers)
+    candidates = candidates[rng.permutation(len(candidates))]
+    candidate_codes = codes[candidates]
+    order = np.argsort(candidate_codes, kind='stable')
+    starts = np.searchsorted(candidate_codes[order], np.arange(n_groups))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - starts[candidate_codes[order]]
+    chosen = candidates[rank < quota[candidate_codes]]
+    return pd.concat([kept, df.iloc[np.sort(chosen)]]).sort_index()
+
+
+def _density_figure(df, x, y, color, title, budget):
+    data = df.dropna(subset=[x, y])
+    counts, xedges, yedges = np.histogram2d(data[x], data[y], bins=DENSITY_BINS)
+    fig = go.Figure(go.Heatmap(
+        x=(xedges[:-1] + xedges[1:]) / 2,
+        y=(yedges[:-1] + yedges[1:]) / 2,
+        z=np.where(counts.T > 0, counts.T, np.nan),
+        colorscale='Blues',
+        colorbar=dict(title='Campañas'),
+        hovertemplate=f'{x}: %{{x}}<br>{y}: %{{y}}<br>Campañas: %{{z}}<extra></extra>',
+    ))
+    outliers = data[outlier_mask(data, [x, y])]
+    if len(outliers) > budget * OUTLIER_SHARE:
+        outliers = _most_extreme(outliers, [x, y], int(budget * OUTLIER_SHARE))
+    for trace in px.scatter(outliers, x=x, y=y, color=color).data:
+        trace.update(marker=dict(size=6, line=dict(width=0.5, color='white')))
+        fig.add_trace(trace)
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title_text=color)
+    return fig
+
+
+def scatter_figure(df, x, y, color, title, budget=POINT_BUDGET, mode="auto", seed=0):
+    """`px.scatter` que respeta un presupuesto de puntos. `mode`: "auto", "muestreo" o "densidad"."""
+    total = len(df)
+    if total <= budget:
+        return px.scatter(df, x=x, y=y, color=color, title=title)
+
+    if mode == "auto":
+        mode = "densidad" if total > DENSITY_FACTOR * budget else "muestreo"
+    if mode == "densidad":
+        fig = _density_figure(df, x, y, color, title, budget)
+        subtitle = f"Densidad de {total:,} campañas · atípicos como puntos"
+    else:
+        sample = stratified_sample(df, x, y, color, budget=budget, seed=seed)
+        fig = px.scatter(sample, x=x, y=y, color=color, title=title)
+        subtitle = f"Mostrando {len(sample):,} de {total:,} campañas · muestra estratificada por {color} con todos los atípicos"
+    fig.update_layout(title=dict(text=f"{title}<br><sup>{subtitle}</sup>"))
+    return fig
@@ -0,0 +1,97 @@
+"""Esquema tipado del DataFrame de campañas que se comparte entre sesiones.
+
+- Campos de pocos valores distintos (canal, tipo, categorías...) como `category`.
+- `campaña exitosa` como booleano.
+- Ratios y duración en float32: son valores con dos decimales (o enteros) muy por
+  debajo de los 7 dígitos significativos de float32. Los importes en euros siguen
+  en float64, porque con céntimos superan esa precisión a partir de ~100.000 €.
+- Las columnas de texto originales con su copia `_num` se eliminan.
+"""
+import argparse
+
+import pandas as pd
+
+CATEGORY_COLUMNS = ['canal', 'tipo', 'audiencia target', 'categoría duración', 'categoría inversión', 'categoría beneficio']
+BOOLEAN_COLUMNS = {'campaña exitosa': {'Sí': True, 'No': False}}
+DATE_COLUMNS = ['fecha inicio', 'fecha fin']
+FLOAT32_COLUMNS = ['roi_num', 'ratio_conv_num', 'duracion_num', 'mes']
+# Texto original de las columnas que ya tienen su versión numérica
+RAW_COLUMNS = ['inversión', 'facturación', 'retorno inversión', 'ratio conversión', 'beneficio neto', 'duración días']
+
+
+def apply_schema(df):
+    """Convierte `df` (CSV limpio + columnas derivadas) al esquema compacto."""
+    df = df.drop(columns=[col for col in RAW_COLUMNS if col in df.columns])
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col, values in BOOLEAN_COLUMNS.items():
+        if col in df.columns:
+            df[col] = df[col].map(values).astype('boolean')
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    return df
+
+
+def union_categories(columns):
+    """Categorías de todas las columnas `category`, en orden de aparición y con un único dtype.
+
+    Un bloque con la columna entera vacía tiene categorías vacías de otro dtype (`object`, o
+    nulas al leerlo de Arrow) que `union_categoricals` no acepta junto a las de texto: se ignoran.
+    """
+    present = [col.cat.categories for col in columns if len(col.cat.categories)]
+    if not present:
+        return columns[0].cat.categories
+    categories = present[0]
+    for other in present[1:]:
+        other = other.astype(categories.dtype)
+        categories = categories.append(other[~other.isin(categories)])
+    return categories
+
+
+def concat_frames(frames):
+    """`pd.concat` que mantiene las columnas `category` aunque cada bloque tenga categorías distintas."""
+    if len(frames) == 1:
+        return frames[0]
+    frames = list(frames)
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            categories = union_categories([frame[col] for frame in frames])
+            frames = [frame.assign(**{col: frame[col].astype(pd.CategoricalDtype(categories))}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(before, after):
+    """Bytes por columna (incluido el contenido de los strings) antes y después del esquema."""
+    report = pd.DataFrame({
+        'antes': before.memory_usage(deep=True, index=False),
+        'después': after.memory_usage(deep=True, index=False),
+        'tipo': after.dtypes.astype(str),
+    }).reindex(before.columns)
+    # Las columnas eliminadas quedan con 0 bytes después
+    report = report.fillna({'después': 0, 'tipo': 'eliminada'}).astype({'después': 'int64'})
+    report.loc['total'] = [report['antes'].sum(), report['después'].sum(), '']
+    return report
+
+
+def main():
+    from marketing.data import DATA_PATH, read_campaigns
+
+    parser = argparse.ArgumentParser(description="Memoria del DataFrame de campañas con y sin el esquema compacto.")
+    parser.add_argument('path', nargs='?', default=DATA_PATH)
+    args = parser.parse_args()
+    before = read_campaigns(args.path, compact=False)
+    after = read_campaigns(args.path)
+    report = memory_report(before, after)
+    print(report.to_string())
+    total = report.loc['total']
+    print(f"\n{total['antes'] / 1e6:.2f} MB -> {total['después'] / 1e6:.2f} MB "
+          f"({total['antes'] / total['después']:.1f}x menos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Simulador de escenarios de presupuesto por Monte Carlo sobre las campañas históricas.
+
+Un escenario reparte un presupuesto entre canales (`mix`), con `campaigns`
+campañas por canal y, opcionalmente, una duración y un mes de inicio. Cada
+trayectoria simula las campañas del escenario sacando, para cada una, una
+campaña histórica de su canal (múltiplo de facturación, ROI y ratio de
+conversión juntos, así que se conserva su relación). Con duración o mes, las
+campañas históricas se ponderan por su parecido: núcleo gaussiano sobre la
+diferencia de duración y sobre la distancia circular entre meses.
+
+La facturación sale del múltiplo empírico facturación / inversión de la campaña
+histórica: una campaña con inversión I y múltiplo m factura I·m y deja I·(m − 1)
+de beneficio neto (en el dataset, beneficio neto = facturación − inversión). El
+`retorno inversión` del dataset no es beneficio / inversión (difiere en ~9 de
+mediana), así que sólo se usa para el ROI del escenario y su objetivo: la media
+de los ROI sacados ponderada por inversión.
+
+Sacar campañas no necesita búsquedas: cada canal se convierte en una tabla de
+`TABLE_SIZE` entradas en la que cada campaña histórica aparece en proporción a su
+peso (por restos mayores, error menor que 1/`TABLE_SIZE` en la probabilidad de
+cada una) y una campaña simulada es un entero aleatorio y una lectura de la
+tabla. 100.000 trayectorias con 4 canales × 10 campañas tardan ~0,2 s.
+"""
+import numpy as np
+import pandas as pd
+
+from marketing.pipeline import MISSING
+
+TRAJECTORIES = 100_000
+# Anchura de los núcleos: días de duración y meses de inicio
+DURATION_BANDWIDTH = 60.0
+MONTH_BANDWIDTH = 1.0
+# Por debajo de estas campañas "efectivas" el escenario se apoya en muy pocos casos parecidos
+MIN_EFFECTIVE = 20
+# Entradas de la tabla de muestreo de cada grupo (al menos 16 por campaña del grupo)
+TABLE_SIZE = 1 << 16
+QUANTILES = [0.05, 0.5, 0.95]
+OUTCOMES = {'facturación': 'Facturación', 'beneficio': 'Beneficio neto', 'roi': 'ROI', 'conversión': 'Ratio de conversión'}
+
+
+def campaign_pools(df, by='canal'):
+    """Por grupo: arrays de múltiplo de facturación, ROI, ratio de conversión, duración y mes de inicio.
+
+    Sólo las campañas con inversión positiva, facturación, ROI y conversión.
+    """
+    data = df[[by, 'inversión_num', 'facturación_num', 'roi_num', 'ratio_conv_num', 'duracion_num', 'mes']]
+    data = data.dropna(subset=['facturación_num', 'roi_num', 'ratio_conv_num'])
+    data = data[data[by].notna() & (data[by].astype(str) != MISSING) & (data['inversión_num'] > 0)]
+    data = data.assign(multiplo=data['facturación_num'] / data['inversión_num'])
+    return {str(group): {col: rows[col].to_numpy(dtype=np.float64)
+                         for col in ('multiplo', 'roi_num', 'ratio_conv_num', 'duracion_num', 'mes')}
+            for group, rows in data.groupby(by, observed=True)}
+
+
+def similarity_weights(pool, duration=None, month=None):
+    """Peso de cada campaña del grupo según su parecido con la duración y el mes del escenario."""
+    weights = np.ones(len(pool['roi_num']))
+    if duration is not None:
+        gap = (pool['duracion_num'] - duration) / DURATION_BANDWIDTH
+        weights *= np.nan_to_num(np.exp(-0.5 * gap * gap))
+    if month is not None:
+        distance = np.abs(pool['mes'] - month)
+        distance = np.minimum(distance, 12 - distance) / MONTH_BANDWIDTH
+        weights *= np.nan_to_num(np.exp(-0.5 * distance * distance))
+    return weights
+
+
+def effective_size(weights):
+    """Número efectivo de campañas de una muestra ponderada, (Σw)² / Σw²."""
+    total = weights.sum()
+    return float(total * total / (weights * weights).sum()) if total > 0 else 0.0
+
+
+def sampling_table(weights, size=TABLE_SIZE):
+    """Índices 0..n-1 repetidos en proporción a `weights` hasta llenar `size` entradas (restos mayores)."""
+    exact = weights / weights.sum() * size
+    counts = np.floor(exact).astype(np.int64)
+    missing = size - counts.sum()
+    if missing:
+        counts[np.argsort(counts - exact, kind='stable')[:missing]] += 1
+    return np.repeat(np.arange(len(weights)), counts)
+
+
+def historical_mix(pools, df=None, by='canal'):
+    """Reparto del presupuesto entre grupos como en los datos (por inversión si se pasa `df`, si no por campañas)."""
+    if df is None:
+        shares = pd.Series({group: len(pool['roi_num']) for group, pool in pools.items()}, dtype=float)
+    else:
+        shares = df.groupby(df[by].astype(str), observed=True)['inversión_num'].sum().reindex(list(pools)).fillna(0)
+    return (shares / shares.sum()).to_dict()
+
+
+def simulate(pools, mix, budget, campaigns=1, duration=None, month=None, trajectories=TRAJECTORIES, seed=0):
+    """Trayectorias del escenario: dict de arrays `facturación`, `beneficio`, `roi` y `conversión` (una por trayectoria).
+
+    También devuelve `efectivas` ({grupo: campañas efectivas}) con las ponderaciones del escenario.
+    """
+    groups = [group for group, share in mix.items() if share > 0 and group in pools]
+    if not groups or budget <= 0:
+        raise ValueError("El escenario necesita presupuesto y al menos un canal con campañas.")
+    shares = np.array([mix[group] for group in groups], dtype=np.float64)
+    shares /= shares.sum()
+
+    size = max(TABLE_SIZE, 16 * max(len(pools[group]['roi_num']) for group in groups))
+    tables, effective, offset = [], {}, 0
+    for group in groups:
+        weights = similarity_weights(pools[group], duration, month)
+        effective[group] = effective_size(weights)
+        if weights.sum() <= 0:  # ninguna campaña parecida: se usa el grupo entero
+            weights = np.ones_like(weights)
+        tables.append(offset + sampling_table(weights, size))
+        offset += len(weights)
+    # Tablas de todos los grupos seguidas: el grupo c ocupa [c·size, (c + 1)·size)
+    tables = np.concatenate(tables)
+    multiple = np.concatenate([pools[group]['multiplo'] for group in groups])
+    roi = np.concatenate([pools[group]['roi_num'] for group in groups])
+    conversion = np.concatenate([pools[group]['ratio_conv_num'] for group in groups])
+
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, size, (trajectories, len(groups), campaigns))
+    draws += (np.arange(len(groups)) * size)[:, None]
+    picked = tables[draws]
+
+    # Presupuesto de cada campaña: el de su grupo repartido a partes iguales
+    investment = budget * shares / campaigns
+    revenue = (multiple[picked].sum(axis=2) * investment).sum(axis=1)
+    rate = (conversion[picked].mean(axis=2) * shares).sum(axis=1)
+    return {'facturación': revenue, 'beneficio': revenue - budget, 'roi': roi[picked].mean(axis=2) @ shares,
+            'conversión': rate, 'efectivas': effective}
+
+
+def summarize(result):
+    """Media y cuantiles (p5, p50, p95) de cada resultado simulado."""
+    table = pd.DataFrame({name: result[name] for name in OUTCOMES})
+    summary = table.quantile(QUANTILES).T
+    summary.columns = [f'p{int(q * 100)}' for q in QUANTILES]
+    summary.insert(0, 'media', table.mean())
+    summary.index = [OUTCOMES[name] for name in summary.index]
+    return summary
+
+
+def histogram(values, bins=60):
+    """(centros, proporción de trayectorias) de `values`: la figura lleva `bins` barras, no 100.000 puntos."""
+    counts, edges = np.histogram(values, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts / counts.sum()
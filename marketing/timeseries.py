@@ -0,0 +1,176 @@
+"""Series temporales de ROI por canal: descomposición estacional y previsión.
+
+La serie se construye por periodo real de `fecha inicio` (mes o semana de cada
+año, sin mezclar años). Se usa el tramo más largo de periodos con suficientes
+campañas y los huecos cortos dentro de él se interpolan.
+
+Con al menos dos ciclos completos se usa STL (tendencia + estacionalidad +
+residuo) y la previsión es STL + ARIMA(1,0,0) sobre la serie desestacionalizada.
+Con menos, no hay forma de separar estacionalidad de ruido: sólo se ajusta el
+ARIMA y no se devuelve descomposición.
+
+Los ajustes se cachean por la huella de la serie y sus parámetros; al cambiar
+los datos sólo se reajustan los canales cuya serie ha cambiado, en paralelo.
+"""
+import hashlib
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.forecasting.stl import STLForecast
+from statsmodels.tsa.seasonal import STL
+
+from marketing.pipeline import MISSING
+
+# Nombre -> (frecuencia de pandas, periodos por ciclo anual)
+FREQUENCIES = {'mensual': ('MS', 12), 'semanal': ('W-MON', 52)}
+TOTAL = 'total'
+# Un periodo de los extremos necesita al menos tantas campañas para entrar en la serie
+MIN_COUNT = 5
+# Huecos más largos que esto (en periodos) cortan la serie
+MAX_GAP = 2
+HORIZON = 6
+ALPHA = 0.05
+ARIMA_ORDER = (1, 0, 0)
+MAX_FITS = 256
+# Con menos series pendientes, arrancar procesos cuesta más que ajustarlas (~40 ms cada una)
+PARALLEL_MIN_JOBS = 8
+
+_fits = OrderedDict()
+_fits_lock = threading.Lock()
+
+
+def build_series(df, by='canal', measure='roi_num', freq='MS'):
+    """(medias, conteos) de `measure` por periodo de `fecha inicio`, una columna por grupo más `total`."""
+    data = df[['fecha inicio', by, measure]].dropna()
+    data = data[data[by].astype(str) != MISSING]
+    if data.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    grouper = pd.Grouper(key='fecha inicio', freq=freq)
+    stats = data.groupby([grouper, by], observed=True)[measure].agg(['mean', 'count']).unstack(by)
+    overall = data.groupby(grouper)[measure].agg(['mean', 'count'])
+    # Todos los periodos del rango, también los que no tienen campañas
+    periods = pd.date_range(overall.index.min(), overall.index.max(), freq=freq)
+    means = stats['mean'].assign(**{TOTAL: overall['mean']}).reindex(periods)
+    counts = stats['count'].assign(**{TOTAL: overall['count']}).reindex(periods).fillna(0)
+    means.columns = means.columns.astype(str)
+    counts.columns = counts.columns.astype(str)
+    return means, counts
+
+
+def trim_sparse(mean, count, min_count=MIN_COUNT, max_gap=MAX_GAP):
+    """Tramo más largo de periodos con al menos `min_count` campañas, con los huecos interpolados.
+
+    Los huecos de más de `max_gap` periodos cortan la serie: las campañas sueltas lejos
+    del grueso de los datos no se unen a él interpolando meses que no existen.
+    """
+    dense = np.flatnonzero(count.to_numpy() >= min_count)
+    if not len(dense):
+        return mean.iloc[:0]
+    runs = np.split(dense, np.flatnonzero(np.diff(dense) > max_gap + 1) + 1)
+    run = max(reversed(runs), key=len)  # a igualdad de longitud, el más reciente
+    start, stop = run[0], run[-1] + 1
+    series = mean.iloc[start:stop].copy()
+    series[count.iloc[start:stop] < min_count] = np.nan
+    return series.interpolate(limit_direction='both').astype(float)
+
+
+def fingerprint(series, **params):
+    """Huella del contenido de la serie (fechas y valores) y de los parámetros del ajuste."""
+    digest = hashlib.sha1()
+    digest.update(series.index.asi8.tobytes())
+    digest.update(series.to_numpy(dtype=np.float64).tobytes())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()
+
+
+def seasonal_strength(seasonal, resid):
+    """Fuerza de la estacionalidad (0 = nada, 1 = toda la variación no tendencial)."""
+    return max(0.0, 1 - np.var(resid) / np.var(seasonal + resid))
+
+
+def fit_series(series, period=12, horizon=HORIZON, alpha=ALPHA):
+    """Descomposición (o None) y previsión con intervalo de predicción de una serie regular."""
+    freq = series.index.freq or pd.infer_freq(series.index)
+    series = series.asfreq(freq)
+    with warnings.catch_warnings():
+        # Series cortas: statsmodels avisa de estimaciones poco fiables, lo refleja el intervalo
+        warnings.simplefilter('ignore')
+        if len(series) >= 2 * period:
+            decomposition = STL(series, period=period, robust=True).fit()
+            components = pd.DataFrame({'observado': series, 'tendencia': decomposition.trend,
+                                       'estacional': decomposition.seasonal, 'residuo': decomposition.resid})
+            strength = seasonal_strength(decomposition.seasonal, decomposition.resid)
+            model = STLForecast(series, ARIMA, model_kwargs={'order': ARIMA_ORDER, 'trend': 'c'},
+                                period=period, robust=True).fit()
+            prediction = model.get_prediction(start=len(series), end=len(series) + horizon - 1)
+            method = 'STL + ARIMA'
+        else:
+            components, strength = None, np.nan
+            model = ARIMA(series, order=ARIMA_ORDER, trend='c').fit()
+            prediction = model.get_forecast(horizon)
+            method = 'ARIMA (sin estacionalidad: menos de dos ciclos)'
+    frame = prediction.summary_frame(alpha=alpha)
+    forecast = pd.DataFrame({'previsión': frame['mean'], 'inferior': frame['mean_ci_lower'],
+                             'superior': frame['mean_ci_upper']})
+    return {'decomposition': components, 'forecast': forecast, 'seasonal_strength': strength, 'method': method}
+
+
+def _fit_job(args):
+    series, period, horizon, alpha = args
+    if len(series) < 3:
+        return None
+    return fit_series(series, period, horizon, alpha)
+
+
+def fit_all(series_by_group, period=12, horizon=HORIZON, alpha=ALPHA, workers=None):
+    """Ajusta cada serie de `{grupo: serie}`; sólo se ajustan (en paralelo) las que no están en caché.
+
+    `workers`: procesos (None = todos los núcleos si hay al menos PARALLEL_MIN_JOBS series pendientes).
+    """
+    keys = {group: fingerprint(series, period=period, horizon=horizon, alpha=alpha)
+            for group, series in series_by_group.items()}
+    results, pending = {}, []
+    with _fits_lock:
+        for group, key in keys.items():
+            if key in _fits:
+                _fits.move_to_end(key)
+                results[group] = _fits[key]
+            else:
+                pending.append(group)
+
+    jobs = [(series_by_group[group], period, horizon, alpha) for group in pending]
+    if workers is None:
+        workers = os.cpu_count() if len(jobs) >= PARALLEL_MIN_JOBS else 1
+    workers = min(workers, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fitted = list(pool.map(_fit_job, jobs))
+    else:
+        fitted = [_fit_job(job) for job in jobs]
+
+    with _fits_lock:
+        for group, result in zip(pending, fitted):
+            results[group] = _fits[keys[group]] = result
+        while len(_fits) > MAX_FITS:
+            _fits.popitem(last=False)
+    return {group: results[group] for group in series_by_group}
+
+
+def channel_forecasts(df, by='canal', measure='roi_num', frequency='mensual', horizon=HORIZON, alpha=ALPHA,
+                      min_count=None, workers=None):
+    """Series recortadas y ajustes por grupo (más `total`): `{grupo: (serie, ajuste)}`."""
+    freq, period = FREQUENCIES[frequency]
+    means, counts = build_series(df, by, measure, freq)
+    if min_count is None:
+        # Semanas: el mismo umbral mensual repartido entre ~4 semanas
+        min_count = MIN_COUNT if freq == 'MS' else max(1, MIN_COUNT // 4)
+    series = {group: trim_sparse(means[group], counts[group], min_count) for group in means.columns}
+    series = {group: s for group, s in series.items() if len(s)}
+    fits = fit_all(series, period=period, horizon=horizon, alpha=alpha, workers=workers)
+    return {group: (series[group], fits[group]) for group in series}
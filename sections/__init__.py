@@ -0,0 +1,11 @@
+"""Secciones del dashboard. Cada módulo expone `render()` y se importa sólo al seleccionarlo."""
+
+SECTIONS = {
+    "Introducción": "sections.intro",
+    "Preprocesamiento": "sections.preprocessing",
+    "Análisis Exploratorio (EDA)": "sections.eda",
+    "Insights y Recomendaciones": "sections.insights",
+    "Optimización de Presupuesto": "sections.budget",
+    "Simulador de Escenarios": "sections.simulator",
+    "Predicción de Campañas": "sections.scoring",
+}
@@ -0,0 +1,84 @@
+"""Sección "Optimización de Presupuesto": reparto de un presupuesto entre canal × tipo según curvas de respuesta."""
+import plotly.express as px
+import streamlit as st
+
+from marketing.budget import MAX_SHARE, MIN_CAMPAIGNS, MIN_SHARE, allocation_table, typical_budget
+from sections.state import figure_cache_note, load_view, plot_chart, response_curves
+
+
+def render():
+    view = load_view()
+    st.markdown("""
+    <style>
+    .data-card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+        margin: 1em 0;
+        border: 1px solid #e0e0e0;
+    }
+    </style>
+    <div class="data-card">
+        <h3>💰 Optimización de Presupuesto</h3>
+        <p>Para cada combinación de canal y tipo se ajusta una curva de rendimientos decrecientes
+        (facturación = a · inversión<sup>β</sup>) y se reparte el presupuesto para maximizar la facturación
+        prevista, respetando un mínimo y un máximo por segmento.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    curves = response_curves(view.store.version, view.filters, view.df)
+    if curves.empty:
+        st.warning(f"Ningún segmento canal × tipo tiene al menos {MIN_CAMPAIGNS} campañas con la selección actual.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        total = st.number_input("Presupuesto total (€)", min_value=10_000.0, value=typical_budget(curves), step=100_000.0)
+    with col2:
+        min_share = st.slider("Mínimo por segmento (%)", 0.0, 10.0, MIN_SHARE * 100, 0.5) / 100
+    with col3:
+        max_share = st.slider("Máximo por segmento (%)", 5.0, 100.0, MAX_SHARE * 100, 1.0) / 100
+
+    segments = len(curves)
+    if min_share * segments > 1 or max_share * segments < 1:
+        st.warning(f"Con {segments} segmentos los límites deben permitir repartir el 100%: "
+                   f"mínimo ≤ {100 / segments:.1f}% ≤ máximo.")
+        return
+
+    table = allocation_table(curves, total, min_share, max_share)
+    table['segmento'] = table['canal'].str.capitalize() + ' · ' + table['tipo']
+    optimal, historical = table['facturación_óptima'].sum(), table['facturación_histórica'].sum()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Facturación prevista (reparto óptimo)", f"{optimal / 1e6:,.2f}M €",
+                f"{optimal / historical - 1:+.1%} vs reparto actual")
+    col2.metric("Facturación prevista (reparto actual)", f"{historical / 1e6:,.2f}M €")
+    top = table.loc[table['inversión_óptima'].idxmax()]
+    col3.metric("Segmento con más presupuesto", top['segmento'], f"{top['inversión_óptima'] / total:.0%} del total")
+
+    def allocation_figure():
+        chart = table.sort_values('inversión_óptima').melt(
+            id_vars='segmento', value_vars=['inversión_histórica', 'inversión_óptima'],
+            var_name='reparto', value_name='inversión')
+        chart['reparto'] = chart['reparto'].map({'inversión_histórica': 'Actual', 'inversión_óptima': 'Óptimo'})
+        return px.bar(chart, x='inversión', y='segmento', color='reparto', barmode='group', orientation='h',
+                      title='Inversión por segmento: reparto actual vs óptimo',
+                      labels={'inversión': 'Inversión (€)', 'segmento': '', 'reparto': 'Reparto'},
+                      height=max(400, 28 * segments))
+    plot_chart(view, 'reparto', allocation_figure, total, min_share, max_share)
+    figure_cache_note()
+
+    with st.expander("📋 Detalle por segmento"):
+        st.dataframe(
+            table[['segmento', 'inversión_histórica', 'inversión_óptima', 'facturación_histórica',
+                   'facturación_óptima', 'r2']].sort_values('inversión_óptima', ascending=False)
+            .style.format({'inversión_histórica': '{:,.0f}', 'inversión_óptima': '{:,.0f}',
+                           'facturación_histórica': '{:,.0f}', 'facturación_óptima': '{:,.0f}', 'r2': '{:.3f}'}),
+            use_container_width=True, hide_index=True)
+
+    r2 = curves['r2'].mean()
+    if r2 < 0.1:
+        st.info(f"La inversión explica poco de la facturación en estos datos (R² medio {r2:.3f}): "
+                "el reparto propuesto se apoya sobre todo en el nivel de facturación de cada segmento, "
+                "no en una respuesta a la inversión bien medida.")
@@ -0,0 +1,355 @@
+"""Sección "Análisis Exploratorio (EDA)": gráficas sobre el cubo de agregados y la selección actual."""
+import plotly.express as px
+import streamlit as st
+
+from marketing import charts, overlap
+from marketing.cube import mean_by
+from marketing.scatter import MODES, POINT_BUDGET
+from marketing.stats import ALPHA
+from marketing.timeseries import FREQUENCIES, TOTAL
+from sections.state import (COMPARED_MEASURES, GROUPINGS, INVALID_TYPES, background_note, campaign_calendar,
+                            channel_forecasts, channel_overlaps, figure_cache_note, group_comparison, load_view,
+                            plot_chart)
+
+GROUPINGS_PLURAL = {'canal': 'canales', 'tipo': 'tipos de campaña', 'audiencia target': 'audiencias'}
+# Campañas que se ofrecen (y solapadas que se listan) en la búsqueda del calendario
+CAMPAIGN_OPTIONS = 200
+
+
+def significance_text(tests, measure, groups):
+    """Conclusión en texto de los contrastes ómnibus (los dos deben coincidir para afirmarla)."""
+    if tests is None:
+        return f"Contraste de {measure} entre {groups}: calculándose en segundo plano"
+    p_values = f"ANOVA p = {tests['anova_p']:.3f}, Kruskal-Wallis p = {tests['kruskal_p']:.3f}"
+    if tests['anova_p'] < ALPHA and tests['kruskal_p'] < ALPHA:
+        return f"Las diferencias de {measure} entre {groups} son significativas ({p_values})"
+    if tests['anova_p'] >= ALPHA and tests['kruskal_p'] >= ALPHA:
+        return f"Las diferencias de {measure} entre {groups} no son significativas ({p_values})"
+    return f"Las diferencias de {measure} entre {groups} dependen del contraste ({p_values})"
+
+
+def render():
+    view = load_view()
+    df = view.df
+
+    cube = view.cube
+
+    with st.sidebar.expander("⚙️ Gráficos de dispersión"):
+        point_budget = st.number_input("Máximo de puntos", min_value=500, value=POINT_BUDGET, step=500)
+        scatter_mode = st.radio("Por encima del máximo", MODES, horizontal=True)
+
+    st.markdown("""
+    <style>
+    .data-card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+        margin: 1em 0;
+        border: 1px solid #e0e0e0;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Create tabs for different analyses
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Canales de Marketing", "Tipos de campaña", "Rendimiento y ROI",
+                                                  "Patrones Temporales", "Significancia", "Calendario y Solapamientos"])
+
+    with tab1:
+        st.markdown("""
+        <div class="data-card">
+            <h3>1. Análisis por Canal de Marketing</h3>
+            <p>Exploración detallada del rendimiento y distribución de canales de marketing.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Distribución de campañas por canal
+            plot_chart(view, 'canales', lambda: charts.channel_distribution(cube))
+            
+            st.markdown("""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+            <strong>Insights de Distribución:</strong>
+            <ul>
+                <li>El canal Promotion es ligeramente más utilizado.</li>
+                <li>Las empresas utilizan de forma equilibrada los diferentes canales de marketing, sin depender excesivamente de uno solo.</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            # ROI promedio por canal
+            channel_roi = mean_by(cube, 'canal', 'roi_num')
+            plot_chart(view, 'roi_por_canal', lambda: charts.channel_roi(cube))
+
+            ranked = channel_roi[channel_roi['canal'] != 'sin datos'].sort_values('roi_num', ascending=False)
+            channel_test, _ = group_comparison(view, 'canal', 'roi_num')
+            st.markdown(f"""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+            <strong>Insights de ROI:</strong>
+            <ul>
+                <li>{str(ranked['canal'].iloc[0]).capitalize()} lidera en ROI ({ranked['roi_num'].iloc[0]:.3f})</li>
+                <li>{str(ranked['canal'].iloc[-1]).capitalize()} muestra el ROI más bajo ({ranked['roi_num'].iloc[-1]:.3f})</li>
+                <li>{significance_text(channel_test['omnibus'] if channel_test else None, 'ROI', 'canales')}</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab2:
+            # Análisis de Campaña
+            st.markdown("""
+            <div class="data-card">
+                <h3>2. Análisis de Campaña</h3>
+                <p>Evaluación de ingresos y duración por tipo de campaña.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Ingresos promedio por tipo de campaña
+                plot_chart(view, 'facturacion_por_tipo', lambda: charts.type_revenue(cube))
+
+                st.markdown("""
+                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+                <strong>Insights de Ingresos:</strong>
+                <ul>
+                <li>Las campañas de social media, podcast y email generan los ingresos promedio más altos, superando los 500k.</li>
+                <li>Las campañas de webinar generar ingresos ligeramente inferiores a las otras tres principales.</li>
+                <li>Las campañas de eventos tienen una facturación promedio significativamente menor.</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col2:
+                # Distribución de duración por tipo de campaña
+                # Misma selección sin los tipos erróneos: un AND más de bitmaps, cacheado por filtros
+                def duration_by_type():
+                    selected = dict(view.categories).get('tipo', view.index.values('tipo'))
+                    return charts.duration_by_type(view.subset({'tipo': [t for t in selected if t not in INVALID_TYPES]}))
+                plot_chart(view, 'duracion_por_tipo', duration_by_type)
+
+                st.markdown("""
+                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+                <strong>Insights de Duración:</strong>
+                <ul>
+                <li>Todas las campañas tienen una distribución de duración similar.</li>
+                <li>No se observa una diferencia clara de duración entre los tipos de campaña.</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+    with tab3:
+        st.markdown("""
+        <div class="data-card">
+            <h3>3. Análisis de Rendimiento y ROI</h3>
+            <p>Evaluación de la relación entre inversión, ROI y rendimiento general.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Scatter plot de Inversión vs ROI
+            plot_chart(view, 'inversion_vs_roi', lambda: charts.investment_roi(df, point_budget, scatter_mode),
+                       point_budget, scatter_mode)
+            
+            st.markdown("""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+            <strong>Insights Inversión vs ROI:</strong>
+            <ul>
+            <li>No existe una correlación fuerte entre el nivel de inversión y el ROI obtenido</li>
+            <li>Las campañas de menor inversión muestran mayor variabilidad en el ROI</li>
+            <li>Se identifica un punto óptimo de inversión entre 0.3-0.5M</li>
+            <li>Los diferentes canales muestran patrones similares de ROI</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            # Histograma de ROI
+            plot_chart(view, 'histograma_roi', lambda: charts.roi_histogram(df))
+
+            st.markdown("""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+            <strong>Insights Distribución ROI:</strong>
+            <ul>
+            <li>La distribución del ROI muestra una forma aproximadamente normal</li>
+            <li>La mayoría de campañas tienen un ROI entre 0.4 y 0.7</li>
+            <li>Hay pocas campañas con ROI extremadamente alto (>0.8) o bajo (<0.2)</li>
+            <li>El ROI promedio se sitúa alrededor de 0.54</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab4:
+        st.markdown("""
+        <div class="data-card">
+            <h3>4. Análisis de Patrones Temporales</h3>
+            <p>Identificación de estacionalidad y tendencias temporales.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Serie real por periodo (sin mezclar años) y previsión por canal
+            frequency = st.radio("Periodicidad", list(FREQUENCIES), horizontal=True)
+            forecasts, current = channel_forecasts(view, frequency)
+            ready = background_note(forecasts, current, "las previsiones")
+            if ready and not forecasts:
+                st.info("No hay periodos con campañas suficientes para construir la serie.")
+            elif ready:
+                groups = list(forecasts)
+                group = st.selectbox("Previsión para", groups, index=groups.index(TOTAL) if TOTAL in groups else 0)
+                series, fit = forecasts[group]
+                # Con `current`: el resultado mostrado cambia cuando se publica el de los datos actuales
+                plot_chart(view, 'roi_mensual', lambda: charts.roi_forecast(forecasts, group, frequency),
+                           frequency, group, current)
+
+                if fit is None:
+                    findings = ["La serie es demasiado corta para ajustar un modelo."]
+                else:
+                    next_period = fit['forecast'].iloc[0]
+                    findings = [
+                        f"{len(series)} periodos de datos ({series.index[0]:%m/%Y} – {series.index[-1]:%m/%Y}); modelo: {fit['method']}",
+                        f"Próximo periodo: ROI {next_period['previsión']:.3f} "
+                        f"(95%: {next_period['inferior']:.3f} – {next_period['superior']:.3f})",
+                    ]
+                    if fit['decomposition'] is None:
+                        findings.append("Con menos de dos ciclos anuales no se puede distinguir estacionalidad de ruido: "
+                                        "no se afirma ningún patrón estacional")
+                    else:
+                        seasonal = fit['decomposition']['estacional']
+                        position = seasonal.index.month if frequency == 'mensual' else seasonal.index.isocalendar().week
+                        profile = seasonal.groupby(position).mean()
+                        findings.append(f"Fuerza de la estacionalidad: {fit['seasonal_strength']:.2f} (0 = ninguna, 1 = total)")
+                        unit = 'mes' if frequency == 'mensual' else 'semana'
+                        findings.append(f"Máximo estacional en {unit} {profile.idxmax()} y mínimo en {unit} {profile.idxmin()}")
+                items = "".join(f"<li>{finding}</li>" for finding in findings)
+                st.markdown(f"""
+                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+                <strong>Insights de Estacionalidad:</strong>
+                <ul>{items}</ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+                if fit is not None and fit['decomposition'] is not None:
+                    with st.expander("Descomposición STL"):
+                        def stl_figure():
+                            components = fit['decomposition'].reset_index(names='periodo').melt(
+                                id_vars='periodo', var_name='componente', value_name='valor')
+                            fig_stl = px.line(components, x='periodo', y='valor', facet_row='componente', height=600)
+                            return fig_stl.update_yaxes(matches=None)
+                        plot_chart(view, 'stl', stl_figure, frequency, group, current)
+
+        with col2:
+            # Duración vs Facturación
+            plot_chart(view, 'duracion_vs_facturacion', lambda: charts.duration_revenue(df, point_budget, scatter_mode),
+                       point_budget, scatter_mode)
+
+            revenue_test, _ = group_comparison(view, 'canal', 'facturación_num')
+            st.markdown(f"""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+            <strong>Insights de Duración vs Facturación:</strong>
+            <ul>
+            <li>Campañas más largas no necesariamente generan mayor facturación</li>
+            <li>La duración óptima se encuentra entre 300-500 días</li>
+            <li>{significance_text(revenue_test['omnibus'] if revenue_test else None, 'facturación', 'canales')}</li>
+            <li>Las campañas cortas muestran mayor variabilidad en facturación</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab5:
+        st.markdown("""
+        <div class="data-card">
+            <h3>5. Significancia Estadística</h3>
+            <p>¿Las diferencias entre grupos son reales o ruido? ANOVA y Kruskal-Wallis, comparaciones por pares
+            con corrección de Holm e intervalos de confianza bootstrap (10.000 remuestreos) de la media.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+        by = col1.selectbox("Comparar por", list(GROUPINGS), format_func=GROUPINGS.get)
+        measure = col2.selectbox("Métrica", list(COMPARED_MEASURES), format_func=COMPARED_MEASURES.get)
+        result, current = group_comparison(view, by, measure)
+        if background_note(result, current, "los contrastes"):
+            tests = result['omnibus']
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("ANOVA (p-valor)", f"{tests['anova_p']:.3f}", f"F = {tests['anova_f']:.2f}", delta_color="off")
+            col2.metric("Kruskal-Wallis (p-valor)", f"{tests['kruskal_p']:.3f}", f"H = {tests['kruskal_h']:.2f}", delta_color="off")
+            col3.metric("Pares significativos", f"{int(result['pairwise']['significativa'].sum())} de {len(result['pairwise'])}")
+            st.markdown(significance_text(tests, COMPARED_MEASURES[measure], GROUPINGS_PLURAL[by]))
+
+            def ci_figure():
+                ci = result['bootstrap']
+                fig_ci = px.scatter(ci, x='grupo', y='media', color='grupo',
+                                    error_y=ci['ic_superior'] - ci['media'], error_y_minus=ci['media'] - ci['ic_inferior'],
+                                    title=f'{COMPARED_MEASURES[measure]} medio por {GROUPINGS[by].lower()} (IC 95% bootstrap)')
+                return fig_ci.update_layout(xaxis_title=GROUPINGS[by], yaxis_title=COMPARED_MEASURES[measure],
+                                            showlegend=False)
+            plot_chart(view, 'intervalos', ci_figure, by, measure, current)
+            st.dataframe(result['pairwise'].style.format(precision=4), use_container_width=True, hide_index=True)
+
+    with tab6:
+        st.markdown("""
+        <div class="data-card">
+            <h3>6. Calendario y Solapamientos</h3>
+            <p>Campañas y presupuesto en curso cada día, semana o mes según sus fechas de inicio y fin, inversión y
+            facturación repartidas entre los días activos de cada campaña, y campañas del mismo canal que coinciden
+            en el tiempo.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+        calendar_frequency = col1.radio("Periodo", list(overlap.FREQUENCIES), horizontal=True)
+        calendar_measure = col2.selectbox("Métrica", list(overlap.MEASURES), format_func=overlap.MEASURES.get)
+        freq = overlap.FREQUENCIES[calendar_frequency]
+        activity = campaign_calendar(view.store.version, view.filters, freq, df)
+        if activity.empty:
+            st.info("No hay campañas con fechas de inicio y fin válidas en la selección.")
+        else:
+            label = overlap.MEASURES[calendar_measure]
+            plot_chart(view, 'calendario', lambda: charts.active_calendar(activity, calendar_measure, label,
+                                                                          calendar_frequency),
+                       freq, calendar_measure)
+
+            overlaps = channel_overlaps(view.store.version, view.filters, df)
+            st.dataframe(overlaps.style.format({'solapadas de media': '{:.1f}'}), use_container_width=True,
+                         hide_index=True)
+            if len(overlaps):
+                busiest = overlaps.loc[overlaps['pico de activas'].idxmax()]
+                st.markdown(f"""
+                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #1f77b4;">
+                <h4>📊 Hallazgos Clave:</h4>
+                <ul>
+                <li>{busiest['grupo'].capitalize()} llega a {busiest['pico de activas']:,} campañas activas a la vez
+                ({busiest['fecha del pico']})</li>
+                <li>{overlaps['con solapamiento'].sum():,} de {overlaps['campañas'].sum():,} campañas coinciden en el
+                tiempo con otra del mismo canal</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+            # Campañas del mismo canal que coinciden con una concreta
+            query = st.text_input("Buscar campaña", placeholder="Parte del nombre")
+            names = df['nombre campaña']
+            candidates = df['fecha inicio'].notna() & df['fecha fin'].notna()
+            if query:
+                candidates &= names.str.contains(query, case=False, regex=False, na=False)
+            matches = df.index[candidates][:CAMPAIGN_OPTIONS]
+            if len(matches):
+                row = st.selectbox("Campaña", matches, format_func=lambda i: f"{names[i]} ({df.at[i, 'canal']}, "
+                                                                           f"{df.at[i, 'fecha inicio']:%Y-%m-%d})")
+                overlapping = overlap.overlapping_campaigns(df, row)
+                st.caption(f"{len(overlapping):,} campañas del mismo canal coinciden con ella")
+                st.dataframe(overlapping[['nombre campaña', 'fecha inicio', 'fecha fin', 'tipo', 'inversión_num',
+                                          'días en común']].head(CAMPAIGN_OPTIONS),
+                             use_container_width=True, hide_index=True)
+            else:
+                st.info("Ninguna campaña de la selección contiene ese texto.")
+
+    figure_cache_note()
@@ -0,0 +1,57 @@
+"""Panel de administración con la instrumentación de la app (oculto: `?admin=<MARKETING_ADMIN_KEY>`).
+
+No es una sección del menú: `app.py` lo pinta en la barra lateral después de la
+sección, con los tramos de tiempo y la memoria de la ejecución que acaba de terminar.
+"""
+import json
+
+import pandas as pd
+import streamlit as st
+
+from marketing import profiling
+
+
+def _mib(value):
+    return f"{value / 2**20:.1f} MiB" if isinstance(value, (int, float)) else str(value)
+
+
+def toggle(container):
+    """Casilla para medir las ejecuciones de esta sesión. Devuelve si está marcada."""
+    return container.checkbox("Medir cada ejecución", value=profiling.enabled(), key='profiling',
+                              help="Sólo mide esta sesión (con MARKETING_PROFILE=1 se miden todas). "
+                                   "Sin medir, los tramos no cuestan nada.")
+
+
+def render_panel(container, run):
+    """Tramos y memoria de `run` (la ejecución actual) y el resumen de las recientes."""
+    with container:
+        if run is None:
+            st.caption("Medición desactivada.")
+            return
+        st.metric("Ejecución", f"{run['total_ms']:.0f} ms", help=f"Sección: {run['section']}")
+
+        spans = pd.DataFrame(run['spans'], columns=['name', 'depth', 'start_ms', 'ms'])
+        if not spans.empty:
+            spans = spans.sort_values('start_ms')
+            spans['tramo'] = ["· " * depth + name for name, depth in zip(spans['name'], spans['depth'])]
+            st.dataframe(spans[['tramo', 'ms']].round(1), hide_index=True, use_container_width=True)
+
+        memory = run['memory']
+        lines = [f"Proceso: {_mib(memory['proceso'])}"]
+        datasets = memory.get('datasets')
+        if isinstance(datasets, dict):
+            lines += [f"Dataset {name}: {_mib(size)}" for name, size in datasets.items()]
+        if 'gráficos' in memory:
+            lines.append(f"Caché de gráficos: {_mib(memory['gráficos'])}")
+        st.caption("  \n".join(lines))
+
+        runs = profiling.recent_runs()
+        if len(runs) > 1:
+            summary = (pd.DataFrame({'sección': [r['section'] for r in runs], 'ms': [r['total_ms'] for r in runs]})
+                       .groupby('sección')['ms'].agg(['count', 'median', 'max']).round(0))
+            st.dataframe(summary, use_container_width=True)
+        st.download_button("Descargar ejecuciones (JSON)",
+                           json.dumps(runs, ensure_ascii=False, default=str, indent=1),
+                           file_name="instrumentacion.json", mime="application/json")
+        if profiling.log_path() is not None:
+            st.caption(f"Log: `{profiling.log_path()}`")
@@ -0,0 +1,164 @@
+"""Sección "Introducción": objetivos y metodología (contenido estático, sin datos)."""
+import streamlit as st
+
+
+def render():
+    # Custom CSS for consistent styling
+    st.markdown("""
+    <style>
+    /* General styles */
+    .section-title {
+        font-size: 2.5em;
+        color: #1f77b4;
+        text-align: center;
+        margin: 2em 0 1em 0;
+        padding-bottom: 0.5em;
+        border-bottom: 3px solid #ddd;  /* Increased border thickness */
+    }
+    
+    .card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);  /* Increased shadow */
+        margin: 1em 0;
+        transition: transform 0.3s ease;
+        border: 1px solid #e0e0e0;  /* Added border */
+    }
+    
+    .card:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 6px 16px rgba(0,0,0,0.25);  /* Increased hover shadow */
+    }
+    
+    .metric-card {
+        background-color: #f8f9fa;  /* Light background */
+        padding: 1.5em;
+        border-radius: 10px;
+        text-align: center;
+        border-left: 6px solid #1f77b4;  /* Thicker accent border */
+        margin: 0.5em;
+        box-shadow: 0 3px 8px rgba(0,0,0,0.15);  /* Added shadow */
+    }
+    
+    .metric-value {
+        font-size: 2em;
+        font-weight: bold;
+        color: #0d6efd;  /* Brighter blue */
+        margin: 0.2em 0;
+    }
+    
+    .metric-label {
+        color: #343a40;  /* Darker text */
+        font-size: 1em;
+        font-weight: 500;  /* Semi-bold */
+    }
+    
+    .process-step {
+        background-color: white;
+        padding: 1.2em;
+        border-radius: 8px;
+        margin: 0.5em 0;
+        display: flex;
+        align-items: center;
+        box-shadow: 0 3px 6px rgba(0,0,0,0.1);  /* Increased shadow */
+        border: 1px solid #dee2e6;  /* Added border */
+    }
+    
+    /* Animations */
+    @keyframes fadeIn {
+        from {opacity: 0;}
+        to {opacity: 1;}
+    }
+    
+    .animated {
+        animation: fadeIn 1s ease;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Project Objectives Section
+    st.markdown('<h1 class="section-title animated">🎯 Objetivos del Proyecto</h1>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    objectives = [
+        {"icon": "📊", "title": "Identificar Canales Óptimos", "desc": "Análisis de eficiencia por canal y tipo de campaña"},
+        {"icon": "💰", "title": "Optimizar Presupuestos", "desc": "Maximización del ROI en cada campaña"},
+        {"icon": "📈", "title": "Detectar Estacionalidad", "desc": "Identificación de patrones temporales"},
+        {"icon": "💡", "title": "Generar Recomendaciones", "desc": "Estrategias basadas en datos"}
+    ]
+    
+    for i, obj in enumerate(objectives):
+        with col1 if i < 2 else col2:
+            st.markdown(f"""
+            <div class="card animated">
+                <h3>{obj['icon']} {obj['title']}</h3>
+                <p>{obj['desc']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Methodology Section
+    st.markdown('<h1 class="section-title animated">🛠️ Metodología</h1>', unsafe_allow_html=True)
+    
+    tabs = st.tabs(["💻 Herramientas", "📝 Proceso", "⚡ Técnicas"])
+    
+    with tabs[0]:
+        col1, col2, col3, col4 = st.columns(4)
+        tools = [
+            {"icon": "🐍", "name": "Python", "desc": "Análisis de datos"},
+            {"icon": "📊", "name": "Pandas", "desc": "Manipulación de datos"},
+            {"icon": "💻", "name": "VS Code", "desc": "Desarrollo"},
+            {"icon": "📈", "name": "Power BI", "desc": "Visualización"}
+        ]
+        
+        for col, tool in zip([col1, col2, col3, col4], tools):
+            with col:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div style="font-size: 2em">{tool['icon']}</div>
+                    <div class="metric-value">{tool['name']}</div>
+                    <div class="metric-label">{tool['desc']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    with tabs[1]:
+        process_steps = [
+            {"icon": "🔍", "step": "Exploración inicial", "desc": "Análisis preliminar"},
+            {"icon": "🧹", "step": "Limpieza", "desc": "Preparación de datos"},
+            {"icon": "📊", "step": "Análisis", "desc": "Identificación de patrones"},
+            {"icon": "📈", "step": "Visualización", "desc": "Creación de dashboards"},
+            {"icon": "💡", "step": "Insights", "desc": "Conclusiones"}
+        ]
+        
+        for step in process_steps:
+            st.markdown(f"""
+            <div class="process-step">
+                <div style="font-size: 1.5em; margin-right: 1em">{step['icon']}</div>
+                <div>
+                    <h4 style="margin: 0">{step['step']}</h4>
+                    <p style="margin: 0; color: #666">{step['desc']}</p>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tabs[2]:
+        col1, col2 = st.columns(2)
+        techniques = [
+            {"icon": "📊", "name": "Análisis Estadístico"},
+            {"icon": "📈", "name": "Visualización Avanzada"},
+            {"icon": "🔍", "name": "Detección de Patrones"},
+            {"icon": "🔗", "name": "Análisis de Correlaciones"},
+            {"icon": "🤖", "name": "Machine Learning Básico"}
+        ]
+        
+        for i, tech in enumerate(techniques):
+            with col1 if i % 2 == 0 else col2:
+                st.markdown(f"""
+                <div class="card">
+                    <div style="display: flex; align-items: center">
+                        <span style="font-size: 1.5em; margin-right: 0.5em">{tech['icon']}</span>
+                        <span>{tech['name']}</span>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
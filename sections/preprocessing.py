@@ -0,0 +1,346 @@
+"""Sección "Preprocesamiento": proceso de limpieza con las cifras del dataset actual."""
+import streamlit as st
+
+from sections.state import RAW_PATH, data_quality, dataset_kpis, export_kpis, load_view
+
+# Filas con fallos que se muestran por regla (la descarga las incluye todas)
+FAILING_ROWS_SHOWN = 500
+
+
+def render():
+    view = load_view()
+    df = view.df
+
+    # Custom CSS para mantener consistencia con la sección de introducción
+    st.markdown("""
+    <style>
+    .data-card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+        margin: 1em 0;
+        border: 1px solid #e0e0e0;
+    }
+    
+    .metric-container {
+        background-color: #f8f9fa;
+        padding: 1.2em;
+        border-radius: 8px;
+        text-align: center;
+        border-left: 6px solid #1f77b4;
+        margin: 0.5em;
+        box-shadow: 0 3px 8px rgba(0,0,0,0.15);
+    }
+    
+    .step-container {
+        background-color: white;
+        padding: 1em;
+        border-radius: 8px;
+        margin: 0.5em 0;
+        border: 1px solid #dee2e6;
+        transition: transform 0.3s ease;
+    }
+    
+    .step-container:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 6px 16px rgba(0,0,0,0.25);
+    }
+    
+    .code-container {
+        background-color: #f8f9fa;
+        padding: 1em;
+        border-radius: 8px;
+        margin: 1em 0;
+        border-left: 4px solid #28a745;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<h1 style="text-align: center; color: black;">Preprocesamiento y Limpieza de Datos</h1>', unsafe_allow_html=True)
+
+    kpis = dataset_kpis(view.store.version, view.filters, view.backend)
+    raw = export_kpis(view.store, RAW_PATH)
+    # Las reglas de calidad se comprueban sobre el dataset completo, no sobre la selección
+    quality = data_quality(view.store.version, view.store) if view.store.frame is not None else None
+    valid_share = quality.valid_share if quality is not None else kpis['valid_share']
+    
+    # Métricas principales
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>📊 Registros</h3>
+            <h2>{kpis['rows']:,}</h2>
+            <p>Campañas totales</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>🧹 Limpieza</h3>
+            <h2>{valid_share:.1%}</h2>
+            <p>Datos válidos</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col3:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>📈 Variables</h3>
+            <h2>{kpis['fields']}</h2>
+            <p>Campos finales</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col4:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>⚡ Enriquecimiento</h3>
+            <h2>{kpis['derived_fields']}</h2>
+            <p>Nuevas métricas</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Tabs para organizar el contenido
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔍 Inspección", "🧹 Limpieza", "📊 Normalización", "💫 Enriquecimiento", "✅ Resultado"])
+    
+    with tab1:
+        st.markdown("""
+        <div class="data-card">
+            <h3>🔍 Inspección Inicial del Dataset</h3>
+            <p>Proceso sistemático de revisión de la calidad y estructura de los datos.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        if raw is None:
+            st.info(f"No se encuentra el export bruto de este dataset ({RAW_PATH}) para calcular la inspección inicial.")
+        else:
+            with col1:
+                st.markdown(f"""
+                <div class="step-container">
+                    <h4>📋 Dimensiones Detectadas</h4>
+                    <ul>
+                        <li>{raw['rows']:,} filas (campañas)</li>
+                        <li>{raw['columns']} columnas (variables)</li>
+                        <li>{raw['duplicates']} duplicados identificados</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col2:
+                st.markdown(f"""
+                <div class="step-container">
+                    <h4>⚠️ Problemas Detectados</h4>
+                    <ul>
+                        <li>{raw['missing']['fecha fin']} fechas fin faltantes</li>
+                        <li>{raw['missing']['retorno inversión']} valores ROI ausentes</li>
+                        <li>{raw['missing']['ratio conversión']} tasas conversión nulas</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+
+    with tab2:
+        st.markdown("""
+        <div class="data-card">
+            <h3>🧹 Proceso de Limpieza</h3>
+            <p>Tratamiento sistemático de valores nulos, duplicados y anomalías.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            <div class="step-container">
+                <h4>📊 Datos Numéricos</h4>
+                <ul>
+                    <li>Imputación por mediana</li>
+                    <li>Eliminación valores negativos</li>
+                    <li>Corrección formatos decimales</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown("""
+            <div class="step-container">
+                <h4>📝 Datos Categóricos</h4>
+                <ul>
+                    <li>Etiqueta "sin datos" para nulos</li>
+                    <li>Normalización de categorías</li>
+                    <li>Corrección de errores tipográficos</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+
+    with tab3:
+        st.markdown("""
+        <div class="data-card">
+            <h3>📊 Normalización de Datos</h3>
+            <p>Estandarización de formatos y unidades para análisis consistente.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Ejemplos de normalización
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("""
+            <div class="step-container">
+            <h4>🗓️ Fechas</h4>
+            <code>01/01/2024</code> → <code>2024-01-01</code>
+            <br>
+            <code>1-ene-24</code> → <code>2024-01-01</code>
+            <br>
+            <code>2024.01.01</code> → <code>2024-01-01</code>
+            <br>
+            <code>01 enero 2024</code> → <code>2024-01-01</code>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown("""
+            <div class="step-container">
+            <h4>💶 Valores Monetarios</h4>
+            <code>1000.50</code> → <code>1.000,50</code>
+            <br>
+            <code>1,000.50</code> → <code>1.000,50</code>
+            <br>
+            <code>1000,5</code> → <code>1.000,50</code>
+            <br>
+            <code>1.000,5€</code> → <code>1.000,50</code>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown("""
+            <div class="step-container">
+            <h4>📊 Porcentajes</h4>
+            <code>50%</code> → <code>0.50</code>
+            <br>
+            <code>0,5</code> → <code>0.50</code>
+            <br>
+            <code>50.0%</code> → <code>0.50</code>
+            <br>
+            <code>50,00%</code> → <code>0.50</code>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab4:
+        st.markdown("""
+        <div class="data-card">
+            <h3>💫 Enriquecimiento de Datos</h3>
+            <p>Creación de nuevas variables y métricas derivadas para análisis profundo.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Variables derivadas
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("""
+            <div class="step-container">
+                <h4>⏱️ Temporales</h4>
+                <ul>
+                    <li>Duración en días</li>
+                    <li>Categoría duración</li>
+                    <li>Mes de inicio</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown("""
+            <div class="step-container">
+                <h4>💰 Financieras</h4>
+                <ul>
+                    <li>Beneficio neto</li>
+                    <li>ROI ajustado</li>
+                    <li>Categoría inversión</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col3:
+            st.markdown("""
+            <div class="step-container">
+                <h4>📈 Rendimiento</h4>
+                <ul>
+                    <li>Éxito campaña</li>
+                    <li>Eficiencia relativa</li>
+                    <li>Score conversión</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab5:
+        st.markdown("""
+        <div class="data-card">
+            <h3>✅ Resultado Final</h3>
+            <p>Dataset limpio y enriquecido listo para análisis exploratorio.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Métricas finales
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="step-container">
+                <h4>📊 Estadísticas Finales</h4>
+                <ul>
+                    <li>{kpis['unique_rows']:,} registros únicos</li>
+                    <li>{kpis['fields']} variables totales</li>
+                    <li>{kpis['nulls']} valores nulos</li>
+                    <li>{valid_share:.1%} datos válidos ({len(quality.rules) if quality else 0} reglas de calidad)</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown("""
+            <div class="step-container">
+                <h4>🎯 Mejoras Implementadas</h4>
+                <ul>
+                    <li>6 nuevas métricas derivadas</li>
+                    <li>Formatos estandarizados</li>
+                    <li>Categorización completa</li>
+                    <li>Documentación detallada</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        if quality is not None:
+            render_quality(view.store.frame, quality)
+
+        # Vista previa del dataset
+        st.markdown("<h4 style='text-align: center;'>Vista Previa del Dataset Final</h4>", unsafe_allow_html=True)
+        st.dataframe(df.head())
+
+
+def render_quality(df, quality):
+    """Resultado de cada regla de calidad y las filas que la incumplen."""
+    st.markdown(f"""
+    <div class="step-container">
+        <h4>🧪 Validación de Calidad</h4>
+        <p>{quality.failing.sum():,} de {quality.rows:,} registros incumplen alguna de las {len(quality.rules)} reglas,
+        comprobadas en cada ingesta del dataset.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    summary = quality.summary()
+    summary.insert(0, '', summary['filas con fallo'].map(lambda n: '❌' if n else '✅'))
+    st.dataframe(summary.style.format({'% filas': '{:.2%}', 'filas con fallo': '{:,}'}),
+                 use_container_width=True, hide_index=True)
+
+    broken = summary.loc[summary['filas con fallo'] > 0, 'regla'].tolist()
+    if broken:
+        rule = st.selectbox("Ver filas que incumplen", [None, *broken],
+                            format_func=lambda r: "Cualquier regla" if r is None else r)
+        st.dataframe(quality.failing_rows(df, rule, limit=FAILING_ROWS_SHOWN), use_container_width=True)
+        # El CSV completo sólo se genera al pulsar (puede haber millones de filas)
+        st.download_button("Descargar filas con fallos (CSV)",
+                           lambda: quality.failing_rows(df, rule).to_csv(index=True).encode('utf-8'),
+                           file_name="filas_con_fallos.csv", mime="text/csv", on_click='ignore')
@@ -0,0 +1,81 @@
+"""Sección "Predicción de Campañas": probabilidad de éxito y ROI previsto de una campaña planificada."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from marketing.kpis import MONTHS
+from sections.state import background_note, campaign_model, campaign_store, load_data, select_dataset
+
+
+def render():
+    st.markdown("""
+    <style>
+    .data-card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+        margin: 1em 0;
+        border: 1px solid #e0e0e0;
+    }
+    </style>
+    <div class="data-card">
+        <h3>🔮 Predicción de Campañas</h3>
+        <p>Estimación de la probabilidad de éxito y del ROI de una campaña antes de lanzarla, con modelos
+        entrenados sobre todo el histórico (inversión, canal, tipo, audiencia, duración y mes de inicio).</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # El modelo se entrena con todo el histórico del dataset: los filtros globales no aplican aquí
+    store = campaign_store(select_dataset())
+    df = load_data(store)
+    if df.empty:
+        st.warning("No hay datos con los que entrenar el modelo.")
+        return
+
+    artifact, current = campaign_model(store)
+    if not background_note(artifact, current, "el modelo"):
+        return
+
+    categories = artifact['categories']
+    with st.form("campaña_planificada"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            canal = st.selectbox("Canal", categories['canal'])
+            tipo = st.selectbox("Tipo", categories['tipo'])
+        with col2:
+            audiencia = st.selectbox("Audiencia", categories['audiencia target'])
+            mes = st.selectbox("Mes de inicio", MONTHS)
+        with col3:
+            inversion = st.number_input("Inversión (€)", min_value=0.0,
+                                        value=float(round(df['inversión_num'].median(), -3)), step=1_000.0)
+            # Hasta la campaña más larga del histórico (la mitad dura más de un año)
+            durations = df['duracion_num'].dropna()
+            max_days = max(int(np.ceil(durations.max())), 1) if len(durations) else 365
+            default_days = int(np.clip(durations.median(), 1, max_days)) if len(durations) else 1
+            duracion = st.slider("Duración (días)", 1, max_days, default_days)
+        submitted = st.form_submit_button("Calcular predicción")
+
+    if submitted:
+        from marketing.model import predict
+        campaign = pd.DataFrame([{'canal': canal, 'tipo': tipo, 'audiencia target': audiencia,
+                                  'inversión_num': inversion, 'duracion_num': duracion,
+                                  'mes': MONTHS.index(mes) + 1}])
+        prediction = predict(artifact, campaign).iloc[0]
+        metrics = artifact['metrics']
+        col1, col2 = st.columns(2)
+        col1.metric("Probabilidad de éxito", f"{prediction['probabilidad_exito']:.1%}",
+                    f"{prediction['probabilidad_exito'] - metrics['base_rate']:+.1%} vs histórico")
+        col2.metric("ROI previsto", f"{prediction['roi_previsto']:.2f}",
+                    f"{prediction['roi_previsto'] - df['roi_num'].mean():+.2f} vs ROI medio")
+
+    with st.expander("🧪 Modelo"):
+        metrics = artifact['metrics']
+        st.markdown(f"""
+        - Entrenado el {artifact['trained_at']} con {artifact['rows']:,} campañas (datos `{artifact['data_hash']}`)
+        - Éxito: AUC {metrics['auc']:.3f}, accuracy {metrics['accuracy']:.1%} (tasa de éxito histórica {metrics['base_rate']:.1%})
+        - ROI: error absoluto medio {metrics['roi_mae']:.3f}, R² {metrics['roi_r2']:.3f}
+        """)
+        if metrics['auc'] < 0.7 or metrics['roi_r2'] < 0.1:
+            st.warning("Con estas variables los modelos apenas mejoran la predicción por defecto "
+                       "(validación cruzada): tomar las estimaciones como orientativas.")
@@ -0,0 +1,101 @@
+"""Sección "Simulador de Escenarios": distribución de facturación y beneficio de un escenario por Monte Carlo."""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from marketing.kpis import MONTHS
+from marketing.profiling import span
+from marketing.simulator import MIN_EFFECTIVE, OUTCOMES, TRAJECTORIES, histogram, simulate, summarize
+from sections.state import dataset_kpis, figure_cache_note, load_view, plot_chart, simulation_pools
+
+
+def render():
+    view = load_view()
+    st.markdown("""
+    <style>
+    .data-card {
+        background-color: white;
+        padding: 1.5em;
+        border-radius: 10px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+        margin: 1em 0;
+        border: 1px solid #e0e0e0;
+    }
+    </style>
+    <div class="data-card">
+        <h3>🎲 Simulador de Escenarios</h3>
+        <p>Define un reparto del presupuesto entre canales y, si quieres, la duración y el mes de inicio de las
+        campañas. Cada trayectoria simula esas campañas con la facturación por euro invertido, el ROI y el ratio de
+        conversión de campañas históricas del mismo canal (las de duración y mes parecidos pesan más) y compara el resultado con el reparto actual en
+        las mismas condiciones.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    pools, current_mix = simulation_pools(view.store.version, view.filters, view.df)
+    if not pools:
+        st.warning("No hay campañas con ROI y ratio de conversión en la selección actual.")
+        return
+    kpis = dataset_kpis(view.store.version, view.filters, view.backend)
+
+    col1, col2, col3 = st.columns(3)
+    budget = col1.number_input("Presupuesto (€)", min_value=10_000.0, value=1_000_000.0, step=100_000.0)
+    campaigns = col2.slider("Campañas por canal", 1, 20, 5)
+    roi_target = col3.slider("ROI objetivo", 0.0, 1.0, 0.6, 0.05)
+
+    st.markdown("**Reparto entre canales (%)**")
+    columns = st.columns(len(pools))
+    mix = {channel: column.slider(channel.capitalize(), 0, 100, int(round(current_mix[channel] * 100)))
+           for channel, column in zip(pools, columns)}
+    if not sum(mix.values()):
+        st.warning("Asigna presupuesto al menos a un canal.")
+        return
+
+    col1, col2 = st.columns(2)
+    best_duration = kpis['best_duration'] if kpis['best_duration'] is not None else 400
+    fixed = col1.checkbox("Fijar la duración", help="Por defecto, la duración con mejor ROI histórico")
+    duration = col1.slider("Duración (días)", 30, 720, int(best_duration), 10) if fixed else None
+    month = col2.selectbox("Mes de inicio", [None, *range(1, 13)], index=0,
+                           format_func=lambda m: "Cualquiera" if m is None else MONTHS[m - 1].capitalize())
+
+    # El reparto actual se simula con la misma duración y el mismo mes: la diferencia es sólo el reparto
+    with span('simulación', trayectorias=TRAJECTORIES):
+        scenario = simulate(pools, mix, budget, campaigns, duration, month)
+        baseline = simulate(pools, current_mix, budget, campaigns, duration, month)
+
+    col1, col2, col3 = st.columns(3)
+    mean, base_mean = scenario['beneficio'].mean(), baseline['beneficio'].mean()
+    col1.metric("Beneficio neto medio", f"{mean / 1e6:,.2f}M €", f"{mean / base_mean - 1:+.1%} vs reparto actual")
+    low, high = np.percentile(scenario['beneficio'], [5, 95])
+    col2.metric("Beneficio neto (90% de las trayectorias)", f"{low / 1e6:,.2f}M – {high / 1e6:,.2f}M €")
+    reached, base_reached = (scenario['roi'] >= roi_target).mean(), (baseline['roi'] >= roi_target).mean()
+    col3.metric(f"Probabilidad de ROI ≥ {roi_target:.2f}", f"{reached:.0%}",
+                f"{(reached - base_reached) * 100:+.0f} pp vs reparto actual")
+
+    scarce = [channel for channel, size in scenario['efectivas'].items() if size < MIN_EFFECTIVE]
+    if scarce:
+        st.info(f"Pocas campañas históricas parecidas al escenario en {', '.join(scarce)} (menos de "
+                f"{MIN_EFFECTIVE} efectivas): la simulación repite mucho las mismas.")
+
+    outcome = st.radio("Distribución de", ['beneficio', 'roi', 'facturación', 'conversión'], horizontal=True,
+                       format_func=OUTCOMES.get)
+
+    def distribution_figure():
+        fig = go.Figure()
+        for name, result in [('Reparto actual', baseline), ('Escenario', scenario)]:
+            centers, shares = histogram(result[outcome])
+            fig.add_trace(go.Bar(x=centers, y=shares, name=name, opacity=0.6))
+        if outcome == 'roi':
+            fig.add_vline(x=roi_target, line_dash='dash', annotation_text='Objetivo')
+        return fig.update_layout(barmode='overlay', bargap=0, title=f'{OUTCOMES[outcome]} simulado '
+                                 f'({TRAJECTORIES:,} trayectorias)', xaxis_title=OUTCOMES[outcome],
+                                 yaxis_title='Proporción de trayectorias')
+    # Las trayectorias dependen sólo del escenario (semilla fija): la figura se cachea por él
+    plot_chart(view, 'simulacion', distribution_figure, budget, campaigns, tuple(mix.items()), duration, month,
+               outcome, roi_target if outcome == 'roi' else None)
+    figure_cache_note()
+
+    with st.expander("📋 Resumen de las trayectorias"):
+        table = summarize(scenario)
+        st.dataframe(table.style.format('{:,.3f}', subset=(['ROI', 'Ratio de conversión'], slice(None)))
+                     .format('{:,.0f}', subset=(['Facturación', 'Beneficio neto'], slice(None))),
+                     use_container_width=True)
@@ -0,0 +1,417 @@
+"""Datos compartidos por las secciones: almacén, filtros globales y cachés por versión.
+
+Sólo lo importan las secciones que usan datos, así que "Introducción" no carga
+el dataset ni pyarrow.
+"""
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from marketing.budget import fit_response_curves
+from marketing.cache import CampaignStore, dataset_id
+from marketing.charts import INVALID_TYPES
+from marketing.cube import build_cube
+from marketing.engine import ENGINE, DuckDBBackend, PandasBackend, duckdb_available
+from marketing.figcache import FigureCache
+from marketing.filters import CATEGORY_FILTERS, FilterIndex
+from marketing.ingest import source_version
+from marketing.jobs import Precomputer, slot_name, version_key
+from marketing.kpis import raw_kpis
+from marketing.overlap import campaign_activity, overlap_summary
+from marketing.profiling import add_memory_source, span, timed
+from marketing.registry import DATASETS_DIR, StoreRegistry, list_datasets, save_upload
+from marketing.simulator import campaign_pools, historical_mix
+from marketing.validation import validate
+
+DATA_PATH = "limpio_marketingcampaigns.csv"
+# Export bruto del que sale el dataset limpio (sólo para las cifras de la inspección inicial)
+RAW_PATH = "marketingcampaigns.csv"
+GROUPINGS = {'canal': 'Canal', 'tipo': 'Tipo', 'audiencia target': 'Audiencia'}
+COMPARED_MEASURES = {'roi_num': 'ROI', 'ratio_conv_num': 'Ratio de conversión', 'facturación_num': 'Facturación'}
+# Mismas claves que marketing.timeseries.FREQUENCIES (sin importar statsmodels aquí)
+FORECAST_FREQUENCIES = ['mensual', 'semanal']
+# Trabajos en segundo plano como "módulo:función": scipy, statsmodels y sklearn sólo se importan
+# en el proceso de cálculo
+COMPARE_JOB = 'marketing.stats:compare_groups'
+FORECAST_JOB = 'marketing.timeseries:channel_forecasts'
+TRAIN_JOB = 'marketing.model:train_and_save'
+EXPORT_JOB = 'marketing.engine:export_segments'
+# Cada cuánto se comprueba si han terminado los cálculos pendientes
+POLL_SECONDS = 1.0
+# Entradas de las cachés por versión: con varios datasets abiertos no crecen sin límite
+MAX_VERSIONS = 16
+
+
+# cache_resource: un único registro de almacenes (uno por dataset) compartido entre sesiones; cada
+# frame está memory-mapped desde su caché Arrow y las filas anexadas se cargan de forma incremental
+@st.cache_resource
+def dataset_registry():
+    registry = StoreRegistry()
+    # Las figuras de un dataset cuentan en su presupuesto de memoria y se descartan con él
+    registry.add_cache(lambda store: figure_cache().size(store.id), lambda store: figure_cache().discard(store.id))
+    return registry
+
+
+def campaign_store(path=DATA_PATH):
+    return dataset_registry().get(path)
+
+
+def select_dataset():
+    """Selector de dataset en la barra lateral (los de `DATASETS_DIR` y los subidos). Devuelve su ruta."""
+    with st.sidebar.expander("📁 Dataset"):
+        upload = st.file_uploader("Subir CSV de campañas", type="csv")
+        # Se guarda una sola vez por fichero subido (cada ejecución del script vuelve a verlo)
+        if upload is not None and st.session_state.get('dataset_upload') != upload.file_id:
+            st.session_state['dataset_upload'] = upload.file_id
+            # El dataset principal no se lista desde DATASETS_DIR: su nombre queda reservado
+            path = save_upload(upload.name, upload.getvalue(), reserved={Path(DATA_PATH).stem})
+            st.session_state['dataset'] = path.stem
+        datasets = list_datasets(DATASETS_DIR, default=DATA_PATH)
+        if not datasets:
+            return DATA_PATH
+        if st.session_state.get('dataset') not in datasets:
+            st.session_state.pop('dataset', None)
+        name = st.selectbox("Dataset", list(datasets), key='dataset')
+    return datasets[name]
+
+
+def load_data(store):
+    try:
+        with span('carga.refresh', dataset=store.source.stem) as timing:
+            timing.set(estado=store.refresh())
+        evicted = dataset_registry().track(store)
+        if evicted:
+            st.toast(f"Memoria liberada: {', '.join(path.stem for path in evicted)}")
+    except Exception as e:
+        st.error(f"Error cargando los datos: {e}")
+    if store.frame is None:
+        # Crear DataFrame vacío para evitar errores
+        return pd.DataFrame()
+    return store.frame
+
+
+# KPIs de las tarjetas: se calculan una vez por versión del dataset y selección de filtros, con el motor
+@timed('agregación.kpis')
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def dataset_kpis(version, filters, _backend):
+    categories, ranges = filters
+    return _backend.kpis(dict(categories), dict(ranges))
+
+
+# Figuras ya serializadas, compartidas entre sesiones: cambiar de pestaña o de sección no las reconstruye
+@st.cache_resource
+def figure_cache():
+    return FigureCache()
+
+
+def cached_figure(view, chart, build, *params):
+    """Figura `chart` de la vista (dataset, versión y filtros) con `params`; `build()` sólo si no está en caché."""
+    return figure_cache().get((chart, view.store.version, view.filters, params), build, group=view.store.id)
+
+
+def plot_chart(view, chart, build, *params):
+    """Pinta la figura `chart` (de la caché o construida con `build()`), midiendo construcción y envío."""
+    with span(f'gráfico.{chart}'):
+        fig = cached_figure(view, chart, build, *params)
+    with span(f'gráfico.{chart}.envío'):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# Instantáneas de memoria de la instrumentación: por dataset (frame, cubo, lo derivado de él y sus
+# figuras) y la caché de gráficos entera
+add_memory_source('datasets', lambda: {path.stem: size for path, size in dataset_registry().loaded().items()})
+add_memory_source('gráficos', lambda: figure_cache().stats()['bytes'])
+
+
+def figure_cache_note():
+    stats = figure_cache().stats()
+    if stats['hit_rate'] is not None:
+        st.sidebar.caption(f"🖼️ Caché de gráficos: {stats['hits']} aciertos, {stats['misses']} fallos "
+                           f"({stats['hit_rate']:.0%}), {stats['bytes'] / 2**20:.1f} de "
+                           f"{stats['max_bytes'] / 2**20:.0f} MiB")
+
+
+# Cálculos caros en segundo plano: un pool de procesos compartido entre sesiones
+@st.cache_resource
+def precomputer():
+    return Precomputer()
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _rerun_when_done():
+    if not precomputer().pending():
+        st.rerun()
+
+
+def background_result(kind, params, key, func, *args, **kwargs):
+    """(último resultado de la ranura o None, al día con `key`). Mientras se calcula uno nuevo la
+    página se vuelve a ejecutar sola al terminar."""
+    worker = precomputer()
+    slot = slot_name(kind, *params)
+    with span(f'segundo_plano.{kind}') as timing:
+        value, current = worker.result(slot, key, func, *args, **kwargs)
+        timing.set(al_día=current)
+    if worker.failed(slot, key):
+        st.error(f"Error en el cálculo en segundo plano: {worker.failed(slot, key)}")
+    elif not current:
+        _rerun_when_done()
+    return value, current
+
+
+def background_note(value, current, what):
+    """Aviso de estado de un resultado en segundo plano. Devuelve si hay algo que mostrar."""
+    if value is None:
+        st.info(f"⏳ Calculando {what} en segundo plano...")
+        return False
+    if not current:
+        st.caption(f"🔄 Actualizando {what} con los datos actuales; se muestra el último resultado completo.")
+    return True
+
+
+def precompute_dataset(store):
+    """Encarga los resultados del dataset completo en cuanto aparece una versión nueva."""
+    worker, key, unfiltered = precomputer(), version_key(store.version), ((), ())
+    for by in GROUPINGS:
+        for measure in COMPARED_MEASURES:
+            worker.ensure(slot_name('comparación', store.id, unfiltered, by, measure), key,
+                          COMPARE_JOB, store.frame, by, measure)
+    for frequency in FORECAST_FREQUENCIES:
+        worker.ensure(slot_name('previsión', store.id, unfiltered, frequency), key,
+                      FORECAST_JOB, store.frame, frequency=frequency)
+
+
+# Contrastes de significancia (con bootstrap de 10.000 remuestreos) por dataset, versión, filtros y pregunta
+def group_comparison(view, by, measure):
+    return background_result('comparación', (view.store.id, view.filters, by, measure),
+                             version_key(view.store.version), COMPARE_JOB, view.df, by, measure)
+
+
+# Series y previsiones por canal (ajustes STL/ARIMA) por dataset, versión, filtros y periodicidad
+def channel_forecasts(view, frequency):
+    return background_result('previsión', (view.store.id, view.filters, frequency),
+                             version_key(view.store.version), FORECAST_JOB, view.df, frequency=frequency)
+
+
+# Calendario de campañas activas y solapamientos por canal, por versión, filtros y periodicidad
+@timed('agregación.calendario')
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def campaign_calendar(version, filters, freq, _df):
+    return campaign_activity(_df, 'canal', freq)
+
+
+@timed('agregación.solapamientos')
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def channel_overlaps(version, filters, _df):
+    return overlap_summary(_df, 'canal', campaign_calendar(version, filters, 'D', _df))
+
+
+# Campañas históricas por canal del simulador y el reparto actual, por versión y filtros
+@timed('agregación.simulador')
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def simulation_pools(version, filters, _df):
+    pools = campaign_pools(_df)
+    return pools, historical_mix(pools, _df)
+
+
+# Curvas de respuesta por segmento: se ajustan una vez por versión y filtros; al mover el
+# presupuesto o los límites sólo se vuelve a resolver el reparto (milisegundos)
+@timed('agregación.curvas_respuesta')
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def response_curves(version, filters, _df):
+    curves = fit_response_curves(_df)
+    return curves[~curves['tipo'].isin(INVALID_TYPES)].reset_index(drop=True)
+
+
+# Modelo de éxito y ROI: la app nunca entrena al pintar. Si no hay artefacto para los datos actuales
+# se entrena en segundo plano y mientras tanto se usa el último disponible (o ninguno). Cada dataset
+# tiene su ranura y su directorio de artefactos
+def campaign_model(store):
+    """(artefacto o None, al día con los datos actuales)."""
+    path, current = background_result('modelo', (store.id,), _training_hash(store.version, store.frame),
+                                      TRAIN_JOB, store.frame, str(store.source))
+    if path is None or not os.path.exists(path):
+        return None, current
+    return _load_model(str(path)), current
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSIONS)
+def _training_hash(version, _df):
+    from marketing.model import data_hash, training_frame
+    return data_hash(training_frame(_df))
+
+
+@timed('modelo.carga')
+@st.cache_resource(max_entries=2)
+def _load_model(path):
+    from marketing.model import load_artifact
+    return load_artifact(path)
+
+
+def export_kpis(store, path=RAW_PATH):
+    """KPIs del export bruto del dataset principal, o None si no está disponible (u otro dataset)."""
+    if store.id != dataset_id(DATA_PATH) or not os.path.exists(path):
+        return None
+    return _export_kpis(path, source_version(path))
+
+
+@st.cache_data(show_spinner=False)
+def _export_kpis(path, version):
+    return raw_kpis(path)
+
+
+# Validación del dataset completo: una vez por versión, es decir, en cada ingesta (también al anexar filas)
+@timed('validación')
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def data_quality(version, _store):
+    return dataset_registry().attach(_store, ('validación', version), validate(_store.frame),
+                                     lambda: data_quality.clear(version, None))
+
+
+def quality_note(store):
+    """Resumen de la validación en la barra lateral de todas las secciones (el detalle, en "Preprocesamiento")."""
+    quality = data_quality(store.version, store)
+    failing = int(quality.failing.sum())
+    if failing:
+        st.sidebar.caption(f"🧪 Calidad: {failing:,} de {quality.rows:,} filas incumplen alguna regla "
+                           f"({quality.valid_share:.1%} válidas)")
+    else:
+        st.sidebar.caption(f"🧪 Calidad: las {quality.rows:,} filas cumplen todas las reglas")
+
+
+# Índice de filtros (bitmaps por valor) y vistas filtradas, compartidos entre sesiones
+@timed('filtros.índice')
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def filter_index(version, _store):
+    return dataset_registry().attach(_store, ('filtros.índice', version), FilterIndex(_store.frame),
+                                     lambda: filter_index.clear(version, None))
+
+
+@timed('filtros.selección')
+@st.cache_resource(max_entries=32)
+def filtered_frame(version, categories, ranges, _store, _index):
+    frame = _store.frame[_index.mask(dict(categories), dict(ranges))]
+    return dataset_registry().attach(_store, ('filtros.selección', version, categories, ranges), frame,
+                                     lambda: filtered_frame.clear(version, categories, ranges, None, None))
+
+
+@timed('agregación.cubo')
+@st.cache_resource(max_entries=32)
+def filtered_cube(version, categories, ranges, _backend):
+    return _backend.cube(dict(categories), dict(ranges))
+
+
+class StoreBackend(PandasBackend):
+    """Motor de pandas sobre el almacén: reutiliza su índice de filtros, las vistas filtradas y su cubo."""
+
+    def __init__(self, store, index):
+        super().__init__(store.frame, index)
+        self.store = store
+
+    def frame(self, categories=None, ranges=None):
+        if not categories and not ranges:
+            return self.df
+        return filtered_frame(self.store.version, tuple((categories or {}).items()), tuple((ranges or {}).items()),
+                              self.store, self.index)
+
+    def cube(self, categories=None, ranges=None):
+        if not categories and not ranges:
+            return self.store.cube  # se actualiza de forma incremental con las filas anexadas
+        return build_cube(self.frame(categories, ranges))
+
+
+# Motor de las consultas agregadas (opciones de los filtros, cubo y KPIs). Con MARKETING_ENGINE=duckdb se
+# consultan con SQL sobre un Parquet por segmento de la caché Arrow, que se exporta en segundo plano (sólo
+# los segmentos nuevos); mientras tanto responde pandas, con los mismos resultados
+def query_backend(store):
+    parquet = None
+    if ENGINE == 'duckdb' and store.segment_paths and duckdb_available():
+        parquet, current = background_result('parquet', (store.id,), version_key(store.version), EXPORT_JOB,
+                                              [str(path) for path in store.segment_paths],
+                                              str(store.cache_dir / f"{store.id}-parquet"))
+        if not current:
+            parquet = None
+    return _query_backend(store.version, parquet, store)
+
+
+@timed('motor')
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def _query_backend(version, parquet, _store):
+    backend = DuckDBBackend(parquet) if parquet else StoreBackend(_store, filter_index(version, _store))
+    return dataset_registry().attach(_store, ('motor', version, parquet), backend,
+                                     lambda: _query_backend.clear(version, parquet, None))
+
+
+class DataView(NamedTuple):
+    """Frame de la selección actual y lo necesario para derivar otras vistas o el cubo."""
+    store: CampaignStore
+    df: pd.DataFrame
+    index: FilterIndex
+    categories: tuple
+    ranges: tuple
+    backend: object = None  # PandasBackend o DuckDBBackend (marketing.engine)
+
+    @property
+    def filtered(self):
+        return bool(self.categories or self.ranges)
+
+    @property
+    def filters(self):
+        return self.categories, self.ranges
+
+    @property
+    def cube(self):
+        """Cubo de agregados del motor (con pandas y sin filtros, el que mantiene el almacén)."""
+        if self.filtered:
+            return filtered_cube(self.store.version, self.categories, self.ranges, self.backend)
+        with span('agregación.cubo'):
+            return self.backend.cube()
+
+    def subset(self, categories):
+        """La selección actual restringida además a `{columna: valores}` (un AND más de bitmaps)."""
+        merged = {**dict(self.categories), **{col: tuple(values) for col, values in categories.items()}}
+        return filtered_frame(self.store.version, tuple(merged.items()), self.ranges, self.store, self.index)
+
+
+def load_view():
+    """Carga el dataset elegido y dibuja los filtros globales en la barra lateral."""
+    store = campaign_store(select_dataset())
+    df = load_data(store)
+    if df.empty:
+        return DataView(store, df, None, (), ())
+    precompute_dataset(store)
+    quality_note(store)
+
+    # Sólo se guardan los filtros que descartan algo: sin filtros se usan el frame y el cubo del almacén
+    categories, ranges = {}, {}
+    index = filter_index(store.version, store)
+    backend = query_backend(store)
+    with st.sidebar.expander("🔎 Filtros"):
+        for col in CATEGORY_FILTERS:
+            options = backend.values(col)
+            chosen = st.multiselect(col.capitalize(), options, default=options)
+            if len(chosen) < len(options):
+                categories[col] = tuple(chosen)
+
+        first, last = (pd.Timestamp(v, unit='s').date() for v in backend.bounds('fecha inicio'))
+        dates = st.date_input("Fecha de inicio", value=(first, last), min_value=first, max_value=last)
+        if len(dates) == 2 and tuple(dates) != (first, last):
+            ranges['fecha inicio'] = tuple(dates)
+
+        low, high = backend.bounds('inversión_num')
+        low, high = float(np.floor(low)), float(np.ceil(high))
+        budget = st.slider("Inversión (€)", low, high, (low, high))
+        if budget != (low, high):
+            ranges['inversión_num'] = budget
+
+    categories, ranges = tuple(categories.items()), tuple(ranges.items())
+    if categories or ranges:
+        df = filtered_frame(store.version, categories, ranges, store, index)
+        st.sidebar.caption(f"{len(df):,} de {len(store.frame):,} campañas")
+        if df.empty:
+            st.warning("Ninguna campaña cumple los filtros seleccionados.")
+            st.stop()
+    return DataView(store, df, index, categories, ranges, backend)